@@ -0,0 +1,313 @@
+#!/usr/bin/env python3
+"""Data-quality audit of the game catalog.
+
+Compiles schema.yaml into validators (rating scales, category, evoke
+and player count vocabularies) and checks every game against them in
+one pass. Games are read from games.db when it is up to date, else
+from the YAML files through the parse cache (which re-parses changed
+files across a process pool).
+
+Rules:
+  parse_error           file did not parse, or has no id
+  duplicate_id          two files share an id
+  missing_description   description empty or missing
+  few_evokes            fewer than MIN_EVOKES distinct evokes
+  unknown_category      category not listed in schema.yaml
+  unknown_evoke         evoke not listed in schema.yaml
+  rating_scale          rating outside its schema.yaml scale
+  player_count          player count not in schema.yaml possible_values
+  length_playtime       length rating doesn't fit playtime_minutes
+  dangling_reference    expansions/compatible_with/base_game id with no game
+
+Results are cached per file in .cache/audit.json, keyed by content
+hash, so a re-run only re-checks files that changed. Reference and
+duplicate checks depend on the whole catalog and are redone every run
+from the cached ids, which is cheap. Editing schema.yaml invalidates
+the cache.
+
+Usage:
+    python3 scripts/audit_games.py                     # summary + examples
+    python3 scripts/audit_games.py --rule few_evokes --limit 50
+    python3 scripts/audit_games.py --json > audit.json
+    python3 scripts/audit_games.py --source yaml --full --jobs 8
+
+Can also be imported as a module:
+    from scripts.audit_games import audit
+    report = audit()
+    for issue in report['issues']:
+        ...
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+
+import yaml
+
+# Allow running as a script: ensure project root is on sys.path
+_root = str(Path(__file__).resolve().parent.parent)
+if _root not in sys.path:
+    sys.path.insert(0, _root)
+
+from scripts import game_cache, game_data
+from scripts.db_schema import SCHEMA_YAML
+from scripts.game_cache import YAML_LOADER
+
+AUDIT_CACHE_PATH = os.path.join(game_cache.ROOT, ".cache", "audit.json")
+
+# Bump when rules change so cached results are discarded
+AUDIT_VERSION = 1
+
+MIN_EVOKES = 5
+
+# Acceptable playtime_minutes per length rating (schema.yaml: Snack 10
+# min .. Marathon 6+ hrs); neighbouring ranges overlap on purpose
+LENGTH_PLAYTIME = {0: (0, 30), 1: (15, 60), 2: (30, 150), 3: (90, 360), 4: (180, None)}
+
+REFERENCE_FIELDS = ['expansions', 'compatible_with', 'base_game']
+
+# YAML list fields the rules read (loaded from games.db by game_data)
+LIST_FIELDS = ('categories', 'evokes', 'expansions', 'compatible_with',
+               'possible_counts', 'true_counts')
+
+
+def load_schema(path=SCHEMA_YAML):
+    """Return (parsed schema.yaml, its SHA-256)."""
+    with open(path, 'rb') as f:
+        raw = f.read()
+    return yaml.load(raw, Loader=YAML_LOADER) or {}, hashlib.sha256(raw).hexdigest()
+
+
+def compile_rules(schema):
+    """Return [(rule name, check)] where check(game) yields messages."""
+    scales = {field: set(spec['values']) for field, spec in schema.items()
+              if isinstance(spec, dict) and isinstance(spec.get('values'), dict)}
+    categories = {str(v) for values in (schema.get('categories') or {}).values()
+                  for v in values or []}
+    evokes = {str(v) for v in (schema.get('evokes') or {}).get('values') or []}
+    counts = {str(v) for v in (schema.get('player_counts') or {}).get('possible_values') or []}
+
+    def missing_description(game):
+        description = game.get('description')
+        if not isinstance(description, str) or not description.strip():
+            yield "no description"
+
+    def few_evokes(game):
+        n = len({str(evoke) for evoke in game.get('evokes') or []})
+        if n < MIN_EVOKES:
+            yield f"{n} distinct evoke(s), expected {MIN_EVOKES}"
+
+    def unknown_category(game):
+        for category in game.get('categories') or []:
+            if str(category) not in categories:
+                yield f"category '{category}' is not in schema.yaml"
+
+    def unknown_evoke(game):
+        for evoke in game.get('evokes') or []:
+            if str(evoke) not in evokes:
+                yield f"evoke '{evoke}' is not in schema.yaml"
+
+    def rating_scale(game):
+        for field, allowed in scales.items():
+            value = game.get(field)
+            if value is not None and value not in allowed:
+                yield f"{field} {value!r} is not one of {sorted(allowed)}"
+
+    def player_count(game):
+        for field in ('possible_counts', 'true_counts'):
+            for count in game.get(field) or []:
+                if str(count) not in counts:
+                    yield f"{field} '{count}' is not in schema.yaml possible_values"
+
+    def length_playtime(game):
+        length, minutes = game.get('length'), game.get('playtime_minutes')
+        if length not in LENGTH_PLAYTIME or not isinstance(minutes, (int, float)):
+            return
+        low, high = LENGTH_PLAYTIME[length]
+        if minutes < low or (high is not None and minutes > high):
+            yield f"length {length} but playtime_minutes {minutes}"
+
+    rules = [missing_description, few_evokes, unknown_category, unknown_evoke,
+             rating_scale, player_count, length_playtime]
+    return [(rule.__name__, rule) for rule in rules]
+
+
+def check_game(rules, game):
+    """Return [[rule, message], ...] for one game dict."""
+    return [[name, message] for name, check in rules for message in check(game)]
+
+
+def game_references(game):
+    """Return [[field, id], ...] for the ids a game points at."""
+    refs = []
+    for field in REFERENCE_FIELDS:
+        value = game.get(field)
+        for target in value if isinstance(value, list) else [value]:
+            if target is not None and target != '':
+                refs.append([field, str(target)])
+    return refs
+
+
+def load_audit_cache(path, fingerprint):
+    try:
+        with open(path) as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if cache.get('fingerprint') != fingerprint:
+        return {}
+    return cache.get('files', {})
+
+
+def save_audit_cache(path, fingerprint, files):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.tmp-{os.getpid()}"
+    with open(tmp, 'w') as f:
+        # dumps() runs the C encoder; dump() streams through the Python one
+        f.write(json.dumps({'fingerprint': fingerprint, 'files': files}, separators=(',', ':')))
+    os.replace(tmp, path)
+
+
+def _file_entry(rules, sha256, game, error=None):
+    """Cache entry for one file: its id, local issues and references."""
+    if not isinstance(game, dict) or 'id' not in game:
+        return {'sha256': sha256, 'id': None, 'refs': [],
+                'issues': [['parse_error', error or "no id"]]}
+    return {'sha256': sha256, 'id': str(game['id']),
+            'issues': check_game(rules, game), 'refs': game_references(game)}
+
+
+def _audit_db(conn, rules, cached):
+    """Return ({path: entry}, paths re-checked) from games.db."""
+    manifest = conn.execute(
+        "SELECT path, game_id, sha256 FROM build_manifest ORDER BY path").fetchall()
+    stale = [(path, game_id, sha256) for path, game_id, sha256 in manifest
+             if cached.get(path, {}).get('sha256') != sha256]
+    ids = {game_id for _, game_id, _ in stale if game_id is not None}
+    games = {}
+    if ids:
+        # Everything stale (first run): a plain scan beats the id filter
+        wanted = None if len(stale) == len(manifest) else ids
+        games = {g['id']: g for g in game_data.all_games(LIST_FIELDS, wanted)}
+    # The build keeps no game for a file it rejected (a parse error, no
+    # id, or an id an earlier file has), so those few are read from YAML
+    rejected = {f.path: f for f in game_cache.load_game_files(
+        [os.path.join(game_cache.GAMES_DIR, path) for path, game_id, _ in stale
+         if game_id is None])}
+
+    files = {path: cached[path] for path, _, _ in manifest if path in cached}
+    for path, game_id, sha256 in stale:
+        if game_id is None:
+            f = rejected.get(path)
+            files[path] = _file_entry(rules, sha256, f and f.data, f and f.error)
+        else:
+            files[path] = _file_entry(rules, sha256, games.get(game_id),
+                                      "did not load into games.db")
+    return files, len(stale)
+
+
+def _audit_yaml(rules, cached, jobs):
+    """Return ({path: entry}, paths re-checked) from the YAML files."""
+    files, rechecked = {}, 0
+    for f in game_cache.iter_game_files(jobs=jobs, prune=True):
+        entry = cached.get(f.path)
+        if entry is None or entry['sha256'] != f.sha256:
+            entry = _file_entry(rules, f.sha256, f.data, f.error)
+            rechecked += 1
+        files[f.path] = entry
+    return files, rechecked
+
+
+def audit(source='auto', full=False, jobs=None, cache_path=AUDIT_CACHE_PATH):
+    """Audit the catalog and return a JSON-serializable report.
+
+    source is 'db', 'yaml' or 'auto' (games.db when up to date). full
+    ignores cached results. Issues are dicts with path, game_id, rule
+    and message, ordered by path.
+    """
+    start = time.perf_counter()
+    schema, schema_sha = load_schema()
+    rules = compile_rules(schema)
+    fingerprint = f"{AUDIT_VERSION}:{schema_sha}"
+    cached = {} if full else load_audit_cache(cache_path, fingerprint)
+
+    conn = game_data.open_db() if source in ('auto', 'db') else None
+    if source == 'db' and conn is None:
+        raise RuntimeError("games.db is missing or stale; run scripts/build_db.py")
+    if conn is not None:
+        files, rechecked = _audit_db(conn, rules, cached)
+    else:
+        files, rechecked = _audit_yaml(rules, cached, jobs or os.cpu_count() or 1)
+    if rechecked or files.keys() != cached.keys():
+        save_audit_cache(cache_path, fingerprint, files)
+
+    paths_by_id = {}
+    for path, entry in sorted(files.items()):
+        if entry['id'] is not None:
+            paths_by_id.setdefault(entry['id'], []).append(path)
+
+    issues = []
+    for path, entry in sorted(files.items()):
+        game_id = entry['id']
+        found = list(entry['issues'])
+        if game_id is not None and len(paths_by_id[game_id]) > 1:
+            others = [p for p in paths_by_id[game_id] if p != path]
+            found.append(['duplicate_id', f"id '{game_id}' also used by {', '.join(others)}"])
+        for field, target in entry['refs']:
+            if target not in paths_by_id:
+                found.append(['dangling_reference', f"{field} '{target}' is not a game id"])
+        issues += [{'path': path, 'game_id': game_id, 'rule': rule, 'message': message}
+                   for rule, message in found]
+
+    return {
+        'source': 'db' if conn is not None else 'yaml',
+        'games': len(files),
+        'rechecked': rechecked,
+        'elapsed': round(time.perf_counter() - start, 3),
+        'counts': dict(sorted(Counter(issue['rule'] for issue in issues).items())),
+        'issues': issues,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Audit game data against schema.yaml")
+    parser.add_argument("--source", choices=["auto", "db", "yaml"], default="auto",
+                        help="Read games.db or the YAML files (default: db when up to date)")
+    parser.add_argument("--full", action="store_true", help="Re-check every game, ignoring the cache")
+    parser.add_argument("--jobs", type=int, help="Processes for YAML parsing (default: CPU count)")
+    parser.add_argument("--rule", action="append", help="Only report this rule (repeatable)")
+    parser.add_argument("--json", action="store_true", help="Print the full report as JSON")
+    parser.add_argument("--limit", type=int, default=10, help="Examples shown per rule (default: 10)")
+    args = parser.parse_args()
+
+    report = audit(args.source, args.full, args.jobs)
+    if args.rule:
+        report['issues'] = [i for i in report['issues'] if i['rule'] in args.rule]
+        report['counts'] = {r: n for r, n in report['counts'].items() if r in args.rule}
+
+    if args.json:
+        json.dump(report, sys.stdout, indent=2, ensure_ascii=False)
+        print()
+        return
+
+    print(f"{report['games']} files audited from {report['source']} "
+          f"({report['rechecked']} re-checked, {report['elapsed']:.2f}s)")
+    if not report['issues']:
+        print("No issues")
+        return
+    for rule, n in report['counts'].items():
+        print(f"\n{rule}: {n}")
+        shown = [i for i in report['issues'] if i['rule'] == rule][:args.limit]
+        for issue in shown:
+            print(f"  {issue['path']}: {issue['message']}")
+        if n > len(shown):
+            print(f"  ... and {n - len(shown)} more")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""Benchmark the catalog scripts on synthetic catalogs at several scales.
+
+For each scale, generates a synthetic project root with gen_synthetic.py
+(scale 1 = today's catalog size) and runs each benchmarked command in
+its own process, recording wall time, peak RSS and rows/sec (for the
+incremental build, per file edited before the run). Results
+are written as JSON; --compare flags runs that got slower than a saved
+baseline and exits non-zero if any did.
+
+Usage:
+    python3 scripts/bench.py                              # 1x, 10x, 100x
+    python3 scripts/bench.py --scales 1,10 --output bench.json
+    python3 scripts/bench.py --scales 1 --compare bench.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import re
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+# Allow running as a script: ensure project root is on sys.path
+_root = str(Path(__file__).resolve().parent.parent)
+if _root not in sys.path:
+    sys.path.insert(0, _root)
+
+from scripts import gen_synthetic
+
+# YAML files edited before each incremental build run
+INCREMENTAL_SAMPLE = 50
+
+
+def edit_sample(root):
+    """Change a rating in a fixed, evenly spread sample of the catalog's files.
+
+    Each call cycles strategic_depth, so every incremental run sees
+    INCREMENTAL_SAMPLE changed games rather than a no-op.
+    """
+    games_dir = os.path.join(root, "games")
+    names = sorted(os.listdir(games_dir))
+    step = max(1, len(names) // INCREMENTAL_SAMPLE)
+    for name in names[::step][:INCREMENTAL_SAMPLE]:
+        path = os.path.join(games_dir, name)
+        with open(path) as f:
+            text = f.read()
+        text = re.sub(r"^strategic_depth: (\d)$",
+                      lambda m: f"strategic_depth: {(int(m.group(1)) + 1) % 5}",
+                      text, count=1, flags=re.M)
+        with open(path, "w") as f:
+            f.write(text)
+
+
+# (name, script args relative to the synthetic root, unit counted for
+# rows/sec, setup run before each timed run or None)
+BENCHMARKS = [
+    ("build_db", ["scripts/build_db.py"], "games", None),
+    ("build_db_incremental", ["scripts/build_db.py", "--incremental"], "edited", edit_sample),
+    ("progress", ["scripts/progress.py", "0"], "games", None),
+    ("backfill", ["scripts/update_master_status.py", "--backfill", "--dry-run"],
+     "master_rows", None),
+]
+
+# Slowdown vs. baseline that counts as a regression
+REGRESSION_THRESHOLD = 1.2
+
+
+def run_measured(args, cwd):
+    """Run a command; return (wall seconds, peak RSS in MB, return code)."""
+    start = time.perf_counter()
+    proc = subprocess.Popen(args, cwd=cwd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    _, status, usage = os.wait4(proc.pid, 0)
+    wall = time.perf_counter() - start
+    proc.returncode = os.waitstatus_to_exitcode(status)
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    rss_kb = usage.ru_maxrss / 1024 if sys.platform == "darwin" else usage.ru_maxrss
+    return wall, rss_kb / 1024, proc.returncode
+
+
+def bench_scale(scale, work_dir, repeat, reuse):
+    """Generate (or reuse) the catalog for one scale and run every benchmark."""
+    real_games, real_rows = gen_synthetic.real_sizes()
+    n_games = int(real_games * scale)
+    n_rows = int(n_games * real_rows / real_games)
+    root = os.path.join(work_dir, f"scale-{scale:g}x")
+
+    if not (reuse and os.path.isdir(os.path.join(root, "games"))):
+        print(f"Generating {n_games} games for {scale:g}x in {root} ...", file=sys.stderr)
+        gen_synthetic.generate(root, n_games, n_rows)
+    else:
+        # Only the catalog is reused; always time the current scripts
+        gen_synthetic.copy_scripts(root)
+
+    units = {"games": n_games, "master_rows": n_rows,
+             "edited": min(INCREMENTAL_SAMPLE, n_games)}
+    results = []
+    for name, script_args, unit, setup in BENCHMARKS:
+        best = None
+        for _ in range(repeat):
+            if setup:
+                setup(root)
+            wall, rss, code = run_measured([sys.executable] + script_args, root)
+            if best is None or wall < best[0]:
+                best = (wall, rss, code)
+        wall, rss, code = best
+        result = {
+            "scale": scale,
+            "benchmark": name,
+            "games": n_games,
+            "master_rows": n_rows,
+            "wall_s": round(wall, 3),
+            "peak_rss_mb": round(rss, 1),
+            "rows_per_s": round(units[unit] / wall, 1) if wall else None,
+            "returncode": code,
+        }
+        results.append(result)
+        status = "" if code == 0 else f"  (exit {code})"
+        print(f"  {scale:>5g}x {name:<22} {wall:8.2f}s {rss:8.1f} MB "
+              f"{result['rows_per_s'] or 0:>10.0f} rows/s{status}")
+    return results
+
+
+def compare(results, baseline_path):
+    """Print slowdowns vs. a baseline; return the number of regressions."""
+    with open(baseline_path) as f:
+        baseline = {(r["scale"], r["benchmark"]): r for r in json.load(f)["results"]}
+    regressions = 0
+    print(f"\nCompared with {baseline_path}:")
+    for r in results:
+        old = baseline.get((r["scale"], r["benchmark"]))
+        if not old or not old["wall_s"]:
+            continue
+        ratio = r["wall_s"] / old["wall_s"]
+        flag = ""
+        if ratio > REGRESSION_THRESHOLD:
+            flag = "  REGRESSION"
+            regressions += 1
+        print(f"  {r['scale']:>5g}x {r['benchmark']:<22} {old['wall_s']:8.2f}s -> "
+              f"{r['wall_s']:8.2f}s ({ratio:.2f}x){flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark catalog scripts at scale")
+    parser.add_argument("--scales", default="1,10,100",
+                        help="Comma-separated catalog multiples (default: 1,10,100)")
+    parser.add_argument("--work-dir", default=os.path.join("/tmp", "boardgame-bench"),
+                        help="Where synthetic catalogs are generated")
+    parser.add_argument("--output", default="bench_results.json", help="JSON results file")
+    parser.add_argument("--repeat", type=int, default=1, help="Runs per benchmark; best is kept")
+    parser.add_argument("--reuse", action="store_true",
+                        help="Reuse previously generated catalogs in --work-dir "
+                             "(scripts are still re-copied)")
+    parser.add_argument("--compare", metavar="BASELINE", help="Baseline JSON to compare against")
+    args = parser.parse_args()
+
+    scales = [float(s) for s in args.scales.split(",") if s.strip()]
+    results = []
+    for scale in scales:
+        results.extend(bench_scale(scale, args.work_dir, args.repeat, args.reuse))
+
+    report = {
+        "generated_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "results": results,
+    }
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"\nWrote {args.output}")
+
+    if args.compare and compare(results, args.compare):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -6,25 +6,63 @@ SQLite database for querying, searching, and sorting across the
 entire collection. YAML remains the source of truth; this DB is
 a derived read cache that can be rebuilt at any time.
 
+A build_manifest table records (path, mtime, size, sha256) for every
+YAML file that went into the database. Incremental mode uses it to
+re-parse only added, changed or removed files and to replace just
+those games' rows; it falls back to a full rebuild when there is no
+usable database yet. --watch keeps applying such updates as games/
+and images/ change, so edits reach readers within about a second.
+
+A full build writes to a sibling temp file, runs ANALYZE and an
+integrity check, then atomically renames it over games.db, so readers
+never see a missing or half-built database. build_generation holds a
+counter bumped by every build or update; long-lived readers compare it
+(see read_generation) to notice a swap and reopen. After each build
+or update the database is also exported to games.columns, a columnar
+snapshot for analysis (see columnar.py).
+
 Usage:
-    python3 scripts/build_db.py
+    python3 scripts/build_db.py                  # full rebuild
+    python3 scripts/build_db.py --incremental    # only changed files
+    python3 scripts/build_db.py --jobs 8         # parse with 8 processes
+    python3 scripts/build_db.py --watch          # keep games.db in sync
 """
 
-import glob
+import argparse
+import json
 import os
+import re
 import sqlite3
 import sys
+import time
+import unicodedata
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
 
 import yaml
 
-GAMES_DIR = os.path.join(os.path.dirname(__file__), '..', 'games')
-DB_PATH = os.path.join(os.path.dirname(__file__), '..', 'games.db')
+# Allow running as a script: ensure project root is on sys.path
+_root = str(Path(__file__).resolve().parent.parent)
+if _root not in sys.path:
+    sys.path.insert(0, _root)
+
+from scripts import columnar, description_index, game_cache, game_graph, similar_games
+from scripts.db_schema import (ARRAY_FIELDS, DB_PATH, GAME_COLUMNS, GAMES_DIR,
+                               PLAYER_COUNT_FIELDS, SCHEMA_VERSION, SCHEMA_YAML,
+                               VOCAB_FACETS, VOCAB_FIELDS, read_generation)
+from scripts.game_cache import YAML_LOADER
+
+IMAGES_DIR = os.path.join(os.path.dirname(__file__), '..', 'images')
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.webp')
 
 SCHEMA_SQL = """
 -- Core game table: one row per game, scalar fields only
 CREATE TABLE games (
     id TEXT PRIMARY KEY,
     name TEXT NOT NULL,
+    -- Normalized name for ordering (see sort_key)
+    sort_name TEXT NOT NULL,
     year INTEGER,
     edition TEXT,
     game_family TEXT,
@@ -33,6 +71,11 @@ CREATE TABLE games (
     min_playtime INTEGER,
     max_playtime INTEGER,
     min_age INTEGER,
+    -- From possible_counts / true_counts; max is NULL for "6+"
+    min_players INTEGER,
+    max_players INTEGER,
+    best_min_players INTEGER,
+    best_max_players INTEGER,
     length INTEGER,
     rules_complexity INTEGER,
     strategic_depth INTEGER,
@@ -50,39 +93,20 @@ CREATE TABLE game_alternate_names (
     name TEXT NOT NULL
 );
 
-CREATE TABLE game_designers (
-    game_id TEXT NOT NULL REFERENCES games(id),
-    name TEXT NOT NULL
-);
-
-CREATE TABLE game_publishers (
-    game_id TEXT NOT NULL REFERENCES games(id),
-    name TEXT NOT NULL
-);
-
-CREATE TABLE game_artists (
-    game_id TEXT NOT NULL REFERENCES games(id),
-    name TEXT NOT NULL
-);
-
-CREATE TABLE game_categories (
-    game_id TEXT NOT NULL REFERENCES games(id),
-    category TEXT NOT NULL
-);
-
-CREATE TABLE game_evokes (
-    game_id TEXT NOT NULL REFERENCES games(id),
-    evoke TEXT NOT NULL
-);
-
+-- Player counts keep the YAML label ("4", "12+") in count; players is
+-- its number (NULL if unparseable) and open_ended marks "N or more"
 CREATE TABLE game_possible_counts (
     game_id TEXT NOT NULL REFERENCES games(id),
-    count TEXT NOT NULL
+    count TEXT NOT NULL,
+    players INTEGER,
+    open_ended INTEGER NOT NULL DEFAULT 0
 );
 
 CREATE TABLE game_true_counts (
     game_id TEXT NOT NULL REFERENCES games(id),
-    count TEXT NOT NULL
+    count TEXT NOT NULL,
+    players INTEGER,
+    open_ended INTEGER NOT NULL DEFAULT 0
 );
 
 CREATE TABLE game_expansions (
@@ -105,52 +129,439 @@ CREATE TABLE game_upgrades (
     notes TEXT
 );
 
+-- Vocabularies: each distinct term is stored once and referenced by
+-- integer id. Junction tables hold one row per (game, term) with the
+-- term's position in the YAML list; the game_* views keep the original
+-- (game_id, value) table shapes for existing queries.
+CREATE TABLE categories (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE
+);
+
+CREATE TABLE evokes (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE
+);
+
+CREATE TABLE designers (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE
+);
+
+CREATE TABLE publishers (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE
+);
+
+CREATE TABLE artists (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE
+);
+
+CREATE TABLE game_category_ids (
+    game_id TEXT NOT NULL REFERENCES games(id),
+    term_id INTEGER NOT NULL REFERENCES categories(id),
+    position INTEGER NOT NULL,
+    PRIMARY KEY (game_id, term_id)
+) WITHOUT ROWID;
+
+CREATE TABLE game_evoke_ids (
+    game_id TEXT NOT NULL REFERENCES games(id),
+    term_id INTEGER NOT NULL REFERENCES evokes(id),
+    position INTEGER NOT NULL,
+    PRIMARY KEY (game_id, term_id)
+) WITHOUT ROWID;
+
+CREATE TABLE game_designer_ids (
+    game_id TEXT NOT NULL REFERENCES games(id),
+    term_id INTEGER NOT NULL REFERENCES designers(id),
+    position INTEGER NOT NULL,
+    PRIMARY KEY (game_id, term_id)
+) WITHOUT ROWID;
+
+CREATE TABLE game_publisher_ids (
+    game_id TEXT NOT NULL REFERENCES games(id),
+    term_id INTEGER NOT NULL REFERENCES publishers(id),
+    position INTEGER NOT NULL,
+    PRIMARY KEY (game_id, term_id)
+) WITHOUT ROWID;
+
+CREATE TABLE game_artist_ids (
+    game_id TEXT NOT NULL REFERENCES games(id),
+    term_id INTEGER NOT NULL REFERENCES artists(id),
+    position INTEGER NOT NULL,
+    PRIMARY KEY (game_id, term_id)
+) WITHOUT ROWID;
+
+CREATE VIEW game_categories AS
+    SELECT j.game_id, t.name AS category, j.position
+    FROM game_category_ids j JOIN categories t ON t.id = j.term_id;
+
+CREATE VIEW game_evokes AS
+    SELECT j.game_id, t.name AS evoke, j.position
+    FROM game_evoke_ids j JOIN evokes t ON t.id = j.term_id;
+
+CREATE VIEW game_designers AS
+    SELECT j.game_id, t.name AS name, j.position
+    FROM game_designer_ids j JOIN designers t ON t.id = j.term_id;
+
+CREATE VIEW game_publishers AS
+    SELECT j.game_id, t.name AS name, j.position
+    FROM game_publisher_ids j JOIN publishers t ON t.id = j.term_id;
+
+CREATE VIEW game_artists AS
+    SELECT j.game_id, t.name AS name, j.position
+    FROM game_artist_ids j JOIN artists t ON t.id = j.term_id;
+
+-- Box art found in images/ for each game, matched on the
+-- "Name (Year).ext" convention (case-insensitive)
+CREATE TABLE game_images (
+    game_id TEXT NOT NULL REFERENCES games(id),
+    filename TEXT NOT NULL,
+    PRIMARY KEY (game_id, filename)
+) WITHOUT ROWID;
+
+-- Source files that went into this build (drives incremental mode)
+CREATE TABLE build_manifest (
+    path TEXT PRIMARY KEY,
+    game_id TEXT,
+    mtime REAL NOT NULL,
+    size INTEGER NOT NULL,
+    sha256 TEXT NOT NULL
+);
+
+-- Full-text search over names, alternate names, designers and
+-- descriptions. unicode61 with remove_diacritics folds "Bärenpark" and
+-- "Cóatl" to plain ASCII tokens; the prefix indexes serve "bar*" style
+-- queries without scanning the term list.
+CREATE VIRTUAL TABLE games_fts USING fts5(
+    game_id UNINDEXED,
+    name,
+    alternate_names,
+    designers,
+    description,
+    tokenize = 'unicode61 remove_diacritics 2',
+    prefix = '2 3 4'
+);
+
+-- Filter metadata, recomputed after every build or update so serving
+-- the filter options is one read instead of a DISTINCT/GROUP BY per
+-- facet. category_group is the schema.yaml section a category belongs
+-- to (mechanics, styles, themes, designers, publishers) or 'other'.
+CREATE TABLE facet_values (
+    facet TEXT NOT NULL,
+    value TEXT NOT NULL,
+    category_group TEXT,
+    game_count INTEGER NOT NULL,
+    sort_order INTEGER NOT NULL,
+    PRIMARY KEY (facet, value)
+) WITHOUT ROWID;
+
+CREATE TABLE facet_ranges (
+    facet TEXT PRIMARY KEY,
+    min INTEGER,
+    max INTEGER
+);
+
+-- Top-k structurally similar games, rebuilt by similar_games.py
+CREATE TABLE game_neighbors (
+    game_id TEXT NOT NULL,
+    rank INTEGER NOT NULL,
+    neighbor_id TEXT NOT NULL,
+    score REAL NOT NULL,
+    PRIMARY KEY (game_id, rank)
+) WITHOUT ROWID;
+
+-- TF-IDF description vectors, rebuilt by description_index.py; keyed
+-- by term first so the table doubles as an inverted index
+CREATE TABLE description_terms (
+    id INTEGER PRIMARY KEY,
+    term TEXT NOT NULL UNIQUE,
+    df INTEGER NOT NULL,
+    idf REAL NOT NULL
+);
+
+CREATE TABLE description_vectors (
+    term_id INTEGER NOT NULL REFERENCES description_terms(id),
+    game_id TEXT NOT NULL,
+    weight REAL NOT NULL,
+    PRIMARY KEY (term_id, game_id)
+) WITHOUT ROWID;
+
+-- Distinct terms of every indexed description, space-separated, so an
+-- incremental refresh can update document frequencies
+CREATE TABLE description_docs (
+    game_id TEXT PRIMARY KEY,
+    terms TEXT NOT NULL
+) WITHOUT ROWID;
+
+-- Expansion / compatibility graph, rebuilt by game_graph.py: the
+-- connected component of every linked game, and one row per ordered
+-- pair in a component ('expansion': related_id expands game_id,
+-- possibly through other expansions; 'base': the reverse; otherwise
+-- 'compatible'), with the number of links between them
+CREATE TABLE game_components (
+    game_id TEXT PRIMARY KEY,
+    component INTEGER NOT NULL,
+    size INTEGER NOT NULL
+) WITHOUT ROWID;
+
+CREATE TABLE game_closure (
+    game_id TEXT NOT NULL,
+    related_id TEXT NOT NULL,
+    relation TEXT NOT NULL,
+    distance INTEGER NOT NULL,
+    PRIMARY KEY (game_id, related_id)
+) WITHOUT ROWID;
+
+CREATE TABLE game_families (
+    family TEXT PRIMARY KEY,
+    game_count INTEGER NOT NULL,
+    first_year INTEGER,
+    last_year INTEGER
+);
+
+-- Single row, bumped on every full build or incremental update
+CREATE TABLE build_generation (
+    generation INTEGER NOT NULL,
+    built_at TEXT NOT NULL
+);
+"""
+
+# Created after the data is loaded; building a B-tree once from the
+# finished table is cheaper than maintaining it on every insert.
+INDEX_SQL = """
 -- Indexes for common queries
-CREATE INDEX idx_categories_category ON game_categories(category);
-CREATE INDEX idx_evokes_evoke ON game_evokes(evoke);
-CREATE INDEX idx_designers_name ON game_designers(name);
-CREATE INDEX idx_games_year ON games(year);
-CREATE INDEX idx_games_rules_complexity ON games(rules_complexity);
-CREATE INDEX idx_games_strategic_depth ON games(strategic_depth);
-CREATE INDEX idx_games_length ON games(length);
-CREATE INDEX idx_games_feel ON games(feel);
-CREATE INDEX idx_games_value ON games(value);
+CREATE INDEX idx_game_category_ids_term ON game_category_ids(term_id);
+CREATE INDEX idx_game_evoke_ids_term ON game_evoke_ids(term_id);
+CREATE INDEX idx_game_designer_ids_term ON game_designer_ids(term_id);
+CREATE INDEX idx_game_publisher_ids_term ON game_publisher_ids(term_id);
+CREATE INDEX idx_game_artist_ids_term ON game_artist_ids(term_id);
 CREATE INDEX idx_games_name ON games(name);
+
+-- Sorted listings: (sort column, sort_name, id) lets ORDER BY col,
+-- sort_name, id (all ascending or all descending) walk the index
+-- instead of sorting, and still serves range filters
+CREATE INDEX idx_games_sort_name ON games(sort_name, id);
+CREATE INDEX idx_games_year ON games(year, sort_name, id);
+CREATE INDEX idx_games_playtime ON games(playtime_minutes, sort_name, id);
+CREATE INDEX idx_games_rules_complexity ON games(rules_complexity, sort_name, id);
+CREATE INDEX idx_games_strategic_depth ON games(strategic_depth, sort_name, id);
+CREATE INDEX idx_games_length ON games(length, sort_name, id);
+CREATE INDEX idx_games_feel ON games(feel, sort_name, id);
+CREATE INDEX idx_games_value ON games(value, sort_name, id);
+CREATE INDEX idx_games_players ON games(min_players, max_players);
+CREATE INDEX idx_games_family ON games(game_family);
+CREATE INDEX idx_game_components_component ON game_components(component);
+
+-- "Supports N players" / "best at N": players = N, or an open-ended
+-- count at or below N
+CREATE INDEX idx_possible_counts_players ON game_possible_counts(players, game_id);
+CREATE INDEX idx_possible_counts_open ON game_possible_counts(players, game_id) WHERE open_ended;
+CREATE INDEX idx_true_counts_players ON game_true_counts(players, game_id);
+CREATE INDEX idx_true_counts_open ON game_true_counts(players, game_id) WHERE open_ended;
+
+-- Per-game lookups (web batch fetches, incremental deletes)
+CREATE INDEX idx_alternate_names_game ON game_alternate_names(game_id);
+CREATE INDEX idx_possible_counts_game ON game_possible_counts(game_id);
+CREATE INDEX idx_true_counts_game ON game_true_counts(game_id);
+CREATE INDEX idx_expansions_game ON game_expansions(game_id);
+CREATE INDEX idx_compatible_with_game ON game_compatible_with(game_id);
+CREATE INDEX idx_upgrades_game ON game_upgrades(game_id);
+CREATE INDEX idx_description_vectors_game ON description_vectors(game_id);
+"""
+
+# Rows for games_fts, built from the loaded tables; {where} narrows it
+# to the games being refreshed
+SEARCH_INDEX_SQL = """
+INSERT INTO games_fts (game_id, name, alternate_names, designers, description)
+SELECT g.id,
+       g.name,
+       (SELECT group_concat(name, ' ') FROM game_alternate_names WHERE game_id = g.id),
+       (SELECT group_concat(name, ' ') FROM game_designers WHERE game_id = g.id),
+       g.description
+FROM games g
+{where}
 """
 
+# Facets materialized into facet_values besides VOCAB_FACETS:
+# (facet, table, label column, value column)
+VALUE_FACETS = [
+    ('true_count', 'game_true_counts', 'count', 'players'),
+]
+
+# Numeric games columns whose min/max go into facet_ranges
+RANGE_COLUMNS = ['year', 'playtime_minutes']
+
+# Every table keyed by game_id, in the order rows are deleted
+CHILD_TABLES = ([table for _, table, _ in ARRAY_FIELDS]
+                + [table for _, table, _, _ in PLAYER_COUNT_FIELDS]
+                + [junction for _, _, junction in VOCAB_FIELDS]
+                + ['game_upgrades', 'game_images'])
+
 
-def load_yaml_files():
+def _insert_sql(table, columns):
+    placeholders = ', '.join('?' for _ in columns)
+    return f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({placeholders})"
+
+
+# Insert statement per table; games first so child foreign keys resolve
+INSERT_SQL = {
+    'games': _insert_sql('games', GAME_COLUMNS),
+    **{table: _insert_sql(table, ['game_id', col]) for _, table, col in ARRAY_FIELDS},
+    **{table: _insert_sql(table, ['game_id', 'count', 'players', 'open_ended'])
+       for _, table, _, _ in PLAYER_COUNT_FIELDS},
+    **{junction: _insert_sql(junction, ['game_id', 'term_id', 'position'])
+       for _, _, junction in VOCAB_FIELDS},
+    'game_upgrades': _insert_sql(
+        'game_upgrades', ['game_id', 'name', 'year', 'type', 'publisher', 'notes']),
+}
+
+# sort_key(): leading articles move to the end, and digit runs are
+# zero-padded to SORT_NUMBER_WIDTH
+SORT_ARTICLES = {'the', 'a', 'an'}
+SORT_NUMBER_WIDTH = 10
+SORT_PUNCT_RE = re.compile(r'[\W_]+')
+SORT_DIGITS_RE = re.compile(r'\d+')
+
+# Pending rows (across all tables) per executemany flush
+BATCH_ROWS = 50000
+
+# A full build writes a temp file nobody else is reading yet, so
+# durability can wait until the end; SERVE_PRAGMAS restores it. The
+# served file uses a rollback journal rather than WAL: a -wal file left
+# next to games.db would otherwise be replayed onto the swapped-in file.
+BUILD_PRAGMAS = [
+    "PRAGMA journal_mode=OFF",
+    "PRAGMA synchronous=OFF",
+    "PRAGMA cache_size=-262144",  # 256 MiB
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA foreign_keys=ON",
+]
+SERVE_PRAGMAS = [
+    "PRAGMA journal_mode=DELETE",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA cache_size=-2000",
+    "PRAGMA temp_store=DEFAULT",
+]
+
+
+def list_yaml_files():
+    """Return sorted paths of all YAML game files."""
+    return game_cache.list_yaml_files(GAMES_DIR)
+
+
+def parse_yaml_files(paths, jobs=None, complete=False):
+    """Yield (manifest_row, game dict or None) for paths, in path order.
+
+    Parsed YAML comes from the shared game cache, which only re-parses
+    files whose content changed (across a process pool when there are
+    many). The manifest row is (path, game_id, mtime, size, sha256)
+    with path relative to games/. Pass complete=True when paths is the
+    whole of games/ so cache entries for deleted files are dropped.
+    """
+    for f in game_cache.iter_game_files(paths, jobs or os.cpu_count() or 1, prune=complete):
+        if f.error:
+            print(f"Error parsing {f.path}: {f.error}", file=sys.stderr)
+        game = None
+        if isinstance(f.data, dict) and 'id' in f.data:
+            # Unquoted numeric slugs (e.g. "1829") load as ints; copy so
+            # the cached dict is left as parsed
+            game = dict(f.data, id=str(f.data['id']))
+        yield (f.path, game['id'] if game else None, f.mtime, f.size, f.sha256), game
+
+
+def load_yaml_files(jobs=None):
     """Load all YAML game files and return a list of dicts."""
-    pattern = os.path.join(GAMES_DIR, '*.yaml')
-    files = sorted(glob.glob(pattern))
-    games = []
-    for path in files:
-        with open(path, 'r') as f:
-            data = yaml.safe_load(f)
-        if data and 'id' in data:
-            games.append(data)
-    return games
-
-
-def insert_game(cursor, game):
-    """Insert a single game into all relevant tables."""
+    return [game for _, game in parse_yaml_files(list_yaml_files(), jobs, complete=True) if game]
+
+
+class StageTimer:
+    """Accumulate wall-clock time per build stage."""
+
+    def __init__(self):
+        self.stages = {}
+
+    @contextmanager
+    def stage(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            self.stages[name] = self.stages.get(name, 0.0) + elapsed
+
+    def report(self, jobs):
+        parts = [f"{name} {secs:.2f}s" for name, secs in self.stages.items()]
+        print(f"Stages: {', '.join(parts)} "
+              f"(jobs={jobs}, loader={YAML_LOADER.__name__})")
+
+
+def parse_player_count(value):
+    """Parse a player count like 4, "4" or "6+".
+
+    Returns: (players, open_ended); players is None if value isn't a
+    count, and open_ended is True for "N or more".
+    """
+    text = str(value).strip()
+    open_ended = text.endswith('+')
+    digits = text.rstrip('+').strip()
+    if not digits.isdigit():
+        return None, False
+    return int(digits), open_ended
+
+
+def player_count_rows(game_id, items):
+    """Return (count rows, min players, max players) for one count list.
+
+    max is None when any count is open-ended ("6+").
+    """
+    rows = []
+    for item in items:
+        players, open_ended = parse_player_count(item)
+        rows.append((game_id, str(item), players, int(open_ended)))
+    numbers = [players for _, _, players, _ in rows if players is not None]
+    if not numbers:
+        return rows, None, None
+    open_max = any(open_ended for _, _, _, open_ended in rows)
+    return rows, min(numbers), None if open_max else max(numbers)
+
+
+def sort_key(name):
+    """Return the ordering key for a game name.
+
+    Casefolded with diacritics removed, punctuation collapsed to single
+    spaces, a leading article moved to the end ("The Crew" sorts as
+    "crew the") and digit runs zero-padded so numbers compare by value
+    ("7 Wonders" before "12 Realms").
+    """
+    folded = unicodedata.normalize('NFKD', str(name))
+    folded = ''.join(c for c in folded if not unicodedata.combining(c)).casefold()
+    words = SORT_PUNCT_RE.sub(' ', folded).split()
+    if len(words) > 1 and words[0] in SORT_ARTICLES:
+        words = words[1:] + words[:1]
+    return SORT_DIGITS_RE.sub(lambda m: m.group().zfill(SORT_NUMBER_WIDTH), ' '.join(words))
+
+
+def game_rows(game):
+    """Flatten one game dict into {table: [row tuple, ...]}."""
     # Extract total_plays from nested plays_tracked
     total_plays = 0
     plays_tracked = game.get('plays_tracked')
     if isinstance(plays_tracked, dict):
         total_plays = plays_tracked.get('total_plays', 0) or 0
 
-    # Insert into main games table
-    cursor.execute("""
-        INSERT INTO games (
-            id, name, year, edition, game_family, base_game,
-            playtime_minutes, min_playtime, max_playtime, min_age,
-            length, rules_complexity, strategic_depth, feel, value,
-            affinity, hotness, description, total_plays
-        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-    """, (
+    game_id = game['id']
+    rows = {}
+    player_ranges = []
+    for yaml_key, table, _, _ in PLAYER_COUNT_FIELDS:
+        rows[table], low, high = player_count_rows(game_id, game.get(yaml_key) or [])
+        player_ranges += [low, high]
+
+    rows['games'] = [(
         game['id'],
         game['name'],
+        sort_key(game['name']),
         game.get('year'),
         game.get('edition'),
         game.get('game_family'),
@@ -159,6 +570,7 @@ def insert_game(cursor, game):
         game.get('min_playtime'),
         game.get('max_playtime'),
         game.get('min_age'),
+        *player_ranges,
         game.get('length'),
         game.get('rules_complexity'),
         game.get('strategic_depth'),
@@ -168,85 +580,373 @@ def insert_game(cursor, game):
         game.get('hotness'),
         game.get('description', '').strip() if game.get('description') else None,
         total_plays,
-    ))
+    )]
 
-    game_id = game['id']
-
-    # Array fields: (yaml_key, table_name, column_name)
-    array_fields = [
-        ('alternate_names', 'game_alternate_names', 'name'),
-        ('designer', 'game_designers', 'name'),
-        ('publisher', 'game_publishers', 'name'),
-        ('artist', 'game_artists', 'name'),
-        ('categories', 'game_categories', 'category'),
-        ('evokes', 'game_evokes', 'evoke'),
-        ('possible_counts', 'game_possible_counts', 'count'),
-        ('true_counts', 'game_true_counts', 'count'),
-        ('expansions', 'game_expansions', 'expansion_id'),
-        ('compatible_with', 'game_compatible_with', 'compatible_id'),
-    ]
+    for yaml_key, table, col in ARRAY_FIELDS:
+        items = game.get(yaml_key) or []
+        rows[table] = [(game_id, str(item)) for item in items]
 
-    for yaml_key, table, col in array_fields:
+    # Vocabulary terms stay as names here; BulkInserter encodes them
+    for yaml_key, _, junction in VOCAB_FIELDS:
         items = game.get(yaml_key) or []
-        for item in items:
-            cursor.execute(
-                f"INSERT INTO {table} (game_id, {col}) VALUES (?, ?)",
-                (game_id, str(item))
-            )
+        rows[junction] = [(game_id, str(item), pos) for pos, item in enumerate(items)]
 
     # Upgrades (nested objects)
-    for upgrade in (game.get('upgrades') or []):
-        if isinstance(upgrade, dict):
-            cursor.execute("""
-                INSERT INTO game_upgrades (game_id, name, year, type, publisher, notes)
-                VALUES (?, ?, ?, ?, ?, ?)
-            """, (
-                game_id,
-                upgrade.get('name'),
-                upgrade.get('year'),
-                upgrade.get('type'),
-                upgrade.get('publisher'),
-                upgrade.get('notes'),
-            ))
-
-
-def build_database():
-    """Build the SQLite database from YAML files."""
-    games = load_yaml_files()
-    if not games:
-        print("No YAML files found in games/", file=sys.stderr)
-        sys.exit(1)
+    rows['game_upgrades'] = [
+        (
+            game_id,
+            upgrade.get('name'),
+            upgrade.get('year'),
+            upgrade.get('type'),
+            upgrade.get('publisher'),
+            upgrade.get('notes'),
+        )
+        for upgrade in (game.get('upgrades') or [])
+        if isinstance(upgrade, dict)
+    ]
+    return rows
+
+
+class BulkInserter:
+    """Buffer rows per table and write them with executemany.
+
+    Rows are flushed once batch_size rows are pending, parents (games
+    and new vocabulary terms) before children so foreign keys always
+    resolve. Games are validated as they are added, so one bad file is
+    reported and skipped without failing the batch it would have landed
+    in. Vocabulary names are encoded to integer term ids against the
+    lookup tables already in the database.
+
+    add() returns False for a game it rejected (invalid or a duplicate
+    id), so callers record no game_id for that file.
+    """
+
+    def __init__(self, cursor, existing_ids=(), batch_size=BATCH_ROWS):
+        self.cursor = cursor
+        self.batch_size = batch_size
+        self.seen_ids = set(existing_ids)
+        self.pending = {table: [] for table in INSERT_SQL}
+        self.pending_count = 0
+        self.terms = {}
+        self.new_terms = {}
+        self.next_term_id = {}
+        for _, lookup, _ in VOCAB_FIELDS:
+            self.terms[lookup] = dict(cursor.execute(f"SELECT name, id FROM {lookup}"))
+            self.new_terms[lookup] = []
+            self.next_term_id[lookup] = max(self.terms[lookup].values(), default=0) + 1
+
+    def term_id(self, lookup, name):
+        terms = self.terms[lookup]
+        term_id = terms.get(name)
+        if term_id is None:
+            term_id = terms[name] = self.next_term_id[lookup]
+            self.next_term_id[lookup] += 1
+            self.new_terms[lookup].append((term_id, name))
+        return term_id
+
+    def add(self, game):
+        game_id = game.get('id', '???')
+        try:
+            rows = game_rows(game)
+        except Exception as e:
+            print(f"Error inserting {game_id}: {e}", file=sys.stderr)
+            return False
+        if game_id in self.seen_ids:
+            print(f"Error inserting {game_id}: duplicate id", file=sys.stderr)
+            return False
+        self.seen_ids.add(game_id)
+
+        for _, lookup, junction in VOCAB_FIELDS:
+            encoded = {}
+            for gid, name, pos in rows[junction]:
+                encoded.setdefault(self.term_id(lookup, name), (gid, pos))
+            rows[junction] = [(gid, tid, pos) for tid, (gid, pos) in encoded.items()]
+
+        for table, table_rows in rows.items():
+            self.pending[table].extend(table_rows)
+            self.pending_count += len(table_rows)
+        if self.pending_count >= self.batch_size:
+            self.flush()
+        return True
+
+    def flush(self):
+        games = self.pending['games']
+        if games:
+            self.cursor.executemany(INSERT_SQL['games'], games)
+            games.clear()
+        for lookup, terms in self.new_terms.items():
+            if terms:
+                self.cursor.executemany(
+                    f"INSERT INTO {lookup} (id, name) VALUES (?, ?)", terms)
+                terms.clear()
+        for table, rows in self.pending.items():
+            if rows:
+                self.cursor.executemany(INSERT_SQL[table], rows)
+                rows.clear()
+        self.pending_count = 0
+
+
+def delete_games(cursor, game_ids):
+    """Delete games and all of their child rows."""
+    for game_id in game_ids:
+        for table in CHILD_TABLES:
+            cursor.execute(f"DELETE FROM {table} WHERE game_id = ?", (game_id,))
+        cursor.execute("DELETE FROM games WHERE id = ?", (game_id,))
+
+
+def prune_terms(cursor):
+    """Drop vocabulary terms no game references any more."""
+    for _, lookup, junction in VOCAB_FIELDS:
+        cursor.execute(f"DELETE FROM {lookup} "
+                       f"WHERE id NOT IN (SELECT term_id FROM {junction})")
+
+
+def refresh_search_index(cursor, game_ids=None):
+    """Rebuild games_fts rows for game_ids, or the whole index if None.
+
+    Ids that no longer exist in games are simply dropped.
+    """
+    if game_ids is None:
+        cursor.execute("DELETE FROM games_fts")
+        cursor.execute(SEARCH_INDEX_SQL.format(where=''))
+        cursor.execute("INSERT INTO games_fts (games_fts) VALUES ('optimize')")
+        return
+    ids_json = json.dumps(sorted(game_ids))
+    cursor.execute("DELETE FROM games_fts WHERE game_id IN (SELECT value FROM json_each(?))",
+                   (ids_json,))
+    cursor.execute(SEARCH_INDEX_SQL.format(
+        where="WHERE g.id IN (SELECT value FROM json_each(?))"), (ids_json,))
+
+
+def load_category_groups():
+    """Return {category: group} from the categories section of schema.yaml."""
+    if not os.path.exists(SCHEMA_YAML):
+        return {}
+    with open(SCHEMA_YAML) as f:
+        schema = yaml.load(f, Loader=YAML_LOADER) or {}
+    groups = {}
+    for group, values in (schema.get('categories') or {}).items():
+        for value in values or []:
+            groups.setdefault(str(value), group)
+    return groups
+
+
+def rebuild_facets(cursor):
+    """Recompute facet_values and facet_ranges from the loaded tables."""
+    cursor.execute("DELETE FROM facet_values")
+    cursor.execute("DELETE FROM facet_ranges")
+
+    for facet, lookup, junction in VOCAB_FACETS:
+        # Junction primary keys are (game_id, term_id), so COUNT(*) per
+        # term is already a count of distinct games
+        cursor.execute(f"""
+            INSERT INTO facet_values (facet, value, game_count, sort_order)
+            SELECT ?, t.name, COUNT(*), ROW_NUMBER() OVER (ORDER BY t.name)
+            FROM {junction} j JOIN {lookup} t ON t.id = j.term_id
+            GROUP BY j.term_id
+        """, (facet,))
+
+    for facet, table, col, sort_col in VALUE_FACETS:
+        # Sorted by number, not label ("2" before "10" before "12+")
+        cursor.execute(f"""
+            INSERT INTO facet_values (facet, value, game_count, sort_order)
+            SELECT ?, {col}, COUNT(DISTINCT game_id),
+                   ROW_NUMBER() OVER (ORDER BY MIN({sort_col}), {col})
+            FROM {table}
+            GROUP BY {col}
+        """, (facet,))
+
+    cursor.executemany(
+        "UPDATE facet_values SET category_group = ? WHERE facet = 'category' AND value = ?",
+        [(group, value) for value, group in load_category_groups().items()],
+    )
+    cursor.execute("UPDATE facet_values SET category_group = 'other' "
+                   "WHERE facet = 'category' AND category_group IS NULL")
+
+    for col in RANGE_COLUMNS:
+        cursor.execute(f"""
+            INSERT INTO facet_ranges (facet, min, max)
+            SELECT ?, MIN({col}), MAX({col}) FROM games WHERE {col} IS NOT NULL
+        """, (col,))
+
+
+def refresh_images(cursor, game_ids=None):
+    """Re-match image files to games_ids (or all games if None)."""
+    by_stem = {}
+    if os.path.isdir(IMAGES_DIR):
+        for fname in sorted(os.listdir(IMAGES_DIR)):
+            stem, ext = os.path.splitext(fname)
+            if ext.lower() in IMAGE_EXTENSIONS:
+                by_stem.setdefault(stem.lower(), []).append(fname)
+
+    if game_ids is None:
+        cursor.execute("DELETE FROM game_images")
+        games = cursor.execute("SELECT id, name, year FROM games").fetchall()
+    else:
+        ids_json = json.dumps(sorted(game_ids))
+        cursor.execute("DELETE FROM game_images WHERE game_id IN (SELECT value FROM json_each(?))",
+                       (ids_json,))
+        games = cursor.execute("SELECT id, name, year FROM games "
+                               "WHERE id IN (SELECT value FROM json_each(?))",
+                               (ids_json,)).fetchall()
+
+    cursor.executemany(
+        "INSERT INTO game_images (game_id, filename) VALUES (?, ?)",
+        [(game_id, fname)
+         for game_id, name, year in games if name and year
+         for fname in by_stem.get(f"{name} ({year})".lower(), [])],
+    )
+
+
+def refresh_derived(cursor, game_ids=None):
+    """Bring every derived table up to date after games were loaded.
+
+    game_ids limits per-game derived rows to the games that were
+    inserted, changed or removed (and, for neighbors and the graph, the
+    games whose rows depend on them); None rebuilds everything.
+    Catalog-wide aggregates are always recomputed.
+
+    Returns the game_graph report (components, cycles, dangling ids).
+    """
+    refresh_search_index(cursor, game_ids)
+    refresh_images(cursor, game_ids)
+    rebuild_facets(cursor)
+    similar_games.rebuild_neighbors(cursor, game_ids=game_ids)
+    description_index.refresh_description_index(cursor, game_ids)
+    return game_graph.rebuild_graph(cursor, game_ids)
+
+
+def insert_games(cursor, games, existing_ids=()):
+    """Insert games, reporting (not raising) per-game failures.
+
+    Returns a list with True for each game that was inserted.
+    """
+    inserter = BulkInserter(cursor, existing_ids)
+    inserted = [inserter.add(game) for game in games]
+    inserter.flush()
+    return inserted
 
-    # Remove existing DB for clean rebuild
-    if os.path.exists(DB_PATH):
-        os.remove(DB_PATH)
 
+def _without_game(row):
+    """A manifest row for a file that put no game in the database."""
+    return row[:1] + (None,) + row[2:]
+
+
+def ingest_files(cursor, paths, jobs, timer):
+    """Stream parsed files into the database in path order.
+
+    Returns the manifest rows for every file read, with no game_id for
+    files whose game was rejected.
+    """
+    manifest = []
+    inserter = BulkInserter(cursor)
+    parsed = parse_yaml_files(paths, jobs, complete=True)
+    while True:
+        with timer.stage('parse'):
+            item = next(parsed, None)
+        if item is None:
+            break
+        row, game = item
+        if game:
+            with timer.stage('insert'):
+                if not inserter.add(game):
+                    row = _without_game(row)
+        manifest.append(row)
+    with timer.stage('insert'):
+        inserter.flush()
+    return manifest
+
+
+def write_manifest(cursor, rows):
+    """Upsert build_manifest rows."""
+    cursor.executemany(
+        "INSERT OR REPLACE INTO build_manifest (path, game_id, mtime, size, sha256) "
+        "VALUES (?, ?, ?, ?, ?)",
+        rows,
+    )
+
+
+def open_existing_db():
+    """Open games.db for an incremental update.
+
+    Returns None if there is no database or it was built with a
+    different schema, in which case a full rebuild is required.
+    """
+    if not os.path.exists(DB_PATH):
+        return None
     conn = sqlite3.connect(DB_PATH)
-    conn.execute("PRAGMA journal_mode=WAL")
+    version = conn.execute("PRAGMA user_version").fetchone()[0]
+    if version != SCHEMA_VERSION:
+        conn.close()
+        return None
+    conn.execute("PRAGMA journal_mode=DELETE")
     conn.execute("PRAGMA foreign_keys=ON")
-    cursor = conn.cursor()
+    return conn
+
+
+def bump_generation(cursor, previous=None):
+    """Set build_generation to one past the current (or given) value."""
+    if previous is None:
+        row = cursor.execute("SELECT generation FROM build_generation").fetchone()
+        previous = row[0] if row else 0
+    built_at = datetime.now(timezone.utc).isoformat(timespec='seconds')
+    cursor.execute("DELETE FROM build_generation")
+    cursor.execute("INSERT INTO build_generation (generation, built_at) VALUES (?, ?)",
+                   (previous + 1, built_at))
+    return previous + 1
 
-    # Create schema
-    cursor.executescript(SCHEMA_SQL)
 
-    # Insert all games
-    for game in games:
+def finalize_database(conn):
+    """Gather planner statistics and verify the file before it is served."""
+    conn.execute("ANALYZE")
+    conn.execute("PRAGMA optimize")
+    problems = [row[0] for row in conn.execute("PRAGMA integrity_check")]
+    if problems != ['ok']:
+        raise RuntimeError("integrity check failed: " + "; ".join(problems[:5]))
+
+
+def swap_into_place(tmp_path):
+    """Atomically replace games.db with a finished build."""
+    with open(tmp_path, 'rb') as f:
+        os.fsync(f.fileno())
+    # Drain any -wal left by an older WAL-mode games.db so SQLite cannot
+    # replay it onto the new file after the rename
+    if os.path.exists(DB_PATH + '-wal'):
         try:
-            insert_game(cursor, game)
-        except Exception as e:
-            print(f"Error inserting {game.get('id', '???')}: {e}", file=sys.stderr)
+            old = sqlite3.connect(DB_PATH)
+            old.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+            old.execute("PRAGMA journal_mode=DELETE")
+            old.close()
+        except sqlite3.Error as e:
+            print(f"Warning: could not checkpoint old games.db: {e}", file=sys.stderr)
+    os.replace(tmp_path, DB_PATH)
 
-    conn.commit()
 
-    # Print summary
+def export_snapshot():
+    """Write games.columns from games.db; a failure only warns.
+
+    games.db is already in place by now, so a failed export must not
+    fail the build. The old snapshot is removed rather than left
+    describing a previous generation, and the next update rewrites it.
+    """
+    try:
+        columnar.write_snapshot(DB_PATH)
+    except (OSError, sqlite3.Error, ValueError) as e:
+        print(f"Warning: could not write {columnar.SNAPSHOT_PATH}: {e}", file=sys.stderr)
+        try:
+            os.remove(columnar.SNAPSHOT_PATH)
+        except OSError:
+            pass
+
+
+def print_summary(cursor):
+    """Print row counts for the main tables."""
     counts = {}
     for table in ['games', 'game_categories', 'game_evokes', 'game_designers',
                    'game_publishers', 'game_artists', 'game_upgrades']:
         cursor.execute(f"SELECT COUNT(*) FROM {table}")
         counts[table] = cursor.fetchone()[0]
 
-    conn.close()
-
     print(f"Built {DB_PATH}: "
           f"{counts['games']} games, "
           f"{counts['game_categories']} categories, "
@@ -257,5 +957,242 @@ def build_database():
           f"{counts['game_upgrades']} upgrades")
 
 
+def build_database(jobs=None):
+    """Build the SQLite database from YAML files.
+
+    Builds into a temp file next to games.db and swaps it in only after
+    it passes an integrity check; on any failure the old games.db is
+    left untouched.
+    """
+    jobs = jobs or os.cpu_count() or 1
+    timer = StageTimer()
+    with timer.stage('list'):
+        paths = list_yaml_files()
+    if not paths:
+        print("No YAML files found in games/", file=sys.stderr)
+        sys.exit(1)
+
+    tmp_path = f"{DB_PATH}.tmp-{os.getpid()}"
+    if os.path.exists(tmp_path):
+        os.remove(tmp_path)
+
+    previous_generation = read_generation() or 0
+    conn = sqlite3.connect(tmp_path)
+    try:
+        for pragma in BUILD_PRAGMAS:
+            conn.execute(pragma)
+        cursor = conn.cursor()
+
+        # Create schema
+        cursor.executescript(SCHEMA_SQL)
+        cursor.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+        manifest = ingest_files(cursor, paths, jobs, timer)
+        with timer.stage('insert'):
+            write_manifest(cursor, manifest)
+            conn.commit()
+        with timer.stage('index'):
+            cursor.executescript(INDEX_SQL)
+            conn.commit()
+        with timer.stage('derive'):
+            graph = refresh_derived(cursor)
+            conn.commit()
+
+        with timer.stage('finalize'):
+            generation = bump_generation(cursor, previous_generation)
+            conn.commit()
+            finalize_database(conn)
+            for pragma in SERVE_PRAGMAS:
+                conn.execute(pragma)
+        print_summary(cursor)
+        game_graph.print_report(graph)
+        conn.close()
+
+        with timer.stage('finalize'):
+            swap_into_place(tmp_path)
+    except BaseException:
+        conn.close()
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+    with timer.stage('export'):
+        export_snapshot()
+
+    print(f"Generation {generation}")
+    if not similar_games.NUMPY_AVAILABLE:
+        print("numpy not installed: game_neighbors left empty", file=sys.stderr)
+    timer.report(jobs)
+
+
+def update_database(jobs=None, paths=None, images_changed=False, verbose=True):
+    """Apply only added, changed and removed YAML files to games.db.
+
+    Files whose mtime and size match the manifest are skipped without
+    being read. Files that differ are hashed; only a changed hash
+    causes a re-parse. paths restricts the check to those files (as
+    reported by a watcher) instead of listing games/; images_changed
+    re-matches every game against images/. All changes land in one
+    transaction, which is rolled back if anything fails. Falls back to
+    build_database() when games.db is missing or has an older schema.
+
+    Returns True if the database changed.
+    """
+    conn = open_existing_db()
+    if conn is None:
+        print("No compatible games.db found, doing a full rebuild", file=sys.stderr)
+        build_database(jobs)
+        return True
+
+    try:
+        cursor = conn.cursor()
+        manifest = {
+            path: (game_id, mtime, size, sha256)
+            for path, game_id, mtime, size, sha256
+            in cursor.execute("SELECT path, game_id, mtime, size, sha256 FROM build_manifest")
+        }
+
+        if paths is None:
+            existing = list_yaml_files()
+            seen = {os.path.basename(path) for path in existing}
+            removed = [path for path in manifest if path not in seen]
+        else:
+            paths = sorted({p for p in paths if p.endswith('.yaml')})
+            existing = [p for p in paths if os.path.isfile(p)]
+            removed = [os.path.basename(p) for p in paths
+                       if not os.path.isfile(p) and os.path.basename(p) in manifest]
+
+        candidates = []
+        for path in existing:
+            old = manifest.get(os.path.basename(path))
+            st = os.stat(path)
+            if not (old and old[1] == st.st_mtime and old[2] == st.st_size):
+                candidates.append(path)
+
+        added, changed, touched = [], [], []
+        stale_ids = set()
+        for row, game in parse_yaml_files(candidates, jobs):
+            old = manifest.get(row[0])
+            if old and old[3] == row[4]:
+                # Content unchanged: refresh mtime only, keeping the stored
+                # game_id (None if the game was rejected)
+                touched.append(row[:1] + (old[0],) + row[2:])
+                continue
+            if old and old[0]:
+                stale_ids.add(old[0])
+            (changed if old else added).append((row, game))
+
+        for path in removed:
+            if manifest[path][0]:
+                stale_ids.add(manifest[path][0])
+
+        # A file rejected earlier for a duplicate id may now own a freed id
+        if stale_ids:
+            parsed = {row[0] for row, _ in added + changed} | {row[0] for row in touched}
+            retry = [os.path.join(GAMES_DIR, path) for path, (game_id, *_) in manifest.items()
+                     if game_id is None and path not in parsed and path not in removed]
+            for row, game in parse_yaml_files(retry, jobs):
+                if game and game['id'] in stale_ids:
+                    changed.append((row, game))
+
+        # Insert in path order, as a full build does, so the same file wins
+        # a duplicate id
+        pending = sorted(added + changed, key=lambda item: item[0][0])
+        delete_games(cursor, sorted(stale_ids))
+        existing_ids = [game_id for (game_id,) in cursor.execute("SELECT id FROM games")]
+        inserted = iter(insert_games(cursor, [game for _, game in pending if game], existing_ids))
+        manifest_rows, new_ids = [], set()
+        for row, game in pending:
+            if game and next(inserted):
+                new_ids.add(game['id'])
+                manifest_rows.append(row)
+            else:
+                manifest_rows.append(_without_game(row))
+        affected_ids = stale_ids | new_ids
+        graph = None
+        if affected_ids:
+            prune_terms(cursor)
+            graph = refresh_derived(cursor, affected_ids)
+        if images_changed:
+            refresh_images(cursor)
+        if removed:
+            cursor.executemany("DELETE FROM build_manifest WHERE path = ?",
+                               [(path,) for path in removed])
+        write_manifest(cursor, touched + manifest_rows)
+        modified = bool(added or changed or removed or images_changed)
+        if modified:
+            bump_generation(cursor)
+        conn.commit()
+    except BaseException:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+
+    if modified or not os.path.exists(columnar.SNAPSHOT_PATH):
+        export_snapshot()
+
+    if verbose or modified:
+        unchanged = len(manifest) - len(changed) - len(removed)
+        print(f"Updated {DB_PATH}: "
+              f"{len(added)} added, {len(changed)} changed, "
+              f"{len(removed)} removed, {unchanged} unchanged"
+              + (", images re-matched" if images_changed else ""))
+        if graph:
+            game_graph.print_report(graph, details=False)
+    return modified
+
+
+def watch_database(jobs=None):
+    """Keep games.db in sync with games/ and images/ until interrupted."""
+    from scripts.fs_watch import debounced, open_watcher
+
+    games_dir = os.path.abspath(GAMES_DIR)
+    images_dir = os.path.abspath(IMAGES_DIR)
+    update_database(jobs, images_changed=True)
+    watcher = open_watcher([games_dir, images_dir])
+    print(f"Watching {games_dir} and {images_dir} (Ctrl-C to stop)")
+    try:
+        for changed in debounced(watcher):
+            if changed is None:
+                # Event queue overflowed; fall back to a full manifest scan
+                game_paths, images_changed = None, True
+            else:
+                game_paths = [p for p in changed if os.path.dirname(p) == games_dir]
+                images_changed = any(os.path.dirname(p) == images_dir for p in changed)
+                if not (game_paths or images_changed):
+                    continue
+            try:
+                update_database(jobs, paths=game_paths, images_changed=images_changed,
+                                verbose=False)
+            except Exception as e:
+                # Typically a file caught mid-write; its next event retries it
+                print(f"Error applying changes: {e}", file=sys.stderr)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        watcher.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build games.db from games/*.yaml")
+    parser.add_argument("--incremental", action="store_true",
+                        help="Only re-parse added, changed or removed YAML files")
+    parser.add_argument("--full", action="store_true",
+                        help="Force a full rebuild (default)")
+    parser.add_argument("--jobs", "-j", type=int, default=None, metavar="N",
+                        help="Parser processes (default: CPU count)")
+    parser.add_argument("--watch", action="store_true",
+                        help="Stay running and apply changes to games/ and images/")
+    args = parser.parse_args()
+
+    if args.watch:
+        watch_database(args.jobs)
+    elif args.incremental and not args.full:
+        update_database(args.jobs)
+    else:
+        build_database(args.jobs)
+
+
 if __name__ == '__main__':
-    build_database()
+    main()
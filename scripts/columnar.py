@@ -0,0 +1,303 @@
+#!/usr/bin/env python3
+"""Columnar, memory-mappable snapshot of the catalog for analysis.
+
+build_db.py writes games.columns next to games.db after every build.
+The file is a JSON header followed by 8-byte aligned arrays, one row
+per game in id order:
+
+  - numeric columns: int32, with NULL stored as INT32_MIN
+  - string columns: int32 codes into a dictionary kept in the header
+    (-1 for NULL)
+  - multi-valued fields: an offsets array (n + 1 entries) plus a flat
+    values array, so game i's values are values[offsets[i]:offsets[i+1]]
+    (codes into a dictionary, or numbers for player counts)
+
+Snapshot opens the file with mmap and hands out views straight into
+it; nothing is copied or parsed beyond the header. With numpy
+installed the views are numpy arrays and whole-catalog statistics are
+vectorized; without it they are memoryviews.
+
+Usage:
+    python3 scripts/columnar.py          # summary report with timings
+
+Can also be imported as a module:
+    from scripts.columnar import Snapshot
+    snap = Snapshot()
+    years = snap.column('year')
+    offsets, codes, names = snap.multi('categories')
+"""
+
+import array
+import json
+import mmap
+import os
+import sqlite3
+import struct
+import sys
+import time
+from pathlib import Path
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+# Allow running as a script: ensure project root is on sys.path
+_root = str(Path(__file__).resolve().parent.parent)
+if _root not in sys.path:
+    sys.path.insert(0, _root)
+
+from scripts.db_schema import DB_PATH
+
+SNAPSHOT_PATH = os.path.join(os.path.dirname(__file__), '..', 'games.columns')
+
+MAGIC = b"BGCOLS01"
+HEADER = struct.Struct("<8sQ")  # magic, JSON header length
+ALIGN = 8
+NULL_INT = -2 ** 31
+INT32_MAX = 2 ** 31 - 1
+
+NUMERIC_COLUMNS = [
+    'year', 'playtime_minutes', 'min_playtime', 'max_playtime', 'min_age',
+    'min_players', 'max_players', 'best_min_players', 'best_max_players',
+    'length', 'rules_complexity', 'strategic_depth', 'feel', 'value',
+    'affinity', 'hotness', 'total_plays',
+]
+
+STRING_COLUMNS = ['id', 'name', 'edition', 'game_family', 'base_game']
+
+# Multi-valued fields: (name, SQL yielding (game_id, value) in list
+# order, dictionary-encoded?)
+MULTI_COLUMNS = [
+    ('categories', "SELECT game_id, category FROM game_categories ORDER BY game_id, position", True),
+    ('evokes', "SELECT game_id, evoke FROM game_evokes ORDER BY game_id, position", True),
+    ('designers', "SELECT game_id, name FROM game_designers ORDER BY game_id, position", True),
+    ('publishers', "SELECT game_id, name FROM game_publishers ORDER BY game_id, position", True),
+    ('artists', "SELECT game_id, name FROM game_artists ORDER BY game_id, position", True),
+    ('possible_counts', "SELECT game_id, players FROM game_possible_counts "
+                        "WHERE players IS NOT NULL ORDER BY game_id, rowid", False),
+    ('true_counts', "SELECT game_id, players FROM game_true_counts "
+                    "WHERE players IS NOT NULL ORDER BY game_id, rowid", False),
+]
+
+RATING_COLUMNS = ['length', 'rules_complexity', 'strategic_depth', 'feel', 'value']
+
+
+def _int_value(value):
+    """Return value as an int32, or None if it isn't a whole number in range."""
+    if isinstance(value, float):
+        if not value.is_integer():
+            return None
+        value = int(value)
+    elif isinstance(value, str):
+        try:
+            value = int(value.strip())
+        except ValueError:
+            return None
+    elif not isinstance(value, int):
+        return None
+    return value if NULL_INT < value <= INT32_MAX else None
+
+
+def _int_array(values, name):
+    """Pack values as int32, storing NULL_INT for NULLs.
+
+    SQLite columns take any type, so a stray text or fractional value
+    is stored as NULL_INT too, with a warning, instead of failing the
+    export.
+    """
+    result = array.array('i')
+    bad = []
+    for value in values:
+        if value is None:
+            result.append(NULL_INT)
+            continue
+        number = _int_value(value)
+        if number is None:
+            bad.append(value)
+            number = NULL_INT
+        result.append(number)
+    if bad:
+        print(f"Warning: {name}: {len(bad)} non-integer values stored as NULL "
+              f"(e.g. {bad[0]!r})", file=sys.stderr)
+    return result
+
+
+def _encode(values):
+    """Dictionary-encode strings; return (int32 codes, dictionary list)."""
+    index = {}
+    codes = array.array('i')
+    for value in values:
+        if value is None:
+            codes.append(-1)
+        else:
+            codes.append(index.setdefault(str(value), len(index)))
+    return codes, list(index)
+
+
+def write_snapshot(db_path=DB_PATH, path=SNAPSHOT_PATH):
+    """Export games.db to a columnar snapshot file, replacing it atomically."""
+    conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+    try:
+        columns = NUMERIC_COLUMNS + STRING_COLUMNS
+        rows = conn.execute(f"SELECT {', '.join(columns)} FROM games ORDER BY id").fetchall()
+        position = {row[len(NUMERIC_COLUMNS)]: i for i, row in enumerate(rows)}
+        generation = conn.execute("SELECT generation FROM build_generation").fetchone()
+
+        arrays = []  # (name, array.array)
+        meta = {'rows': len(rows), 'generation': generation[0] if generation else None,
+                'columns': {}}
+        for i, col in enumerate(columns):
+            values = [row[i] for row in rows]
+            if col in NUMERIC_COLUMNS:
+                arrays.append((col, _int_array(values, col)))
+                meta['columns'][col] = {'kind': 'numeric', 'null': NULL_INT}
+            else:
+                codes, dictionary = _encode(values)
+                arrays.append((col, codes))
+                meta['columns'][col] = {'kind': 'string', 'dictionary': dictionary}
+
+        for name, sql, encoded in MULTI_COLUMNS:
+            counts = [0] * len(rows)
+            values = []
+            for game_id, value in conn.execute(sql):
+                counts[position[game_id]] += 1
+                values.append(value)
+            offsets = array.array('i', [0])
+            for n in counts:
+                offsets.append(offsets[-1] + n)
+            arrays.append((f"{name}.offsets", offsets))
+            if encoded:
+                codes, dictionary = _encode(values)
+                arrays.append((f"{name}.values", codes))
+                meta['columns'][name] = {'kind': 'multi', 'dictionary': dictionary}
+            else:
+                arrays.append((f"{name}.values", _int_array(values, name)))
+                meta['columns'][name] = {'kind': 'multi'}
+    finally:
+        conn.close()
+
+    # Lay the arrays out after the header, each 8-byte aligned
+    layout = {}
+    offset = 0
+    for name, arr in arrays:
+        layout[name] = {'offset': offset, 'length': len(arr), 'type': arr.typecode}
+        offset += -(-len(arr) * arr.itemsize // ALIGN) * ALIGN
+    meta['arrays'] = layout
+    header = json.dumps(meta, ensure_ascii=False).encode()
+    data_start = -(-(HEADER.size + len(header)) // ALIGN) * ALIGN
+
+    tmp = f"{path}.tmp-{os.getpid()}"
+    try:
+        with open(tmp, 'wb') as f:
+            f.write(HEADER.pack(MAGIC, len(header)))
+            f.write(header)
+            f.write(b"\0" * (data_start - HEADER.size - len(header)))
+            for name, arr in arrays:
+                f.write(arr.tobytes())
+                f.write(b"\0" * (-len(arr) * arr.itemsize % ALIGN))
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+
+
+class Snapshot:
+    """Read-only, zero-copy view of a columnar snapshot."""
+
+    def __init__(self, path=SNAPSHOT_PATH):
+        with open(path, 'rb') as f:
+            self.mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, header_len = HEADER.unpack_from(self.mm, 0)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a games.columns snapshot")
+        self.meta = json.loads(self.mm[HEADER.size:HEADER.size + header_len])
+        self.data_start = -(-(HEADER.size + header_len) // ALIGN) * ALIGN
+        self.rows = self.meta['rows']
+        self.generation = self.meta['generation']
+
+    def _array(self, name):
+        info = self.meta['arrays'][name]
+        start = self.data_start + info['offset']
+        if NUMPY_AVAILABLE:
+            return np.frombuffer(self.mm, dtype=np.int32, count=info['length'], offset=start)
+        view = memoryview(self.mm)[start:start + info['length'] * 4]
+        return view.cast(info['type'])
+
+    def column(self, name):
+        """Return a numeric column, or the codes of a string column."""
+        return self._array(name)
+
+    def dictionary(self, name):
+        """Return the dictionary of a string or multi-valued column."""
+        return self.meta['columns'][name].get('dictionary')
+
+    def strings(self, name):
+        """Decode a string column to a list (this one copies)."""
+        dictionary = self.dictionary(name)
+        return [dictionary[c] if c >= 0 else None for c in self.column(name)]
+
+    def multi(self, name):
+        """Return (offsets, values, dictionary or None) for a multi-valued field."""
+        return (self._array(f"{name}.offsets"), self._array(f"{name}.values"),
+                self.dictionary(name))
+
+    def close(self):
+        self.mm.close()
+
+
+def rating_distributions(snap):
+    """Return {rating: counts of 0..4} over all games."""
+    return {col: np.bincount(snap.column(col)[snap.column(col) >= 0], minlength=5)[:5]
+            for col in RATING_COLUMNS}
+
+
+def games_per_year(snap):
+    """Return (years, counts) for games with a year."""
+    years = snap.column('year')
+    return np.unique(years[years != NULL_INT], return_counts=True)
+
+
+def cooccurrence(snap, name='categories'):
+    """Return (dictionary, matrix) where matrix[i, j] counts games with both."""
+    offsets, codes, dictionary = snap.multi(name)
+    rows = np.repeat(np.arange(snap.rows), np.diff(offsets))
+    incidence = np.zeros((snap.rows, len(dictionary)), dtype=np.float32)
+    incidence[rows, codes] = 1.0
+    return dictionary, (incidence.T @ incidence).astype(np.int64)
+
+
+def main():
+    if not NUMPY_AVAILABLE:
+        print("The summary report needs numpy (pip install numpy)", file=sys.stderr)
+        sys.exit(1)
+    start = time.perf_counter()
+    snap = Snapshot()
+    opened = time.perf_counter()
+    ratings = rating_distributions(snap)
+    years, counts = games_per_year(snap)
+    dictionary, matrix = cooccurrence(snap)
+    done = time.perf_counter()
+
+    print(f"{snap.rows} games, generation {snap.generation} "
+          f"(open {(opened - start) * 1000:.1f}ms, stats {(done - opened) * 1000:.1f}ms)")
+    print("\nRatings (0-4):")
+    for col, dist in ratings.items():
+        print(f"  {col:<18} {' '.join(f'{n:>5}' for n in dist)}")
+    print("\nGames per decade:")
+    decades = {}
+    for year, n in zip(years.tolist(), counts.tolist()):
+        decades[year // 10 * 10] = decades.get(year // 10 * 10, 0) + n
+    for decade in sorted(decades)[-8:]:
+        print(f"  {decade}s  {decades[decade]:>5}")
+    print("\nMost common category pairs:")
+    pairs = np.triu(matrix, k=1)
+    for flat in np.argsort(pairs, axis=None)[::-1][:10]:
+        i, j = divmod(int(flat), len(dictionary))
+        print(f"  {pairs[i, j]:>5}  {dictionary[i]} + {dictionary[j]}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""Paths and schema constants shared by games.db writers and readers.
+
+build_db.py creates games.db from these definitions; game_data.py,
+query_games.py, facet_engine.py and the other readers import them from
+here rather than from build_db, so reading the database doesn't pull in
+the build stack (numpy, the similarity and graph builders). Keep this
+module standard-library only.
+
+Can also be imported as a module:
+    from scripts.db_schema import DB_PATH, SCHEMA_VERSION, read_generation
+"""
+
+import os
+import sqlite3
+
+GAMES_DIR = os.path.join(os.path.dirname(__file__), '..', 'games')
+DB_PATH = os.path.join(os.path.dirname(__file__), '..', 'games.db')
+SCHEMA_YAML = os.path.join(os.path.dirname(__file__), '..', 'schema.yaml')
+
+# Bump whenever build_db.SCHEMA_SQL changes; incremental builds and
+# readers require a match
+SCHEMA_VERSION = 13
+
+# Dictionary-encoded fields: (yaml_key, lookup_table, junction_table)
+VOCAB_FIELDS = [
+    ('designer', 'designers', 'game_designer_ids'),
+    ('publisher', 'publishers', 'game_publisher_ids'),
+    ('artist', 'artists', 'game_artist_ids'),
+    ('categories', 'categories', 'game_category_ids'),
+    ('evokes', 'evokes', 'game_evoke_ids'),
+]
+
+# Vocabulary facets materialized into facet_values: (facet,
+# lookup_table, junction_table)
+VOCAB_FACETS = [
+    ('category', 'categories', 'game_category_ids'),
+    ('evoke', 'evokes', 'game_evoke_ids'),
+    ('designer', 'designers', 'game_designer_ids'),
+    ('publisher', 'publishers', 'game_publisher_ids'),
+]
+
+# Plain array fields: (yaml_key, table_name, column_name)
+ARRAY_FIELDS = [
+    ('alternate_names', 'game_alternate_names', 'name'),
+    ('expansions', 'game_expansions', 'expansion_id'),
+    ('compatible_with', 'game_compatible_with', 'compatible_id'),
+]
+
+# Player count fields: (yaml_key, table_name, games min column, games
+# max column)
+PLAYER_COUNT_FIELDS = [
+    ('possible_counts', 'game_possible_counts', 'min_players', 'max_players'),
+    ('true_counts', 'game_true_counts', 'best_min_players', 'best_max_players'),
+]
+
+GAME_COLUMNS = [
+    'id', 'name', 'sort_name', 'year', 'edition', 'game_family', 'base_game',
+    'playtime_minutes', 'min_playtime', 'max_playtime', 'min_age',
+    'min_players', 'max_players', 'best_min_players', 'best_max_players',
+    'length', 'rules_complexity', 'strategic_depth', 'feel', 'value',
+    'affinity', 'hotness', 'description', 'total_plays',
+]
+
+
+def read_generation(db_path=DB_PATH):
+    """Return the build generation of a games.db, or None if unavailable.
+
+    Opens a fresh connection each time, so it sees a file swapped in by
+    a full build even if the caller holds a connection to the old one.
+    """
+    if not os.path.exists(db_path):
+        return None
+    try:
+        conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+        try:
+            row = conn.execute("SELECT generation FROM build_generation").fetchone()
+        finally:
+            conn.close()
+    except sqlite3.Error:
+        return None
+    return row[0] if row else None
@@ -0,0 +1,346 @@
+#!/usr/bin/env python3
+"""TF-IDF index over game descriptions, for text-based "similar games".
+
+build_db.py calls refresh_description_index() to store a sparse
+term-by-game matrix in games.db: the vocabulary (with document
+frequency and idf) in description_terms, each description's distinct
+terms in description_docs, and one row per non-zero weight in
+description_vectors. Vectors use sublinear tf times smoothed
+idf and are L2-normalized, so a dot product is a cosine similarity.
+Rows are keyed by (term_id, game_id), making the table an inverted
+index: scoring a query is a sparse matrix-vector product computed as
+one join over the query's terms.
+
+Also finds near-duplicate descriptions, which usually mean the same
+game was added twice under different slugs.
+
+Usage:
+    python3 scripts/description_index.py --game azul
+    python3 scripts/description_index.py --text "tile laying in a cozy forest"
+    python3 scripts/description_index.py --duplicates --threshold 0.8
+
+Can also be imported as a module:
+    from scripts.description_index import similar_to_game, similar_to_text
+    for game_id, score in similar_to_game("azul"):
+        ...
+"""
+
+import argparse
+import json
+import math
+import re
+import sqlite3
+import sys
+import unicodedata
+from collections import Counter
+from pathlib import Path
+
+# Allow running as a script: ensure project root is on sys.path
+_root = str(Path(__file__).resolve().parent.parent)
+if _root not in sys.path:
+    sys.path.insert(0, _root)
+
+from scripts.db_schema import DB_PATH
+
+WORD_RE = re.compile(r"[a-z]{3,}")
+
+STOP_WORDS = frozenset("""
+    about after again also among and any are around back based because been
+    before being between both but can each even every first for from game
+    games has have her his how into its just more most much must new not now
+    off once one only other our out over own player players same she some
+    such than that the their them then there these they this those through
+    turn turns two under until use used uses using very was way what when
+    where which while who will with within without you your
+""".split())
+
+# Terms in more than this share of descriptions carry no signal
+MAX_DF_RATIO = 0.5
+
+# Highest-weighted terms kept per description
+MAX_TERMS_PER_GAME = 100
+
+SIMILAR_SQL = """
+    SELECT d.game_id, SUM(d.weight * q.weight) AS score
+    FROM description_vectors q
+    JOIN description_vectors d ON d.term_id = q.term_id
+    WHERE q.game_id = ? AND d.game_id != q.game_id
+    GROUP BY d.game_id
+    ORDER BY score DESC
+    LIMIT ?
+"""
+
+# The query vector is passed as a JSON object {term: weight}
+TEXT_SQL = """
+    WITH q(term_id, weight) AS (
+        SELECT t.id, j.value * t.idf
+        FROM json_each(?) j JOIN description_terms t ON t.term = j.key
+    )
+    SELECT d.game_id, SUM(d.weight * q.weight) AS score
+    FROM q JOIN description_vectors d ON d.term_id = q.term_id
+    GROUP BY d.game_id
+    ORDER BY score DESC
+    LIMIT ?
+"""
+
+
+def tokenize(text):
+    """Return the indexable words of text, diacritics folded."""
+    folded = unicodedata.normalize('NFKD', text or '').encode('ascii', 'ignore').decode()
+    return [w for w in WORD_RE.findall(folded.lower()) if w not in STOP_WORDS]
+
+
+def term_weights(words):
+    """Return {term: sublinear tf} for a list of words."""
+    return {term: 1.0 + math.log(n) for term, n in Counter(words).items()}
+
+
+def _normalize(vector):
+    norm = math.sqrt(sum(w * w for w in vector.values()))
+    return {t: w / norm for t, w in vector.items()} if norm else {}
+
+
+def _vector_rows(game_id, tf, term_ids, idf):
+    """Return (term_id, game_id, weight) rows for one description."""
+    vector = {term: w * idf[term] for term, w in tf.items() if term in term_ids}
+    top = sorted(vector.items(), key=lambda x: -x[1])[:MAX_TERMS_PER_GAME]
+    return [(term_ids[term], game_id, weight) for term, weight in _normalize(dict(top)).items()]
+
+
+def _vocabulary_idf(n_docs, df):
+    """Return {term: idf} for the terms of df that stay in the vocabulary."""
+    max_df = max(1, int(n_docs * MAX_DF_RATIO))
+    return {term: math.log((1 + n_docs) / (1 + n)) + 1.0
+            for term, n in df.items() if 0 < n <= max_df}
+
+
+def refresh_description_index(cursor, game_ids=None):
+    """Bring description_terms and description_vectors up to date.
+
+    None rebuilds the vocabulary and every vector. Otherwise the term
+    sets kept in description_docs give the new document frequencies
+    without re-reading unchanged descriptions: terms whose df changed
+    get a new idf (or enter or leave the vocabulary), and only the
+    given games and the descriptions containing such a term are
+    re-vectorized. Adding or removing a description changes every idf,
+    so that falls back to a full rebuild.
+    """
+    if game_ids is not None and _refresh_incremental(cursor, sorted(game_ids)):
+        return
+
+    cursor.execute("DELETE FROM description_vectors")
+    cursor.execute("DELETE FROM description_terms")
+    cursor.execute("DELETE FROM description_docs")
+
+    docs = [(game_id, term_weights(tokenize(text)))
+            for game_id, text in cursor.execute(
+                "SELECT id, description FROM games WHERE description IS NOT NULL")]
+    df = Counter(term for _, tf in docs for term in tf)
+    idf = _vocabulary_idf(len(docs), df)
+    vocab = sorted(idf)
+    term_ids = {term: i for i, term in enumerate(vocab, 1)}
+
+    cursor.executemany(
+        "INSERT INTO description_terms (id, term, df, idf) VALUES (?, ?, ?, ?)",
+        ((term_ids[term], term, df[term], idf[term]) for term in vocab))
+    cursor.executemany(
+        "INSERT INTO description_docs (game_id, terms) VALUES (?, ?)",
+        ((game_id, ' '.join(sorted(tf))) for game_id, tf in docs))
+
+    rows = []
+    for game_id, tf in docs:
+        rows += _vector_rows(game_id, tf, term_ids, idf)
+    rows.sort()  # primary key order: appends instead of B-tree splits
+    cursor.executemany(
+        "INSERT INTO description_vectors (term_id, game_id, weight) VALUES (?, ?, ?)", rows)
+
+
+def _refresh_incremental(cursor, ids):
+    """Apply changed descriptions in place; False if a full rebuild is needed."""
+    old_terms = {}
+    for game_id in ids:
+        row = cursor.execute("SELECT terms FROM description_docs WHERE game_id = ?",
+                             (game_id,)).fetchone()
+        if row:
+            old_terms[game_id] = row[0].split()
+    new_tf = {}
+    for game_id in ids:
+        row = cursor.execute("SELECT description FROM games WHERE id = ?", (game_id,)).fetchone()
+        if row and row[0] is not None:
+            new_tf[game_id] = term_weights(tokenize(row[0]))
+    if old_terms.keys() != new_tf.keys() or not cursor.execute(
+            "SELECT 1 FROM description_docs LIMIT 1").fetchone():
+        return False
+
+    delta = Counter()
+    for game_id, terms in old_terms.items():
+        delta.subtract(terms)
+        delta.update(new_tf[game_id].keys())
+    changed = {term for term, n in delta.items() if n}
+    cursor.executemany("UPDATE description_docs SET terms = ? WHERE game_id = ?",
+                       [(' '.join(sorted(tf)), game_id) for game_id, tf in new_tf.items()])
+
+    # New df of the changed terms, and every description containing one
+    df = Counter()
+    stale = set(new_tf)
+    n_docs = 0
+    for game_id, terms in cursor.execute("SELECT game_id, terms FROM description_docs"):
+        n_docs += 1
+        hits = changed.intersection(terms.split()) if changed else ()
+        if hits:
+            df.update(hits)
+            stale.add(game_id)
+    idf = _vocabulary_idf(n_docs, df)
+
+    term_ids, term_idf = {}, {}
+    for term_id, term, old_idf in cursor.execute("SELECT id, term, idf FROM description_terms"):
+        term_ids[term] = term_id
+        term_idf[term] = old_idf
+    next_id = max(term_ids.values(), default=0) + 1
+    for term in sorted(changed):
+        if term in idf and term in term_ids:
+            cursor.execute("UPDATE description_terms SET df = ?, idf = ? WHERE id = ?",
+                           (df[term], idf[term], term_ids[term]))
+        elif term in idf:
+            term_ids[term] = next_id
+            cursor.execute("INSERT INTO description_terms (id, term, df, idf) VALUES (?, ?, ?, ?)",
+                           (next_id, term, df[term], idf[term]))
+            next_id += 1
+        elif term in term_ids:
+            cursor.execute("DELETE FROM description_terms WHERE id = ?", (term_ids.pop(term),))
+            del term_idf[term]
+    term_idf.update(idf)
+
+    stale = sorted(stale)
+    cursor.executemany("DELETE FROM description_vectors WHERE game_id = ?",
+                       [(game_id,) for game_id in stale])
+    rows = []
+    for game_id in stale:
+        tf = new_tf.get(game_id)
+        if tf is None:
+            text = cursor.execute("SELECT description FROM games WHERE id = ?",
+                                  (game_id,)).fetchone()[0]
+            tf = term_weights(tokenize(text))
+        rows += _vector_rows(game_id, tf, term_ids, term_idf)
+    cursor.executemany(
+        "INSERT INTO description_vectors (term_id, game_id, weight) VALUES (?, ?, ?)", rows)
+    return True
+
+
+def _connect(conn):
+    return conn or sqlite3.connect(f"file:{DB_PATH}?mode=ro", uri=True)
+
+
+def similar_to_game(game_id, limit=10, conn=None):
+    """Return [(game id, cosine), ...] for descriptions nearest a game's."""
+    db = _connect(conn)
+    try:
+        return db.execute(SIMILAR_SQL, (game_id, limit)).fetchall()
+    finally:
+        if conn is None:
+            db.close()
+
+
+def similar_to_text(text, limit=10, conn=None):
+    """Return [(game id, score), ...] for descriptions nearest free text.
+
+    Scores rank results but are not normalized cosines.
+    """
+    query = term_weights(tokenize(text))
+    if not query:
+        return []
+    db = _connect(conn)
+    try:
+        return db.execute(TEXT_SQL, (json.dumps(query), limit)).fetchall()
+    finally:
+        if conn is None:
+            db.close()
+
+
+def near_duplicates(threshold=0.8, conn=None):
+    """Return [(game id, game id, cosine), ...] for pairs above threshold.
+
+    Uses prefix filtering to stay exact without scoring every pair: a
+    vector's prefix is its heaviest terms up to the point where the
+    remaining weights have norm below the threshold, so any pair that
+    reaches the threshold must share a term from each one's prefix.
+    Only such pairs are scored.
+    """
+    db = _connect(conn)
+    try:
+        vectors = {}
+        postings = {}
+        for term_id, game_id, weight in db.execute(
+                "SELECT term_id, game_id, weight FROM description_vectors"):
+            vectors.setdefault(game_id, {})[term_id] = weight
+            postings.setdefault(term_id, []).append(game_id)
+    finally:
+        if conn is None:
+            db.close()
+
+    limit = threshold * threshold
+    prefixes = {}
+    prefix_postings = {}
+    for game_id, vector in vectors.items():
+        prefix = []
+        rest = 1.0  # squared norm of the terms not yet taken
+        for term_id, weight in sorted(vector.items(), key=lambda x: -x[1]):
+            if rest < limit:
+                break
+            prefix.append(term_id)
+            prefix_postings.setdefault(term_id, []).append(game_id)
+            rest -= weight * weight
+        prefixes[game_id] = prefix
+
+    # A qualifying pair shares a term from each side's prefix, so b must
+    # turn up both via a's prefix terms and via its own prefix terms
+    pairs = []
+    for a, vector in vectors.items():
+        via_a = set()
+        for term_id in prefixes[a]:
+            via_a.update(postings[term_id])
+        via_b = set()
+        for term_id in vector:
+            via_b.update(prefix_postings.get(term_id, ()))
+        for b in via_a & via_b:
+            if b <= a:
+                continue  # found from both sides; score it once
+            other = vectors[b]
+            score = sum(w * other.get(t, 0.0) for t, w in vector.items())
+            if score >= threshold:
+                pairs.append((a, b, score))
+    return sorted(pairs, key=lambda x: -x[2])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Description similarity over games.db")
+    group = parser.add_mutually_exclusive_group(required=True)
+    group.add_argument("--game", help="Game id to find similar descriptions for")
+    group.add_argument("--text", help="Free text to match against descriptions")
+    group.add_argument("--duplicates", action="store_true", help="List near-duplicate descriptions")
+    parser.add_argument("--threshold", type=float, default=0.8,
+                        help="Minimum cosine for --duplicates (default: 0.8)")
+    parser.add_argument("--limit", type=int, default=10, help="Max results (default: 10)")
+    args = parser.parse_args()
+
+    conn = sqlite3.connect(f"file:{DB_PATH}?mode=ro", uri=True)
+    names = dict(conn.execute("SELECT id, name FROM games"))
+    if args.duplicates:
+        pairs = near_duplicates(args.threshold, conn)
+        print(f"{len(pairs)} pair(s) with cosine >= {args.threshold}")
+        for a, b, score in pairs:
+            print(f"  {score:.3f}  {names.get(a, '?')} [{a}]  ~  {names.get(b, '?')} [{b}]")
+    else:
+        if args.game:
+            results = similar_to_game(args.game, args.limit, conn)
+        else:
+            results = similar_to_text(args.text, args.limit, conn)
+        if not results:
+            print("No matches")
+        for game_id, score in results:
+            print(f"  {score:.3f}  {names.get(game_id, '?')}  [{game_id}]")
+    conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,345 @@
+#!/usr/bin/env python3
+"""In-memory bitmap engine for faceted game filtering.
+
+Loads games.db into one Python int per facet value, used as a bitset
+with a bit per game, so a filter over any mix of facets is a handful
+of bitwise ops instead of stacked IN (SELECT ...) subqueries. Numeric
+columns are kept as sorted distinct values with cumulative bitsets,
+making a range two bisects and one XOR. The engine reloads itself when
+build_db.py bumps the database generation.
+
+Bits are assigned in name order, so matches come out sorted by name.
+
+Usage:
+    python3 scripts/facet_engine.py category="Deck Building" evoke=Cozy
+    python3 scripts/facet_engine.py "true_count=2|3" length=1..2 --counts evoke
+    python3 scripts/facet_engine.py category=Cooperative --counts category --limit 10
+
+Can also be imported as a module:
+    from scripts.facet_engine import FacetEngine, AnyOf, Range
+    engine = FacetEngine()
+    bits = engine.match({'category': ['Cooperative'], 'true_count': AnyOf(2, 3),
+                         'length': Range(0, 2)})
+    ids = engine.ids(bits)
+    counts = engine.facet_counts({'category': ['Cooperative']}, ['evoke'])
+"""
+
+import argparse
+import bisect
+import sqlite3
+import sys
+import time
+from pathlib import Path
+
+# Allow running as a script: ensure project root is on sys.path
+_root = str(Path(__file__).resolve().parent.parent)
+if _root not in sys.path:
+    sys.path.insert(0, _root)
+
+from scripts.db_schema import (DB_PATH, PLAYER_COUNT_FIELDS, VOCAB_FACETS,
+                               read_generation)
+
+# Numeric games columns that can be filtered by range
+RANGE_FACETS = [
+    'length', 'rules_complexity', 'strategic_depth', 'feel', 'value',
+    'year', 'playtime_minutes', 'min_age',
+]
+
+# Player count facets: possible_count (supports N), true_count (best at N)
+COUNT_FACETS = {
+    'possible_count': PLAYER_COUNT_FIELDS[0][1],
+    'true_count': PLAYER_COUNT_FIELDS[1][1],
+}
+
+# Seconds between generation checks
+RELOAD_CHECK_SECONDS = 1.0
+
+
+class AllOf(tuple):
+    """Match games having every one of the values."""
+
+    def __new__(cls, *values):
+        return super().__new__(cls, values)
+
+
+class AnyOf(tuple):
+    """Match games having at least one of the values."""
+
+    def __new__(cls, *values):
+        return super().__new__(cls, values)
+
+
+class NoneOf(tuple):
+    """Match games having none of the values."""
+
+    def __new__(cls, *values):
+        return super().__new__(cls, values)
+
+
+class Range(tuple):
+    """Match games whose value lies in [low, high]; None leaves a side open."""
+
+    def __new__(cls, low=None, high=None):
+        return super().__new__(cls, (low, high))
+
+
+def bitset(positions):
+    """Return an int with the given bit positions set."""
+    positions = list(positions)
+    if not positions:
+        return 0
+    buf = bytearray(max(positions) // 8 + 1)
+    for pos in positions:
+        buf[pos >> 3] |= 1 << (pos & 7)
+    return int.from_bytes(buf, 'little')
+
+
+def iter_bits(bits):
+    """Yield the positions of set bits, lowest first."""
+    text = bin(bits)[:1:-1]  # least significant bit first, without "0b"
+    pos = text.find('1')
+    while pos >= 0:
+        yield pos
+        pos = text.find('1', pos + 1)
+
+
+class FacetEngine:
+    """Bitset index over games.db for AND/OR facet filters and counts."""
+
+    def __init__(self, db_path=DB_PATH):
+        self.db_path = db_path
+        self.generation = None
+        self.checked_at = 0.0
+        self.load()
+
+    def load(self):
+        """(Re)read every facet from the database."""
+        generation = read_generation(self.db_path)
+        conn = sqlite3.connect(f"file:{self.db_path}?mode=ro", uri=True)
+        try:
+            self.game_ids = [game_id for (game_id,) in conn.execute(
+                "SELECT id FROM games ORDER BY sort_name, id")]
+            position = {game_id: i for i, game_id in enumerate(self.game_ids)}
+            self.all = (1 << len(self.game_ids)) - 1
+
+            self.values = {}
+            for facet, lookup, junction in VOCAB_FACETS:
+                members = {}
+                for term, game_id in conn.execute(
+                        f"SELECT t.name, j.game_id FROM {junction} j "
+                        f"JOIN {lookup} t ON t.id = j.term_id"):
+                    members.setdefault(term, []).append(position[game_id])
+                self.values[facet] = {term: bitset(pos) for term, pos in members.items()}
+
+            # "6+" matches every N from 6 up, however large, so
+            # open-ended counts are kept apart as cumulative bitsets over
+            # their minimums and ORed in by _value_bits
+            self.open_ended = {}
+            for facet, table in COUNT_FACETS.items():
+                exact, open_from = {}, {}
+                for game_id, players, open_ended in conn.execute(
+                        f"SELECT game_id, players, open_ended FROM {table} "
+                        "WHERE players IS NOT NULL"):
+                    (open_from if open_ended else exact).setdefault(players, []).append(
+                        position[game_id])
+                keys = sorted(open_from)
+                cumulative = [0]
+                for key in keys:
+                    cumulative.append(cumulative[-1] | bitset(open_from[key]))
+                self.open_ended[facet] = (keys, cumulative)
+                self.values[facet] = {n: bitset(exact.get(n, ()))
+                                      for n in sorted(exact.keys() | open_from.keys())}
+
+            self.ranges = {}
+            for col in RANGE_FACETS:
+                members = {}
+                for game_id, value in conn.execute(
+                        f"SELECT id, {col} FROM games WHERE {col} IS NOT NULL"):
+                    members.setdefault(value, []).append(position[game_id])
+                # cumulative[i] holds every game whose value is below keys[i]
+                keys = sorted(members)
+                cumulative = [0]
+                for key in keys:
+                    cumulative.append(cumulative[-1] | bitset(members[key]))
+                self.ranges[col] = (keys, cumulative)
+        finally:
+            conn.close()
+        self.generation = generation
+        self.checked_at = time.monotonic()
+
+    def refresh(self):
+        """Reload if the database generation changed; return True if it did."""
+        now = time.monotonic()
+        if now - self.checked_at < RELOAD_CHECK_SECONDS:
+            return False
+        self.checked_at = now
+        generation = read_generation(self.db_path)
+        if generation is None or generation == self.generation:
+            return False
+        self.load()
+        return True
+
+    def _value_bits(self, facet, value):
+        bits = self.values[facet].get(value, 0)
+        if facet in self.open_ended:
+            keys, cumulative = self.open_ended[facet]
+            bits |= cumulative[bisect.bisect_right(keys, value)]
+        return bits
+
+    def _range_bits(self, facet, low, high):
+        keys, cumulative = self.ranges[facet]
+        start = 0 if low is None else bisect.bisect_left(keys, low)
+        end = len(keys) if high is None else bisect.bisect_right(keys, high)
+        if end <= start:
+            return 0
+        return cumulative[end] ^ cumulative[start]
+
+    def facet_bits(self, facet, spec):
+        """Return the bitset for one facet's filter.
+
+        spec is a Range for numeric facets; otherwise AllOf, AnyOf,
+        NoneOf or a plain list/value (treated as AllOf).
+        """
+        if facet in self.ranges:
+            if not isinstance(spec, Range):
+                spec = Range(*spec) if isinstance(spec, (list, tuple)) else Range(spec, spec)
+            return self._range_bits(facet, *spec)
+        if facet not in self.values:
+            raise KeyError(f"Unknown facet: {facet}")
+        if not isinstance(spec, (list, tuple)):
+            spec = AllOf(spec)
+        if isinstance(spec, AnyOf):
+            bits = 0
+            for value in spec:
+                bits |= self._value_bits(facet, value)
+            return bits
+        if isinstance(spec, NoneOf):
+            bits = self.all
+            for value in spec:
+                bits &= ~self._value_bits(facet, value)
+            return bits
+        bits = self.all
+        for value in spec:
+            bits &= self._value_bits(facet, value)
+        return bits
+
+    def match(self, filters=None):
+        """Return the bitset of games passing every facet filter."""
+        self.refresh()
+        bits = self.all
+        for facet, spec in (filters or {}).items():
+            bits &= self.facet_bits(facet, spec)
+        return bits
+
+    def count(self, bits):
+        return bits.bit_count()
+
+    def ids(self, bits, limit=None, offset=0):
+        """Return game ids for a bitset, in name order."""
+        out = []
+        for i, pos in enumerate(iter_bits(bits)):
+            if i < offset:
+                continue
+            if limit is not None and len(out) >= limit:
+                break
+            out.append(self.game_ids[pos])
+        return out
+
+    def facet_counts(self, filters=None, facets=None):
+        """Return {facet: {value: result count if value were also ticked}}.
+
+        For a facet filtered with AnyOf, ticking one more value widens
+        the selection, so its counts are taken against the other facets'
+        filters OR-ed with the values already ticked; every other facet
+        narrows, so its counts are taken against the full selection.
+        """
+        self.refresh()
+        filters = filters or {}
+        facets = facets or list(self.values)
+        selection = self.match(filters)
+        counts = {}
+        for facet in facets:
+            spec = filters.get(facet)
+            if isinstance(spec, AnyOf):
+                others = {f: s for f, s in filters.items() if f != facet}
+                base = self.match(others)
+                ticked = self.facet_bits(facet, spec)
+                counts[facet] = {
+                    value: (base & (ticked | self._value_bits(facet, value))).bit_count()
+                    for value in self.values[facet]}
+            else:
+                counts[facet] = {value: (selection & self._value_bits(facet, value)).bit_count()
+                                 for value in self.values[facet]}
+        return counts
+
+
+def parse_filter_arg(engine, arg):
+    """Parse a CLI filter: facet=value, facet=a|b (any) or facet=lo..hi.
+
+    Raises ValueError for a malformed filter or an unknown facet.
+    """
+    facet, sep, text = arg.partition('=')
+    if not sep or not facet:
+        raise ValueError(f"expected facet=value, got {arg!r}")
+    if facet in engine.ranges:
+        low, _, high = text.partition('..')
+        try:
+            return facet, Range(float(low) if low else None, float(high) if high else None)
+        except ValueError:
+            raise ValueError(f"{facet}: expected a number or lo..hi, got {text!r}") from None
+    if facet not in engine.values:
+        known = ', '.join(sorted([*engine.values, *engine.ranges]))
+        raise ValueError(f"unknown facet {facet!r} (known: {known})")
+    convert = int if facet in COUNT_FACETS else str
+    try:
+        values = [convert(v) for v in text.split('|')]
+    except ValueError:
+        raise ValueError(f"{facet}: expected a player count, got {text!r}") from None
+    return facet, AnyOf(*values) if len(values) > 1 else AllOf(*values)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Faceted game filtering over games.db")
+    parser.add_argument("filters", nargs="*",
+                        help="facet=value (repeat to AND), facet=a|b (any of), facet=lo..hi (range)")
+    parser.add_argument("--counts", action="append", default=[], metavar="FACET",
+                        help="Show conditional counts for a facet")
+    parser.add_argument("--limit", type=int, default=20, help="Max games/values shown (default: 20)")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    engine = FacetEngine()
+    loaded = time.perf_counter()
+
+    unknown = [facet for facet in args.counts if facet not in engine.values]
+    if unknown:
+        parser.error(f"--counts: unknown facet {unknown[0]!r} "
+                     f"(known: {', '.join(sorted(engine.values))})")
+    filters = {}
+    for arg in args.filters:
+        try:
+            facet, spec = parse_filter_arg(engine, arg)
+        except ValueError as e:
+            parser.error(str(e))
+        old = filters.get(facet)
+        if isinstance(old, AllOf) and isinstance(spec, AllOf):
+            spec = AllOf(*old, *spec)
+        filters[facet] = spec
+
+    bits = engine.match(filters)
+    counts = engine.facet_counts(filters, args.counts) if args.counts else {}
+    queried = time.perf_counter()
+
+    print(f"{engine.count(bits)} games "
+          f"(load {loaded - start:.3f}s, query {(queried - loaded) * 1000:.1f}ms)")
+    for game_id in engine.ids(bits, args.limit):
+        print(f"  {game_id}")
+    for facet, values in counts.items():
+        print(f"\n{facet}:")
+        ranked = sorted(((n, v) for v, n in values.items() if n), key=lambda x: (-x[0], str(x[1])))
+        for n, value in ranked[:args.limit]:
+            print(f"  {n:>5}  {value}")
+
+
+if __name__ == "__main__":
+    main()
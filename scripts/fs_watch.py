@@ -0,0 +1,148 @@
+"""Directory change notification with inotify and a polling fallback.
+
+Used by build_db.py --watch. On Linux, changes are read from inotify
+through ctypes (no extra dependency); elsewhere, or if inotify cannot
+be set up, directories are re-scanned on an interval and diffed.
+
+    watcher = open_watcher(["games", "images"])
+    for changed in debounced(watcher):
+        ...  # set of changed file paths, or None meaning "rescan all"
+"""
+
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import time
+
+# inotify event masks (linux/inotify.h)
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_Q_OVERFLOW = 0x00004000
+IN_NONBLOCK = os.O_NONBLOCK
+IN_CLOEXEC = 0o2000000
+
+WATCH_MASK = (IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO
+              | IN_CREATE | IN_DELETE)
+EVENT_HEADER = struct.Struct("iIII")
+
+# Quiet period that ends a burst of changes, and the longest a burst
+# may be held back before it is applied anyway
+DEBOUNCE_SECONDS = 0.2
+MAX_DELAY_SECONDS = 0.8
+
+
+class InotifyWatcher:
+    """Report changed files in a set of directories via inotify."""
+
+    def __init__(self, dirs):
+        libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        self.fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self.dirs = {}
+        for d in dirs:
+            wd = libc.inotify_add_watch(self.fd, os.fsencode(d), WATCH_MASK)
+            if wd < 0:
+                os.close(self.fd)
+                raise OSError(ctypes.get_errno(), f"inotify_add_watch failed for {d}")
+            self.dirs[wd] = d
+
+    def wait(self, timeout):
+        """Return changed paths, None on queue overflow, or an empty set on timeout."""
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return set()
+        try:
+            data = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return set()
+        changed = set()
+        offset = 0
+        while offset < len(data):
+            wd, mask, _, length = EVENT_HEADER.unpack_from(data, offset)
+            offset += EVENT_HEADER.size
+            name = data[offset:offset + length].rstrip(b"\0")
+            offset += length
+            if mask & IN_Q_OVERFLOW:
+                return None
+            if name and wd in self.dirs:
+                changed.add(os.path.join(self.dirs[wd], os.fsdecode(name)))
+        return changed
+
+    def close(self):
+        os.close(self.fd)
+
+
+class PollingWatcher:
+    """Report changed files by re-scanning directories on an interval."""
+
+    def __init__(self, dirs, interval=0.5):
+        self.dirs = list(dirs)
+        self.interval = interval
+        self.snapshot = self._scan()
+
+    def _scan(self):
+        files = {}
+        for d in self.dirs:
+            if not os.path.isdir(d):
+                continue
+            for entry in os.scandir(d):
+                if entry.is_file():
+                    st = entry.stat()
+                    files[entry.path] = (st.st_mtime_ns, st.st_size)
+        return files
+
+    def wait(self, timeout):
+        time.sleep(min(timeout, self.interval))
+        current = self._scan()
+        changed = {path for path, sig in current.items() if self.snapshot.get(path) != sig}
+        changed |= self.snapshot.keys() - current.keys()
+        self.snapshot = current
+        return changed
+
+    def close(self):
+        pass
+
+
+def open_watcher(dirs, poll_interval=0.5):
+    """Return an inotify watcher when available, else a polling one."""
+    dirs = [d for d in dirs if os.path.isdir(d)]
+    if sys.platform.startswith("linux"):
+        try:
+            return InotifyWatcher(dirs)
+        except (OSError, AttributeError) as e:
+            print(f"[watch] inotify unavailable ({e}), polling instead", file=sys.stderr)
+    return PollingWatcher(dirs, poll_interval)
+
+
+def debounced(watcher, quiet=DEBOUNCE_SECONDS, max_delay=MAX_DELAY_SECONDS):
+    """Yield batches of changed paths, coalescing bursts of events.
+
+    A batch is released once no new change has arrived for `quiet`
+    seconds, or `max_delay` seconds after its first change, whichever
+    comes first. None (rescan everything) absorbs the rest of a batch.
+    """
+    while True:
+        changed = watcher.wait(1.0)
+        if changed is not None and not changed:
+            continue
+        first = last = time.monotonic()
+        while changed is not None:
+            now = time.monotonic()
+            remaining = min(quiet - (now - last), max_delay - (now - first))
+            if remaining <= 0:
+                break
+            more = watcher.wait(remaining)
+            if more is None:
+                changed = None
+            elif more:
+                changed |= more
+                last = time.monotonic()
+        yield changed
@@ -0,0 +1,178 @@
+"""Cached loading of the game YAML files in games/.
+
+Parsing ~4,000 YAML files takes seconds; every script that needs the
+whole catalog goes through this module instead. Parsed games are kept
+in a single pickle at .cache/games.pickle, keyed by file name. An entry
+is reused when the file's mtime and size are unchanged; otherwise the
+file is read and hashed, and it is only re-parsed if the SHA-256
+differs too (e.g. after a checkout that touched mtimes but not content).
+
+    from scripts.game_cache import load_games
+    games = load_games()                      # list of game dicts
+
+    for f in load_game_files():               # GameFile per *.yaml
+        print(f.path, f.sha256, f.data)
+"""
+
+import gc
+import glob
+import hashlib
+import multiprocessing
+import os
+import pickle
+from collections import namedtuple
+
+import yaml
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+GAMES_DIR = os.path.join(ROOT, "games")
+CACHE_PATH = os.path.join(ROOT, ".cache", "games.pickle")
+
+YAML_LOADER = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
+# Bump when the cached representation changes; older caches are ignored
+CACHE_VERSION = 1
+
+# Below this many files to parse, a process pool costs more than it saves
+PARALLEL_MIN_FILES = 64
+
+# path is the file name relative to games/; data is the parsed YAML (None
+# on a parse error, with the message in error)
+GameFile = namedtuple("GameFile", "path mtime size sha256 data error")
+
+
+def list_yaml_files(games_dir=GAMES_DIR):
+    """Return sorted paths of all YAML game files."""
+    return sorted(glob.glob(os.path.join(games_dir, '*.yaml')))
+
+
+def read_game_file(path, known_sha256=None):
+    """Read, hash and parse one file.
+
+    Parsing is skipped when the content hash equals known_sha256 (the
+    caller's cached copy is still valid); data is then None.
+    """
+    st = os.stat(path)
+    with open(path, 'rb') as f:
+        raw = f.read()
+    sha256 = hashlib.sha256(raw).hexdigest()
+    data = error = None
+    if sha256 != known_sha256:
+        try:
+            data = yaml.load(raw, Loader=YAML_LOADER)
+        except yaml.YAMLError as e:
+            error = str(e)
+    return GameFile(os.path.basename(path), st.st_mtime, st.st_size, sha256, data, error)
+
+
+def _read_game_file(args):
+    return read_game_file(*args)
+
+
+def load_cache(cache_path=CACHE_PATH):
+    """Return {file name: (mtime, size, sha256, data)} from the cache file."""
+    # The cache is ~4,000 small dicts; cyclic GC passes triggered while
+    # unpickling them would more than double the load time
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        with open(cache_path, 'rb') as f:
+            version, entries = pickle.load(f)
+    except (OSError, EOFError, ValueError, TypeError, pickle.UnpicklingError):
+        return {}
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+    return entries if version == CACHE_VERSION else {}
+
+
+def save_cache(entries, cache_path=CACHE_PATH):
+    """Atomically replace the cache file. Failures only cost speed."""
+    tmp = f"{cache_path}.tmp-{os.getpid()}"
+    try:
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        with open(tmp, 'wb') as f:
+            pickle.dump((CACHE_VERSION, entries), f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, cache_path)
+    except OSError:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+
+
+def iter_game_files(paths=None, jobs=1, prune=None, cache_path=CACHE_PATH):
+    """Yield a GameFile for each path (default: all of games/), in order.
+
+    Files whose cache entry is stale are parsed across a process pool
+    when jobs > 1 and there are enough of them to amortize worker
+    start-up. The cache is rewritten once iteration finishes if
+    anything changed. With prune (the default when loading the whole
+    directory), entries for files not among paths are dropped.
+    """
+    if prune is None:
+        prune = paths is None
+    if paths is None:
+        paths = list_yaml_files()
+    jobs = jobs or os.cpu_count() or 1
+    cache = load_cache(cache_path)
+    dirty = False
+
+    hits = {}
+    stale = []  # (path, cached sha256) to re-read, in path order
+    stale_index = set()
+    for i, path in enumerate(paths):
+        name = os.path.basename(path)
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            continue
+        cached = cache.get(name)
+        if cached and cached[0] == st.st_mtime and cached[1] == st.st_size:
+            hits[i] = GameFile(name, *cached, None)
+        else:
+            stale.append((path, cached[2] if cached else None))
+            stale_index.add(i)
+
+    pool = None
+    if jobs > 1 and len(stale) >= PARALLEL_MIN_FILES:
+        pool = multiprocessing.Pool(jobs)
+        parsed = pool.imap(_read_game_file, stale, chunksize=max(1, len(stale) // (jobs * 8)))
+    else:
+        parsed = map(_read_game_file, stale)
+
+    try:
+        for i in range(len(paths)):
+            if i in hits:
+                yield hits[i]
+                continue
+            if i not in stale_index:
+                continue  # vanished since listing
+            f = next(parsed)
+            cached = cache.get(f.path)
+            if f.data is None and f.error is None and cached and cached[2] == f.sha256:
+                # Touched but unchanged: keep the parsed copy
+                f = f._replace(data=cached[3])
+            if f.error is None:
+                cache[f.path] = (f.mtime, f.size, f.sha256, f.data)
+                dirty = True
+            yield f
+    finally:
+        if pool:
+            pool.terminate()
+
+    if prune:
+        present = {os.path.basename(p) for p in paths}
+        for name in cache.keys() - present:
+            del cache[name]
+            dirty = True
+    if dirty:
+        save_cache(cache, cache_path)
+
+
+def load_game_files(paths=None, jobs=1):
+    """Return a list of GameFile for paths (default: all of games/)."""
+    return list(iter_game_files(paths, jobs))
+
+
+def load_games(jobs=1):
+    """Return the parsed dicts of all game files, sorted by file name."""
+    return [f.data for f in iter_game_files(jobs=jobs) if isinstance(f.data, dict) and f.data]
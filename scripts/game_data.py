@@ -0,0 +1,181 @@
+"""Read-only access to the game catalog for the maintenance scripts.
+
+Reads from games.db when it is up to date, which is much faster than
+loading every YAML file; falls back to the YAML files (through the
+parse cache in game_cache.py) when the database is missing, was built
+with a different schema, or is older than the newest file in games/.
+
+Slugs here are YAML file names without ".yaml" (the yaml_id column of
+master_list.csv). They equal the game id except for files whose id
+YAML reads as a number (007.yaml has id 7).
+
+    from scripts.game_data import all_games, name_to_slug_map
+    games = all_games()
+    slug = name_to_slug_map().get("azul")
+"""
+
+import json
+import os
+import sqlite3
+import sys
+from pathlib import Path
+
+# Allow running as a script: ensure project root is on sys.path
+_root = str(Path(__file__).resolve().parent.parent)
+if _root not in sys.path:
+    sys.path.insert(0, _root)
+
+from scripts import game_cache
+from scripts.db_schema import (ARRAY_FIELDS, DB_PATH, GAME_COLUMNS, GAMES_DIR,
+                               PLAYER_COUNT_FIELDS, SCHEMA_VERSION, VOCAB_FIELDS)
+
+_conn = None
+
+
+def newest_yaml_mtime(games_dir=GAMES_DIR):
+    """Return the latest mtime of games/ and the YAML files in it."""
+    newest = os.stat(games_dir).st_mtime  # changes when a file is removed
+    with os.scandir(games_dir) as entries:
+        for entry in entries:
+            if entry.name.endswith('.yaml'):
+                newest = max(newest, entry.stat().st_mtime)
+    return newest
+
+
+def open_db():
+    """Return a read-only connection to games.db, or None if it can't be trusted.
+
+    The connection is shared by every call in this process.
+    """
+    global _conn
+    if _conn is not None:
+        return _conn
+    try:
+        if os.stat(DB_PATH).st_mtime < newest_yaml_mtime():
+            return None
+        conn = sqlite3.connect(f"file:{DB_PATH}?mode=ro", uri=True)
+    except (OSError, sqlite3.Error):
+        return None
+    if conn.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+        conn.close()
+        return None
+    _conn = conn
+    return conn
+
+
+def game_files():
+    """Return {slug: game id or None} for every YAML file in games/."""
+    conn = open_db()
+    if conn is None:
+        return {f.path[:-5]: f.data.get('id') if isinstance(f.data, dict) else None
+                for f in game_cache.load_game_files()}
+    return {path[:-5]: game_id for path, game_id in conn.execute(
+        "SELECT path, game_id FROM build_manifest ORDER BY path")}
+
+
+def _yaml_db():
+    """Return an in-memory games.db built from the YAML files.
+
+    Built by the same inserter as games.db, so it holds the same games
+    (invalid files left out, the first file in path order keeping a
+    duplicated id) with the same column types.
+    """
+    # Imported here: only the fallback needs the build stack
+    from scripts import build_db
+    conn = sqlite3.connect(":memory:")
+    conn.executescript(build_db.SCHEMA_SQL)
+    cursor = conn.cursor()
+    inserter = build_db.BulkInserter(cursor)
+    manifest = []
+    for f in game_cache.iter_game_files():
+        added = isinstance(f.data, dict) and bool(f.data) and inserter.add(f.data)
+        manifest.append((f.path, f.data['id'] if added else None, f.mtime, f.size, f.sha256))
+    inserter.flush()
+    build_db.write_manifest(cursor, manifest)
+    return conn
+
+
+def all_games(list_fields=('alternate_names', 'publisher'), game_ids=None):
+    """Return all games as dicts, in file name order.
+
+    Each dict has the games columns (None where the YAML has null) plus
+    the YAML list fields named in list_fields. When games.db can't be
+    used the YAML files are loaded into an in-memory database first, so
+    both paths give the same keys and types (ids are always strings).
+    game_ids restricts the result to those games.
+    """
+    conn = open_db()
+    if conn is not None:
+        return _read_games(conn, list_fields, game_ids)
+    conn = _yaml_db()
+    try:
+        return _read_games(conn, list_fields, game_ids)
+    finally:
+        conn.close()
+
+
+def _read_games(conn, list_fields, game_ids):
+    where, params = "", ()
+    if game_ids is not None:
+        where = "WHERE {col} IN (SELECT value FROM json_each(?))"
+        params = (json.dumps(sorted(str(game_id) for game_id in game_ids)),)
+
+    order = {}
+    for path, game_id in conn.execute("SELECT path, game_id FROM build_manifest ORDER BY path"):
+        order.setdefault(game_id, len(order))
+    games = {}
+    for row in conn.execute(f"SELECT {', '.join(GAME_COLUMNS)} FROM games "
+                            f"{where.format(col='id')}", params):
+        game = dict(zip(GAME_COLUMNS, row))
+        game.update((key, []) for key in list_fields)
+        games[game['id']] = game
+
+    tables = {key: (f"SELECT j.game_id, t.name FROM {junction} j "
+                    f"JOIN {lookup} t ON t.id = j.term_id {where.format(col='j.game_id')} "
+                    f"ORDER BY j.game_id, j.position")
+              for key, lookup, junction in VOCAB_FIELDS}
+    tables.update({key: (f"SELECT game_id, {col} FROM {table} {where.format(col='game_id')} "
+                         f"ORDER BY game_id, rowid")
+                   for key, table, col in ARRAY_FIELDS})
+    tables.update({key: (f"SELECT game_id, count FROM {table} {where.format(col='game_id')} "
+                         f"ORDER BY game_id, rowid")
+                   for key, table, _, _ in PLAYER_COUNT_FIELDS})
+    for key in list_fields:
+        for game_id, value in conn.execute(tables[key], params):
+            games[game_id][key].append(value)
+
+    return sorted(games.values(), key=lambda g: order.get(g['id'], len(order)))
+
+
+def name_to_slug_map():
+    """Return {lowercase name or alternate name: slug} for all games."""
+    name_to_slug = {}
+    conn = open_db()
+    if conn is None:
+        for f in game_cache.load_game_files():
+            data = f.data
+            if not isinstance(data, dict):
+                continue
+            names = [data.get('name')] + list(data.get('alternate_names') or [])
+            for name in names:
+                if isinstance(name, str) and name:
+                    name_to_slug[name.lower()] = f.path[:-5]
+        return name_to_slug
+
+    slugs = {}
+    for path, game_id in conn.execute("SELECT path, game_id FROM build_manifest ORDER BY path"):
+        slugs.setdefault(game_id, path[:-5])
+    for game in all_games(list_fields=('alternate_names',)):
+        for name in [game['name']] + game['alternate_names']:
+            if isinstance(name, str) and name:
+                name_to_slug[name.lower()] = slugs[game['id']]
+    return name_to_slug
+
+
+def games_by_publisher(games=None):
+    """Return {publisher: [game, ...]}, each list in file name order."""
+    by_pub = {}
+    for game in games if games is not None else all_games():
+        for pub in game.get('publisher') or []:
+            by_pub.setdefault(pub, []).append(game)
+    return by_pub
@@ -0,0 +1,317 @@
+#!/usr/bin/env python3
+"""Expansion / compatibility graph, precomputed into games.db.
+
+Games link to each other through expansions, base_game (the same
+edge seen from the expansion's side) and compatible_with. build_db.py
+calls rebuild_graph() after every build or update to store:
+
+  - game_components: the connected component of every game that has
+    links, i.e. the set of games that can be played together
+  - game_closure: one row per ordered pair of games in a component,
+    saying how they relate ('expansion' when related_id expands
+    game_id directly or through other expansions, 'base' for the
+    reverse, 'compatible' otherwise) and how many links apart they are
+  - game_families: one row per game_family with its size and years
+
+so "everything playable with Dominion" is a single primary-key range
+read on game_closure. Ids that don't name a game are left out of the
+graph and reported as dangling, along with expansion cycles (A expands
+B expands A). An incremental update recomputes only the components the
+changed games were or are now part of.
+
+Usage:
+    python3 scripts/game_graph.py catan          # related games
+    python3 scripts/game_graph.py --issues       # cycles and dangling ids
+
+Can also be imported as a module:
+    from scripts.game_graph import related
+    for game_id, relation, distance in related("catan"):
+        ...
+"""
+
+import argparse
+import json
+import sqlite3
+import sys
+from collections import deque
+from pathlib import Path
+
+# Allow running as a script: ensure project root is on sys.path
+_root = str(Path(__file__).resolve().parent.parent)
+if _root not in sys.path:
+    sys.path.insert(0, _root)
+
+from scripts.db_schema import DB_PATH
+
+# Components larger than this get only 'expansion'/'base' closure rows;
+# every pair would be quadratic in the component size
+MAX_COMPATIBLE_COMPONENT = 1000
+
+# Issues printed per kind by print_report()
+REPORT_LIMIT = 5
+
+
+def load_edges(cursor):
+    """Return (ids, expansion edges {base: {expansion}}, compatible
+    edges {game: {game}}, dangling [(game_id, field, target)])."""
+    ids = {game_id for (game_id,) in cursor.execute("SELECT id FROM games")}
+    expands = {}
+    compatible = {}
+    dangling = []
+
+    def link(game_id, field, target, base, expansion):
+        if target not in ids:
+            dangling.append((game_id, field, target))
+        elif base != expansion:
+            expands.setdefault(base, set()).add(expansion)
+
+    for game_id, target in cursor.execute("SELECT game_id, expansion_id FROM game_expansions"):
+        link(game_id, 'expansions', target, game_id, target)
+    for game_id, target in cursor.execute(
+            "SELECT id, base_game FROM games WHERE base_game IS NOT NULL AND base_game != ''"):
+        link(game_id, 'base_game', target, target, game_id)
+    for game_id, target in cursor.execute("SELECT game_id, compatible_id FROM game_compatible_with"):
+        if target not in ids:
+            dangling.append((game_id, 'compatible_with', target))
+        elif target != game_id:
+            compatible.setdefault(game_id, set()).add(target)
+            compatible.setdefault(target, set()).add(game_id)
+    return ids, expands, compatible, sorted(dangling)
+
+
+def expansion_cycles(expands):
+    """Return the cycles of the expansion graph as sorted id lists.
+
+    Tarjan's strongly connected components, iteratively; every
+    component with more than one game is a cycle.
+    """
+    index, low, on_stack, stack, cycles = {}, {}, set(), [], []
+    for start in sorted(expands):
+        if start in index:
+            continue
+        work = [(start, iter(sorted(expands.get(start, ()))))]
+        index[start] = low[start] = len(index)
+        stack.append(start)
+        on_stack.add(start)
+        while work:
+            node, children = work[-1]
+            child = next(children, None)
+            if child is not None:
+                if child not in index:
+                    index[child] = low[child] = len(index)
+                    stack.append(child)
+                    on_stack.add(child)
+                    work.append((child, iter(sorted(expands.get(child, ())))))
+                elif child in on_stack:
+                    low[node] = min(low[node], index[child])
+                continue
+            work.pop()
+            if work:
+                parent = work[-1][0]
+                low[parent] = min(low[parent], low[node])
+            if low[node] == index[node]:
+                members = []
+                while True:
+                    member = stack.pop()
+                    on_stack.discard(member)
+                    members.append(member)
+                    if member == node:
+                        break
+                if len(members) > 1:
+                    cycles.append(sorted(members))
+    return sorted(cycles)
+
+
+def _distances(start, edges):
+    """BFS hop counts from start over edges {node: {node}}."""
+    dist = {start: 0}
+    queue = deque([start])
+    while queue:
+        node = queue.popleft()
+        for nxt in edges.get(node, ()):
+            if nxt not in dist:
+                dist[nxt] = dist[node] + 1
+                queue.append(nxt)
+    return dist
+
+
+def components(expands, compatible):
+    """Return connected components (sorted id lists) of the whole graph."""
+    undirected = {}
+    for edges in (expands, compatible):
+        for a, targets in edges.items():
+            for b in targets:
+                undirected.setdefault(a, set()).add(b)
+                undirected.setdefault(b, set()).add(a)
+    seen, found = set(), []
+    for start in sorted(undirected):
+        if start not in seen:
+            members = _distances(start, undirected)
+            seen.update(members)
+            found.append(sorted(members))
+    return found, undirected
+
+
+def _closure_rows(members, expands, bases, undirected):
+    """game_closure rows for one component; 'compatible' rows only if
+    the component is small enough."""
+    pairwise = len(members) <= MAX_COMPATIBLE_COMPONENT
+    rows = []
+    for game_id in members:
+        relations = {}
+        for related_id, distance in _distances(game_id, expands).items():
+            relations[related_id] = ('expansion', distance)
+        for related_id, distance in _distances(game_id, bases).items():
+            relations.setdefault(related_id, ('base', distance))
+        if pairwise:
+            for related_id, distance in _distances(game_id, undirected).items():
+                relations.setdefault(related_id, ('compatible', distance))
+        rows += [(game_id, related_id, relation, distance)
+                 for related_id, (relation, distance) in sorted(relations.items())
+                 if related_id != game_id]
+    return rows
+
+
+def rebuild_graph(cursor, game_ids=None):
+    """Recompute game_components, game_closure and game_families.
+
+    game_ids (inserted, changed or removed games) limits the work to
+    the components those games belonged to or belong to now; None
+    rebuilds the whole graph. Edges, cycles and dangling ids are always
+    read from the whole catalog, which is cheap next to the closure.
+
+    Returns {'components', 'pairs', 'cycles', 'dangling', 'skipped'}
+    where skipped lists recomputed components too large for
+    'compatible' rows.
+    """
+    _, expands, compatible, dangling = load_edges(cursor)
+    bases = {}
+    for base, expansions in expands.items():
+        for expansion in expansions:
+            bases.setdefault(expansion, set()).add(base)
+    found, undirected = components(expands, compatible)
+
+    if game_ids is None:
+        for table in ('game_components', 'game_closure'):
+            cursor.execute(f"DELETE FROM {table}")
+        rebuild, first_number = found, 1
+    else:
+        # Everything that shared a component with a changed game before
+        # the change; together with the changed games themselves, any
+        # component now containing one of them must be recomputed
+        ids_json = json.dumps(sorted(game_ids))
+        seeds = set(game_ids)
+        seeds.update(game_id for (game_id,) in cursor.execute(
+            "SELECT game_id FROM game_components WHERE component IN "
+            "(SELECT component FROM game_components "
+            " WHERE game_id IN (SELECT value FROM json_each(?)))", (ids_json,)))
+        rebuild = [members for members in found if not seeds.isdisjoint(members)]
+        stale = [(game_id,) for game_id in seeds.union(*rebuild)]
+        cursor.executemany("DELETE FROM game_components WHERE game_id = ?", stale)
+        cursor.executemany("DELETE FROM game_closure WHERE game_id = ?", stale)
+        first_number = (cursor.execute(
+            "SELECT MAX(component) FROM game_components").fetchone()[0] or 0) + 1
+
+    component_rows, skipped, pairs = [], [], 0
+    for number, members in enumerate(rebuild, first_number):
+        component_rows += [(game_id, number, len(members)) for game_id in members]
+        if len(members) > MAX_COMPATIBLE_COMPONENT:
+            skipped.append(members[0])
+        closure_rows = _closure_rows(members, expands, bases, undirected)
+        cursor.executemany(
+            "INSERT INTO game_closure (game_id, related_id, relation, distance) "
+            "VALUES (?, ?, ?, ?)", closure_rows)
+        pairs += len(closure_rows)
+    cursor.executemany(
+        "INSERT INTO game_components (game_id, component, size) VALUES (?, ?, ?)",
+        component_rows)
+    if game_ids is not None:
+        pairs = cursor.execute("SELECT COUNT(*) FROM game_closure").fetchone()[0]
+
+    cursor.execute("DELETE FROM game_families")
+    cursor.execute("""
+        INSERT INTO game_families (family, game_count, first_year, last_year)
+        SELECT game_family, COUNT(*), MIN(year), MAX(year)
+        FROM games
+        WHERE game_family IS NOT NULL AND game_family != ''
+        GROUP BY game_family
+    """)
+    return {
+        'components': len(found),
+        'pairs': pairs,
+        'cycles': expansion_cycles(expands),
+        'dangling': dangling,
+        'skipped': skipped,
+    }
+
+
+def print_report(report, details=True):
+    """Print a one-line graph summary, with cycles and dangling ids to stderr."""
+    print(f"Graph: {report['components']} components, {report['pairs']} related pairs, "
+          f"{len(report['cycles'])} cycles, {len(report['dangling'])} dangling references")
+    if not details:
+        return
+    for members in report['cycles'][:REPORT_LIMIT]:
+        print(f"Warning: expansion cycle: {' -> '.join(members)}", file=sys.stderr)
+    for game_id, field, target in report['dangling'][:REPORT_LIMIT]:
+        print(f"Warning: {game_id}: {field} '{target}' is not a game id", file=sys.stderr)
+    hidden = (max(0, len(report['cycles']) - REPORT_LIMIT)
+              + max(0, len(report['dangling']) - REPORT_LIMIT))
+    if hidden:
+        print(f"Warning: ... {hidden} more (python3 scripts/game_graph.py --issues)",
+              file=sys.stderr)
+    for game_id in report['skipped']:
+        print(f"Warning: component of {game_id} has over {MAX_COMPATIBLE_COMPONENT} games; "
+              "only expansion links stored", file=sys.stderr)
+
+
+def related(game_id, relation=None, conn=None):
+    """Return [(related id, relation, distance), ...], nearest first."""
+    own_conn = conn is None
+    if own_conn:
+        conn = sqlite3.connect(f"file:{DB_PATH}?mode=ro", uri=True)
+    try:
+        sql = "SELECT related_id, relation, distance FROM game_closure WHERE game_id = ?"
+        params = [game_id]
+        if relation:
+            sql += " AND relation = ?"
+            params.append(relation)
+        rows = conn.execute(sql, params).fetchall()
+    finally:
+        if own_conn:
+            conn.close()
+    return sorted(rows, key=lambda row: (row[2], row[1], row[0]))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Expansion and compatibility graph over games.db")
+    parser.add_argument("game_id", nargs="?", help="Game id (YAML slug)")
+    parser.add_argument("--relation", choices=["expansion", "base", "compatible"],
+                        help="Only show this relation")
+    parser.add_argument("--issues", action="store_true", help="List cycles and dangling references")
+    args = parser.parse_args()
+    if not args.game_id and not args.issues:
+        parser.error("give a game id or --issues")
+
+    conn = sqlite3.connect(f"file:{DB_PATH}?mode=ro", uri=True)
+    if args.issues:
+        _, expands, _, dangling = load_edges(conn.cursor())
+        cycles = expansion_cycles(expands)
+        print(f"{len(cycles)} expansion cycle(s)")
+        for members in cycles:
+            print(f"  {' -> '.join(members)}")
+        print(f"{len(dangling)} dangling reference(s)")
+        for game_id, field, target in dangling:
+            print(f"  {game_id}: {field} '{target}'")
+    if args.game_id:
+        found = related(args.game_id, args.relation, conn)
+        if not found:
+            print(f"No related games for '{args.game_id}'")
+        names = dict(conn.execute("SELECT id, name FROM games"))
+        for game_id, relation, distance in found:
+            print(f"  {relation:<10} {distance}  {names.get(game_id, '?')}  [{game_id}]")
+    conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -4,9 +4,34 @@ Fetches HTML from provided URLs, classifies by source type, caches in SQLite,
 and returns clean text per source. The calling agent (Sonnet) handles all
 structured data extraction directly.
 
+URLs are fetched concurrently on a shared thread pool, at most
+PER_HOST_CONCURRENCY at a time per host and at least PER_HOST_MIN_DELAY
+seconds apart per host, within GAME_FETCH_DEADLINE seconds per game. Each
+page is cached as soon as it arrives. The cache runs in WAL mode and both
+per-host limits are recorded in it, so several pipeline processes (e.g.
+parallel research agents or research_batch.py workers) can share it
+without tripping over each other or hammering the same site.
+
+Requests go through pooled keep-alive sessions (one per fetch thread).
+Each cached page keeps its ETag, Last-Modified and fetch time: a page
+younger than SOURCE_MAX_AGE for its source type is not fetched at all,
+and an older one is revalidated with a conditional GET, where a 304
+counts as a cache hit.
+
+Page HTML lives in a content-addressed blob table (SHA-256 of the page),
+compressed with zstd when the zstandard package is installed and zlib
+otherwise, so a page shared by several games is stored once. When the
+blobs outgrow BLOB_CACHE_MAX_BYTES (PIPELINE_CACHE_MAX_MB in the
+environment) the least recently used pages are evicted. Text extracted
+from a page is cached alongside it, keyed by the page hash and the
+html_preprocessor settings, so repeat runs skip extraction entirely.
+
 CLI usage:
   python3 scripts/game_pipeline.py "Azul" --urls https://... https://...
   python3 scripts/game_pipeline.py "Azul"   # uses cached data only
+  python3 scripts/game_pipeline.py --stats  # cache hit rate, size, evictions
+
+For a queue of games in one run, see scripts/research_batch.py.
 
 Can also be imported as a module:
   from scripts.game_pipeline import process_game
@@ -14,12 +39,20 @@ Can also be imported as a module:
 """
 
 import argparse
+import hashlib
 import json
+import os
 import re
 import sqlite3
 import sys
+import threading
+import time
+import zlib
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeout, as_completed
 from datetime import date
 from pathlib import Path
+from typing import Iterator, NamedTuple
 from urllib.parse import urlparse
 
 # Allow running as a script: ensure project root is on sys.path
@@ -29,12 +62,48 @@ if _root not in sys.path:
 
 import requests
 
-from scripts.html_preprocessor import html_to_main_text, truncate_text
+try:
+    import zstandard
+    _ZSTD_AVAILABLE = True
+except ImportError:
+    _ZSTD_AVAILABLE = False
+
+from scripts.html_preprocessor import (EXTRACTOR_FINGERPRINT, MAX_CHARS, html_to_main_text,
+                                       truncate_text)
 
 # ── Constants ──────────────────────────────────────────────────────────────────
 
 MAX_URLS_PER_GAME = 3
 FETCH_TIMEOUT = 15
+
+# Concurrent fetching: requests in flight per process, per host (across
+# processes), the minimum gap between request starts to one host (across
+# processes), and the wall-clock budget for all of one game's URLs
+MAX_CONCURRENT_FETCHES = 8
+PER_HOST_CONCURRENCY = 2
+PER_HOST_MIN_DELAY = 1.0
+GAME_FETCH_DEADLINE = 30
+
+# Seconds between checks for a free per-host slot, and the shortest
+# request timeout used when a fetch starts close to the deadline
+LEASE_POLL_INTERVAL = 0.2
+MIN_FETCH_TIMEOUT = 0.5
+
+# Seconds a writer waits for another process's lock on the cache
+DB_BUSY_TIMEOUT = 30
+
+# Seconds a cached page is used without revalidation, per source type;
+# store listings change (price, stock) far more often than reviews
+DAY = 24 * 60 * 60
+SOURCE_MAX_AGE = {
+    "publisher": 30 * DAY,
+    "store": 7 * DAY,
+    "review": 90 * DAY,
+    "other": 30 * DAY,
+}
+
+# Idle keep-alive connections kept per session, one pool per host
+SESSION_POOL_HOSTS = 32
 USER_AGENT = (
     "Mozilla/5.0 (compatible; BoardGameResearcher/1.0; "
     "+https://github.com/example/boardgame-database)"
@@ -42,6 +111,12 @@ USER_AGENT = (
 
 DB_PATH = Path(__file__).parent.parent / "pipeline_cache.db"
 
+# Cached HTML is stored once per distinct page, compressed; above this
+# many compressed bytes the least recently used pages are evicted
+BLOB_CACHE_MAX_BYTES = int(os.environ.get("PIPELINE_CACHE_MAX_MB", "256")) * 1024 * 1024
+ZSTD_LEVEL = 10
+ZLIB_LEVEL = 6
+
 # ── URL classification ─────────────────────────────────────────────────────────
 
 PUBLISHER_PATTERNS = [
@@ -105,10 +180,17 @@ def classify_url(url: str) -> str:
 
 # ── SQLite cache ───────────────────────────────────────────────────────────────
 
+VALIDATOR_COLUMNS = [("etag", "TEXT"), ("last_modified", "TEXT"), ("fetched_at", "REAL")]
+
+# Counters shown by --stats
+CACHE_STATS = ["hits", "misses", "failures", "evictions", "evicted_bytes"]
+
+
 def get_db() -> sqlite3.Connection:
     """Open (and initialise if needed) the SQLite cache database."""
-    conn = sqlite3.connect(DB_PATH)
+    conn = sqlite3.connect(DB_PATH, timeout=DB_BUSY_TIMEOUT)
     conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode=WAL")
     conn.executescript("""
         CREATE TABLE IF NOT EXISTS games (
             id   INTEGER PRIMARY KEY,
@@ -118,83 +200,504 @@ def get_db() -> sqlite3.Connection:
             game_id     INTEGER NOT NULL,
             url         TEXT    NOT NULL,
             source_type TEXT    NOT NULL,
-            html        TEXT,
+            html_hash     TEXT,
+            etag          TEXT,
+            last_modified TEXT,
+            fetched_at    REAL,
             PRIMARY KEY (game_id, url),
             FOREIGN KEY (game_id) REFERENCES games(id)
         );
+        -- One row per distinct page, keyed by SHA-256 of the UTF-8 HTML
+        CREATE TABLE IF NOT EXISTS html_blobs (
+            hash        TEXT PRIMARY KEY,
+            codec       TEXT    NOT NULL,
+            data        BLOB    NOT NULL,
+            raw_size    INTEGER NOT NULL,
+            stored_size INTEGER NOT NULL,
+            last_access REAL    NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_html_blobs_last_access ON html_blobs(last_access);
+        -- Extracted text per page, for one extractor configuration
+        -- (html_preprocessor.EXTRACTOR_FINGERPRINT) and truncation limit
+        CREATE TABLE IF NOT EXISTS clean_texts (
+            html_hash TEXT    NOT NULL,
+            extractor TEXT    NOT NULL,
+            max_chars INTEGER NOT NULL,
+            text      TEXT    NOT NULL,
+            PRIMARY KEY (html_hash, extractor, max_chars)
+        );
+        CREATE TABLE IF NOT EXISTS cache_stats (
+            name  TEXT PRIMARY KEY,
+            value INTEGER NOT NULL
+        );
+        -- One row per request in flight, capped at PER_HOST_CONCURRENCY
+        -- per host across processes
+        CREATE TABLE IF NOT EXISTS fetch_leases (
+            id         INTEGER PRIMARY KEY,
+            host       TEXT NOT NULL,
+            expires_at REAL NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_fetch_leases_host ON fetch_leases(host);
+        -- Earliest time (epoch seconds) the next request to a host may start
+        CREATE TABLE IF NOT EXISTS fetch_hosts (
+            host       TEXT PRIMARY KEY,
+            next_start REAL NOT NULL
+        );
     """)
+    # Caches created before revalidation lack the validator columns, and
+    # ones created before the blob store keep HTML inline
+    columns = {row["name"] for row in conn.execute("PRAGMA table_info(game_sources)")}
+    for column, decl in VALIDATOR_COLUMNS + [("html_hash", "TEXT")]:
+        if column not in columns:
+            conn.execute(f"ALTER TABLE game_sources ADD COLUMN {column} {decl}")
+    if "html" in columns:
+        _migrate_inline_html(conn)
     conn.commit()
     return conn
 
 
+def _migrate_inline_html(conn: sqlite3.Connection) -> None:
+    """Move HTML stored inline in game_sources into html_blobs."""
+    rows = conn.execute(
+        "SELECT game_id, url, html FROM game_sources WHERE html IS NOT NULL").fetchall()
+    if not rows:
+        return
+    for row in rows:
+        conn.execute("UPDATE game_sources SET html = NULL, html_hash = ? "
+                     "WHERE game_id = ? AND url = ?",
+                     (put_blob(conn, row["html"]), row["game_id"], row["url"]))
+    conn.commit()
+    conn.execute("VACUUM")
+    print(f"[pipeline] Moved {len(rows)} cached pages into the blob store", file=sys.stderr)
+
+
+def _compress(raw: bytes) -> tuple[str, bytes]:
+    if _ZSTD_AVAILABLE:
+        return "zstd", zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(raw)
+    return "zlib", zlib.compress(raw, ZLIB_LEVEL)
+
+
+def _decompress(codec: str, data: bytes) -> bytes | None:
+    """Return the raw bytes, or None for a codec this install can't read."""
+    if codec == "zlib":
+        return zlib.decompress(data)
+    if codec == "zstd" and _ZSTD_AVAILABLE:
+        return zstandard.ZstdDecompressor().decompress(data)
+    return None
+
+
+def put_blob(conn: sqlite3.Connection, html: str) -> str:
+    """Store html once under its hash (if not already there) and return the hash.
+
+    Doesn't commit; the caller commits together with the row that
+    references the blob, so eviction never sees it unreferenced.
+    """
+    raw = html.encode("utf-8")
+    digest = hashlib.sha256(raw).hexdigest()
+    now = time.time()
+    if conn.execute("UPDATE html_blobs SET last_access = ? WHERE hash = ?",
+                    (now, digest)).rowcount == 0:
+        codec, data = _compress(raw)
+        conn.execute(
+            """INSERT OR IGNORE INTO html_blobs
+                   (hash, codec, data, raw_size, stored_size, last_access)
+               VALUES (?, ?, ?, ?, ?, ?)""",
+            (digest, codec, data, len(raw), len(data), now),
+        )
+    return digest
+
+
+def get_html(conn: sqlite3.Connection, html_hash: str) -> str | None:
+    """Return the HTML stored under html_hash, or None if it isn't cached."""
+    row = conn.execute("SELECT codec, data FROM html_blobs WHERE hash = ?",
+                       (html_hash,)).fetchone()
+    raw = _decompress(row["codec"], row["data"]) if row else None
+    return raw.decode("utf-8") if raw is not None else None
+
+
+def bump_stat(conn: sqlite3.Connection, name: str, n: int = 1) -> None:
+    """Add n to a cache_stats counter (committed with the caller's next commit)."""
+    conn.execute(
+        """INSERT INTO cache_stats (name, value) VALUES (?, ?)
+           ON CONFLICT(name) DO UPDATE SET value = value + excluded.value""",
+        (name, n),
+    )
+
+
 def get_or_create_game(conn: sqlite3.Connection, name: str) -> int:
     """Return the game row id, creating it if absent."""
-    row = conn.execute("SELECT id FROM games WHERE name = ?", (name,)).fetchone()
-    if row:
-        return row["id"]
-    cur = conn.execute("INSERT INTO games (name) VALUES (?)", (name,))
+    # INSERT OR IGNORE: another process may create the same game concurrently
+    conn.execute("INSERT OR IGNORE INTO games (name) VALUES (?)", (name,))
     conn.commit()
-    return cur.lastrowid
+    return conn.execute("SELECT id FROM games WHERE name = ?", (name,)).fetchone()["id"]
 
 
 def store_source(conn: sqlite3.Connection, game_id: int, url: str,
-                 source_type: str, html: str) -> None:
+                 source_type: str, html: str, etag: str | None = None,
+                 last_modified: str | None = None) -> None:
     conn.execute(
-        """INSERT OR REPLACE INTO game_sources (game_id, url, source_type, html)
-           VALUES (?, ?, ?, ?)""",
-        (game_id, url, source_type, html),
+        """INSERT OR REPLACE INTO game_sources
+               (game_id, url, source_type, html_hash, etag, last_modified, fetched_at)
+           VALUES (?, ?, ?, ?, ?, ?, ?)""",
+        (game_id, url, source_type, put_blob(conn, html), etag, last_modified, time.time()),
     )
     conn.commit()
 
 
-def get_sources(conn: sqlite3.Connection, game_id: int) -> list[sqlite3.Row]:
-    return conn.execute(
-        "SELECT url, source_type, html FROM game_sources WHERE game_id = ?",
+def mark_revalidated(conn: sqlite3.Connection, game_id: int, url: str) -> None:
+    """Record that a cached page was confirmed unchanged (HTTP 304)."""
+    now = time.time()
+    conn.execute("UPDATE game_sources SET fetched_at = ? WHERE game_id = ? AND url = ?",
+                 (now, game_id, url))
+    conn.execute("""UPDATE html_blobs SET last_access = ? WHERE hash =
+                        (SELECT html_hash FROM game_sources WHERE game_id = ? AND url = ?)""",
+                 (now, game_id, url))
+    conn.commit()
+
+
+def get_validators(conn: sqlite3.Connection, game_id: int) -> dict[str, sqlite3.Row]:
+    """Return {url: row with source_type, etag, last_modified, fetched_at}
+    for the game's cached pages."""
+    rows = conn.execute(
+        """SELECT url, source_type, etag, last_modified, fetched_at FROM game_sources
+           WHERE game_id = ? AND html_hash IS NOT NULL""",
         (game_id,),
     ).fetchall()
+    return {row["url"]: row for row in rows}
+
+
+def evict_blobs(conn: sqlite3.Connection, max_bytes: int = BLOB_CACHE_MAX_BYTES) -> int:
+    """Shrink the blob store to max_bytes of compressed HTML. Returns pages evicted.
+
+    Blobs no page references any more are dropped first, then the least
+    recently used ones; sources pointing at an evicted blob are removed
+    too, so they are fetched afresh next time.
+    """
+    conn.execute("""DELETE FROM html_blobs WHERE hash NOT IN
+                        (SELECT html_hash FROM game_sources WHERE html_hash IS NOT NULL)""")
+    total = conn.execute("SELECT COALESCE(SUM(stored_size), 0) FROM html_blobs").fetchone()[0]
+    evicted, freed = [], 0
+    if total > max_bytes:
+        for row in conn.execute("SELECT hash, stored_size FROM html_blobs ORDER BY last_access"):
+            if total - freed <= max_bytes:
+                break
+            evicted.append((row["hash"],))
+            freed += row["stored_size"]
+        conn.executemany("DELETE FROM game_sources WHERE html_hash = ?", evicted)
+        conn.executemany("DELETE FROM html_blobs WHERE hash = ?", evicted)
+        bump_stat(conn, "evictions", len(evicted))
+        bump_stat(conn, "evicted_bytes", freed)
+        print(f"[pipeline] Evicted {len(evicted)} cached pages ({freed} bytes)", file=sys.stderr)
+    # Text for evicted pages, or from an extractor configuration since replaced
+    conn.execute("""DELETE FROM clean_texts WHERE extractor != ?
+                        OR html_hash NOT IN (SELECT hash FROM html_blobs)""",
+                 (EXTRACTOR_FINGERPRINT,))
+    conn.commit()
+    return len(evicted)
+
+
+def cache_stats(conn: sqlite3.Connection) -> dict:
+    """Return counters and sizes for the --stats view.
+
+    raw_bytes is the HTML the cached sources would take uncompressed and
+    one copy per source; stored_bytes what the blob store actually holds.
+    """
+    stats = dict.fromkeys(CACHE_STATS, 0)
+    stats.update((row["name"], row["value"])
+                 for row in conn.execute("SELECT name, value FROM cache_stats"))
+    lookups = stats["hits"] + stats["misses"]
+    stats["hit_rate"] = stats["hits"] / lookups if lookups else None
+    stats["sources"], stats["raw_bytes"] = conn.execute(
+        """SELECT COUNT(*), COALESCE(SUM(b.raw_size), 0)
+           FROM game_sources s JOIN html_blobs b ON b.hash = s.html_hash""").fetchone()
+    stats["blobs"], stats["stored_bytes"] = conn.execute(
+        "SELECT COUNT(*), COALESCE(SUM(stored_size), 0) FROM html_blobs").fetchone()
+    stats["bytes_saved"] = stats["raw_bytes"] - stats["stored_bytes"]
+    stats["max_bytes"] = BLOB_CACHE_MAX_BYTES
+    return stats
+
+
+def _format_bytes(n: float) -> str:
+    for unit in ("B", "KB", "MB"):
+        if n < 1024:
+            return f"{n:.0f} {unit}" if unit == "B" else f"{n:.1f} {unit}"
+        n /= 1024
+    return f"{n:.1f} GB"
+
+
+def print_cache_stats(stats: dict) -> None:
+    hit_rate = f"{stats['hit_rate']:.1%}" if stats["hit_rate"] is not None else "n/a"
+    print(f"Lookups:   {stats['hits']} hits, {stats['misses']} misses, "
+          f"{stats['failures']} failed fetches (hit rate {hit_rate})")
+    print(f"Pages:     {stats['sources']} sources in {stats['blobs']} distinct blobs")
+    print(f"Size:      {_format_bytes(stats['stored_bytes'])} stored "
+          f"(cap {_format_bytes(stats['max_bytes'])}), {_format_bytes(stats['raw_bytes'])} raw, "
+          f"{_format_bytes(stats['bytes_saved'])} saved")
+    print(f"Evictions: {stats['evictions']} pages, {_format_bytes(stats['evicted_bytes'])}")
 
 
 # ── Phase 1: fetch HTML ────────────────────────────────────────────────────────
 
-def fetch_html(url: str) -> str | None:
-    """Fetch a URL and return its HTML body, or None on failure."""
+class FetchResult(NamedTuple):
+    html: str | None          # None when unchanged or failed
+    etag: str | None
+    last_modified: str | None
+    not_modified: bool        # server answered 304 to a conditional GET
+
+
+_session_local = threading.local()
+
+
+def get_session() -> requests.Session:
+    """Return this thread's pooled keep-alive session.
+
+    requests negotiates gzip/deflate (and brotli/zstd when their
+    packages are installed) and decompresses transparently.
+    """
+    session = getattr(_session_local, "session", None)
+    if session is None:
+        session = requests.Session()
+        session.headers["User-Agent"] = USER_AGENT
+        adapter = requests.adapters.HTTPAdapter(pool_connections=SESSION_POOL_HOSTS,
+                                                pool_maxsize=PER_HOST_CONCURRENCY)
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        _session_local.session = session
+    return session
+
+
+def fetch_conditional(url: str, etag: str | None = None, last_modified: str | None = None,
+                      timeout: float = FETCH_TIMEOUT) -> FetchResult | None:
+    """Fetch a URL, revalidating with the given validators if any.
+
+    Returns None on failure.
+    """
+    headers = {}
+    if etag:
+        headers["If-None-Match"] = etag
+    if last_modified:
+        headers["If-Modified-Since"] = last_modified
     try:
-        resp = requests.get(
-            url,
-            timeout=FETCH_TIMEOUT,
-            headers={"User-Agent": USER_AGENT},
-            allow_redirects=True,
-        )
+        resp = get_session().get(url, timeout=timeout, headers=headers, allow_redirects=True)
+        if resp.status_code == 304 and headers:
+            return FetchResult(None, etag, last_modified, True)
         resp.raise_for_status()
-        return resp.text
+        return FetchResult(resp.text, resp.headers.get("ETag"),
+                           resp.headers.get("Last-Modified"), False)
     except requests.RequestException as e:
         print(f"[pipeline] Fetch failed for {url}: {e}", file=sys.stderr)
         return None
 
 
-def phase1_fetch(game_name: str, urls: list[str]) -> int:
-    """Fetch HTML for each URL and store in cache. Returns game_id."""
+def fetch_html(url: str, timeout: float = FETCH_TIMEOUT) -> str | None:
+    """Fetch a URL and return its HTML body, or None on failure."""
+    result = fetch_conditional(url, timeout=timeout)
+    return result.html if result else None
+
+
+_pool_lock = threading.Lock()
+_fetch_pool: ThreadPoolExecutor | None = None
+
+
+def _get_fetch_pool() -> ThreadPoolExecutor:
+    """Return the process-wide fetch thread pool, creating it on first use."""
+    global _fetch_pool
+    with _pool_lock:
+        if _fetch_pool is None:
+            _fetch_pool = ThreadPoolExecutor(MAX_CONCURRENT_FETCHES,
+                                             thread_name_prefix="fetch")
+        return _fetch_pool
+
+
+def acquire_host_lease(host: str, deadline: float) -> int | None:
+    """Take one of host's PER_HOST_CONCURRENCY request slots; return its lease id.
+
+    Leases live in fetch_leases, so the cap holds across every process
+    using the cache (e.g. research_batch.py workers). Polls until a slot
+    frees up, returning None if deadline (monotonic) passes first. A
+    lease left by a crashed process lapses at its expires_at.
+    """
+    while True:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return None
+        conn = sqlite3.connect(DB_PATH, timeout=DB_BUSY_TIMEOUT, isolation_level=None)
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            now = time.time()
+            conn.execute("DELETE FROM fetch_leases WHERE host = ? AND expires_at <= ?",
+                         (host, now))
+            held = conn.execute("SELECT COUNT(*) FROM fetch_leases WHERE host = ?",
+                                (host,)).fetchone()[0]
+            lease_id = None
+            if held < PER_HOST_CONCURRENCY:
+                lease_id = conn.execute(
+                    "INSERT INTO fetch_leases (host, expires_at) VALUES (?, ?)",
+                    (host, now + remaining + FETCH_TIMEOUT)).lastrowid
+            conn.execute("COMMIT")
+        finally:
+            conn.close()
+        if lease_id is not None:
+            return lease_id
+        time.sleep(min(LEASE_POLL_INTERVAL, remaining))
+
+
+def release_host_lease(lease_id: int) -> None:
+    conn = sqlite3.connect(DB_PATH, timeout=DB_BUSY_TIMEOUT, isolation_level=None)
+    try:
+        conn.execute("DELETE FROM fetch_leases WHERE id = ?", (lease_id,))
+    finally:
+        conn.close()
+
+
+def reserve_host_start(host: str, min_delay: float | None = None) -> float:
+    """Reserve the next request start for host; return seconds to wait for it.
+
+    Reservations live in fetch_hosts, so they are shared by every process
+    using the cache. min_delay defaults to PER_HOST_MIN_DELAY.
+    """
+    if min_delay is None:
+        min_delay = PER_HOST_MIN_DELAY
+    conn = sqlite3.connect(DB_PATH, timeout=DB_BUSY_TIMEOUT, isolation_level=None)
+    try:
+        conn.execute("BEGIN IMMEDIATE")
+        now = time.time()
+        row = conn.execute("SELECT next_start FROM fetch_hosts WHERE host = ?",
+                           (host,)).fetchone()
+        start = max(now, row[0]) if row else now
+        conn.execute("INSERT OR REPLACE INTO fetch_hosts (host, next_start) VALUES (?, ?)",
+                     (host, start + min_delay))
+        conn.execute("COMMIT")
+    finally:
+        conn.close()
+    return start - now
+
+
+def _fetch_limited(url: str, deadline: float,
+                   validators: tuple[str | None, str | None]) -> FetchResult | None:
+    """Fetch url within the per-host limits, giving up at deadline (monotonic)."""
+    host = urlparse(url).netloc.lower()
+    lease_id = acquire_host_lease(host, deadline)
+    if lease_id is None:
+        print(f"[pipeline] Deadline passed waiting for {host}: {url}", file=sys.stderr)
+        return None
+    try:
+        wait = reserve_host_start(host)
+        if time.monotonic() + wait >= deadline:
+            print(f"[pipeline] Deadline passed waiting for {host}: {url}", file=sys.stderr)
+            return None
+        time.sleep(wait)
+        # The lease and the sleep may have used up the budget; requests
+        # (urllib3) rejects a zero or negative timeout outright
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            print(f"[pipeline] Deadline passed waiting for {host}: {url}", file=sys.stderr)
+            return None
+        return fetch_conditional(url, *validators,
+                                 timeout=min(FETCH_TIMEOUT, max(remaining, MIN_FETCH_TIMEOUT)))
+    finally:
+        release_host_lease(lease_id)
+
+
+def fetch_concurrently(urls: list[str], deadline: float = GAME_FETCH_DEADLINE,
+                       validators: dict[str, tuple[str | None, str | None]] | None = None,
+                       ) -> Iterator[tuple[str, FetchResult | None]]:
+    """Fetch urls in parallel, yielding (url, FetchResult or None) as each completes.
+
+    validators maps a URL to its cached (etag, last_modified) for a
+    conditional GET. Stops waiting after deadline seconds; URLs still
+    pending then are yielded with None.
+    """
+    end = time.monotonic() + deadline
+    validators = validators or {}
+    pool = _get_fetch_pool()
+    futures = {pool.submit(_fetch_limited, url, end, validators.get(url, (None, None))): url
+               for url in urls}
+    try:
+        for future in as_completed(futures, timeout=max(0.0, end - time.monotonic())):
+            yield futures[future], future.result()
+    except FuturesTimeout:
+        for future, url in futures.items():
+            if not future.done():
+                future.cancel()
+                print(f"[pipeline] Deadline passed fetching {url}", file=sys.stderr)
+                yield url, None
+
+
+def is_fresh(row: sqlite3.Row, now: float | None = None) -> bool:
+    """True if a cached page is within SOURCE_MAX_AGE for its source type."""
+    if row["fetched_at"] is None:
+        return False
+    max_age = SOURCE_MAX_AGE.get(row["source_type"], SOURCE_MAX_AGE["other"])
+    return (now or time.time()) - row["fetched_at"] < max_age
+
+
+def phase1_fetch(game_name: str, urls: list[str],
+                 deadline: float = GAME_FETCH_DEADLINE, refresh: bool = False) -> int:
+    """Fetch HTML for the URLs concurrently and store in cache. Returns game_id.
+
+    Pages still fresh in the cache are skipped (unless refresh) and
+    stale ones are revalidated. Each page is stored as soon as it
+    arrives; the whole call returns within about deadline seconds.
+    """
     conn = get_db()
     game_id = get_or_create_game(conn, game_name)
-
-    for url in urls[:MAX_URLS_PER_GAME]:
-        source_type = classify_url(url)
-        print(f"[pipeline] Fetching {source_type}: {url}", file=sys.stderr)
-        html = fetch_html(url)
-        if html:
-            store_source(conn, game_id, url, source_type, html)
+    cached = get_validators(conn, game_id)
+    counts = Counter()
+
+    to_fetch, fresh = [], []
+    for url in list(dict.fromkeys(urls))[:MAX_URLS_PER_GAME]:
+        if url in cached and not refresh and is_fresh(cached[url]):
+            print(f"[pipeline] Fresh in cache: {url}", file=sys.stderr)
+            counts["hits"] += 1
+            fresh.append(url)
+            continue
+        verb = "Revalidating" if url in cached else "Fetching"
+        print(f"[pipeline] {verb} {classify_url(url)}: {url}", file=sys.stderr)
+        to_fetch.append(url)
+
+    validators = {url: (cached[url]["etag"], cached[url]["last_modified"])
+                  for url in to_fetch if url in cached}
+    for url, result in fetch_concurrently(to_fetch, deadline, validators):
+        if result and result.not_modified:
+            print(f"[pipeline] Not modified: {url}", file=sys.stderr)
+            counts["hits"] += 1
+            mark_revalidated(conn, game_id, url)
+        elif result and result.html:
+            counts["misses"] += 1
+            store_source(conn, game_id, url, classify_url(url), result.html,
+                         result.etag, result.last_modified)
         else:
-            print(f"[pipeline] Skipping {url} (fetch failed)", file=sys.stderr)
-
+            counts["failures"] += 1
+            if url in cached:
+                print(f"[pipeline] Keeping cached copy of {url} (fetch failed)", file=sys.stderr)
+            else:
+                print(f"[pipeline] Skipping {url} (fetch failed)", file=sys.stderr)
+
+    # Counted locally: an open write transaction would block the fetch
+    # threads' host reservations until the last fetch finished
+    for name, n in counts.items():
+        bump_stat(conn, name, n)
+    # A fresh hit is a use of the page, so the eviction below keeps it
+    conn.executemany("""UPDATE html_blobs SET last_access = ? WHERE hash =
+                            (SELECT html_hash FROM game_sources WHERE game_id = ? AND url = ?)""",
+                     [(time.time(), game_id, url) for url in fresh])
+    conn.commit()
+    evict_blobs(conn)
     conn.close()
     return game_id
 
 
 # ── Clean text extraction ──────────────────────────────────────────────────────
 
-def extract_clean_text(game_name: str) -> dict:
+def extract_clean_text(game_name: str, max_chars: int = MAX_CHARS) -> dict:
     """Convert cached HTML sources to clean text and return structured output.
 
+    Extracted text is cached per (page hash, EXTRACTOR_FINGERPRINT,
+    max_chars), so a page's HTML is only decompressed and run through
+    html_to_main_text the first time, or after the extraction settings
+    change.
+
     Returns:
         dict with "game_name" and "sources" list, each source having
         "url", "source_type", and "text" fields.
@@ -206,20 +709,27 @@ def extract_clean_text(game_name: str) -> dict:
         conn.close()
         return {"game_name": game_name, "sources": []}
 
-    game_id = row["id"]
-    sources = get_sources(conn, game_id)
-    conn.close()
+    sources = conn.execute(
+        """SELECT s.url, s.source_type, s.html_hash, t.text
+           FROM game_sources s
+           LEFT JOIN clean_texts t ON t.html_hash = s.html_hash
+                AND t.extractor = ? AND t.max_chars = ?
+           WHERE s.game_id = ? AND s.html_hash IS NOT NULL""",
+        (EXTRACTOR_FINGERPRINT, max_chars, row["id"]),
+    ).fetchall()
 
-    result_sources = []
+    result_sources, extracted = [], []
     for source in sources:
         url = source["url"]
         source_type = source["source_type"]
-        html = source["html"]
-        if not html:
-            continue
-
-        print(f"[pipeline] Cleaning text from {source_type}: {url}", file=sys.stderr)
-        clean_text = truncate_text(html_to_main_text(html, url=url))
+        clean_text = source["text"]
+        if clean_text is None:
+            html = get_html(conn, source["html_hash"])
+            if not html:
+                continue
+            print(f"[pipeline] Cleaning text from {source_type}: {url}", file=sys.stderr)
+            clean_text = truncate_text(html_to_main_text(html, url=url), max_chars)
+            extracted.append((source["html_hash"], EXTRACTOR_FINGERPRINT, max_chars, clean_text))
         if not clean_text.strip():
             print(f"[pipeline] No text extracted from {url}", file=sys.stderr)
             continue
@@ -230,6 +740,16 @@ def extract_clean_text(game_name: str) -> dict:
             "text": clean_text,
         })
 
+    conn.executemany(
+        """INSERT OR REPLACE INTO clean_texts (html_hash, extractor, max_chars, text)
+           VALUES (?, ?, ?, ?)""",
+        extracted,
+    )
+    # Reading the text is a use of the page for LRU eviction
+    conn.executemany("UPDATE html_blobs SET last_access = ? WHERE hash = ?",
+                     [(time.time(), source["html_hash"]) for source in sources])
+    conn.commit()
+    conn.close()
     return {"game_name": game_name, "sources": result_sources}
 
 
@@ -245,9 +765,26 @@ SOURCE_TYPE_DESCRIPTIONS = {
 }
 
 
-def append_research_log(game_slug: str, sources: list[dict]) -> None:
-    """Append source entries to sources/research-log.yaml."""
-    today = date.today().isoformat() + "T00:00:00Z"
+# One entry as written by research_log_lines: (timestamp, game_id, url)
+LOG_ENTRY_RE = re.compile(r'^  - timestamp: "([^"]*)"\n    game_id: (.*)\n    url: "([^"]*)"$',
+                          re.MULTILINE)
+
+
+def _log_timestamp() -> str:
+    return date.today().isoformat() + "T00:00:00Z"
+
+
+def logged_entries() -> set[tuple[str, str, str]]:
+    """Return (timestamp, game_id, url) for the entries in research-log.yaml."""
+    try:
+        return set(LOG_ENTRY_RE.findall(LOG_PATH.read_text()))
+    except FileNotFoundError:
+        return set()
+
+
+def research_log_lines(game_slug: str, sources: list[dict]) -> list[str]:
+    """Return the research-log.yaml entry lines for one game's sources."""
+    today = _log_timestamp()
 
     lines = []
     for source in sources:
@@ -257,26 +794,51 @@ def append_research_log(game_slug: str, sources: list[dict]) -> None:
         lines.append(f"    game_id: {game_slug}")
         lines.append(f'    url: "{source["url"]}"')
         lines.append(f'    description: "{desc} — {domain}"')
+    return lines
+
+
+def append_research_log_bulk(games: list[tuple[str, list[dict]]]) -> None:
+    """Append entries for [(game_slug, sources), ...] in a single write.
+
+    Sources already logged today for the same game are left out, so
+    appending the same games twice (research_batch.py resuming after
+    an interruption between this write and its checkpoint) adds nothing.
+    """
+    today, logged = _log_timestamp(), logged_entries()
+    games = [(game_slug, [source for source in sources
+                          if (today, str(game_slug), source["url"]) not in logged])
+             for game_slug, sources in games]
+    lines = [line for game_slug, sources in games
+             for line in research_log_lines(game_slug, sources)]
+    if not lines:
+        return
 
     with open(LOG_PATH, "a") as f:
         f.write("\n".join(lines) + "\n")
 
-    print(f"[pipeline] Appended {len(sources)} entries to research-log.yaml", file=sys.stderr)
+    count = sum(len(sources) for _, sources in games)
+    print(f"[pipeline] Appended {count} entries to research-log.yaml", file=sys.stderr)
+
+
+def append_research_log(game_slug: str, sources: list[dict]) -> None:
+    """Append source entries to sources/research-log.yaml."""
+    append_research_log_bulk([(game_slug, sources)])
 
 
 # ── Public API ─────────────────────────────────────────────────────────────────
 
-def process_game(game_name: str, urls: list[str]) -> dict:
+def process_game(game_name: str, urls: list[str], refresh: bool = False) -> dict:
     """Full pipeline: fetch URLs → clean text → return structured output.
 
     Args:
         game_name: Display name of the game (used as cache key).
         urls: List of URLs to fetch (max MAX_URLS_PER_GAME used).
+        refresh: Revalidate cached pages even if they are still fresh.
 
     Returns:
         dict with "game_name" and "sources" list containing clean text per source.
     """
-    phase1_fetch(game_name, urls)
+    phase1_fetch(game_name, urls, refresh=refresh)
     return extract_clean_text(game_name)
 
 
@@ -286,20 +848,38 @@ def main():
     parser = argparse.ArgumentParser(
         description="Game research pipeline: fetch URLs → clean text → JSON output"
     )
-    parser.add_argument("game_name", help="Name of the game to research")
+    parser.add_argument("game_name", nargs="?", help="Name of the game to research")
     parser.add_argument(
         "--urls",
         nargs="*",
         metavar="URL",
         help="URLs to fetch (up to 3). If omitted, only cached data is used.",
     )
+    parser.add_argument(
+        "--refresh",
+        action="store_true",
+        help="Revalidate cached pages even if they are within SOURCE_MAX_AGE",
+    )
     parser.add_argument(
         "--log",
         metavar="SLUG",
         help="Game slug for research-log.yaml (auto-appends entries after processing)",
     )
+    parser.add_argument(
+        "--stats",
+        action="store_true",
+        help="Show cache hit rate, size and evictions, then exit",
+    )
     args = parser.parse_args()
 
+    if args.stats:
+        conn = get_db()
+        print_cache_stats(cache_stats(conn))
+        conn.close()
+        return
+    if not args.game_name:
+        parser.error("game_name is required unless --stats is given")
+
     if not args.urls:
         print(
             "[pipeline] No --urls provided. Supply URLs discovered via WebSearch:\n"
@@ -310,7 +890,7 @@ def main():
         # Still attempt text extraction from any previously cached data
         result = extract_clean_text(args.game_name)
     else:
-        result = process_game(args.game_name, args.urls)
+        result = process_game(args.game_name, args.urls, refresh=args.refresh)
 
     if args.log and result["sources"]:
         append_research_log(args.log, result["sources"])
@@ -0,0 +1,315 @@
+#!/usr/bin/env python3
+"""Generate a synthetic catalog for benchmarking the scripts at scale.
+
+Writes a self-contained project root: games/*.yaml, master_list.csv,
+schema.yaml, publishers.yaml and a copy of scripts/, so every script
+can be run against it unchanged (their paths are relative to their
+own location). Games conform to schema.yaml: 0-4 rating scales,
+categories and evokes drawn from its vocabularies, player counts from
+its possible values. Output is deterministic for a given --seed.
+
+Scale 1 matches the size of the real games/ directory and master list.
+
+Usage:
+    python3 scripts/gen_synthetic.py /tmp/bench-10x --scale 10
+    python3 scripts/gen_synthetic.py /tmp/small --games 500 --seed 7
+"""
+
+import argparse
+import csv
+import glob
+import itertools
+import os
+import random
+import re
+import shutil
+
+import yaml
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SCRIPTS_DIR = os.path.join(ROOT, "scripts")
+SCHEMA_FILE = os.path.join(ROOT, "schema.yaml")
+PUBLISHERS_FILE = os.path.join(ROOT, "publishers.yaml")
+MASTER_CSV = os.path.join(ROOT, "master_list.csv")
+GAMES_DIR = os.path.join(ROOT, "games")
+FIELDNAMES = ["bgg_id", "name", "year", "type", "status", "notes", "yaml_id"]
+
+# Typical minutes per length rating (schema.yaml: Snack .. Marathon)
+LENGTH_MINUTES = {0: 15, 1: 30, 2: 60, 3: 150, 4: 360}
+
+ADJECTIVES = [
+    "Crimson", "Hidden", "Lost", "Iron", "Golden", "Silent", "Forgotten",
+    "Emerald", "Broken", "Ancient", "Clockwork", "Frozen", "Burning",
+    "Shattered", "Sunken", "Wandering", "Celestial", "Gilded", "Verdant",
+    "Obsidian", "Radiant", "Hollow", "Twin", "Northern", "Distant",
+]
+NOUNS = [
+    "Harbor", "Empire", "Kingdom", "Orchard", "Citadel", "Frontier",
+    "Expedition", "Bazaar", "Labyrinth", "Railway", "Colony", "Garden",
+    "Archipelago", "Dynasty", "Observatory", "Caravan", "Monastery",
+    "Foundry", "Lagoon", "Canyon", "Skyline", "Vineyard", "Armada",
+    "Reliquary", "Menagerie", "Tundra", "Oasis", "Workshop", "Beacon",
+]
+SUBTITLES = [
+    "The Card Game", "Second Edition", "Big Box", "Legends", "The Dice Game",
+    "Duel", "Deluxe Edition", "Rise of Heroes", "Tides of Fortune",
+]
+FIRST_NAMES = [
+    "Anna", "Bruno", "Clara", "Dieter", "Elena", "Felix", "Greta", "Hiro",
+    "Ines", "Jonas", "Kaja", "Luca", "Mara", "Nils", "Olga", "Pavel",
+    "Rosa", "Sven", "Tomas", "Ulla", "Vera", "Wim", "Yuki", "Zoe",
+]
+LAST_NAMES = [
+    "Adler", "Berg", "Costa", "Dvorak", "Engel", "Fischer", "Garcia",
+    "Hansen", "Ito", "Jansen", "Kowalski", "Lindqvist", "Moreau", "Novak",
+    "Okafor", "Petrov", "Quist", "Rossi", "Sato", "Tanaka", "Varga", "Weber",
+]
+PUBLISHER_WORDS = [
+    "Games", "Studio", "Spiele", "Play", "Editions", "Publishing", "Works",
+]
+DESCRIPTION_WORDS = (
+    "players compete build engine tiles cards dice resources workers board "
+    "round turn score points victory action market trade route city region "
+    "explore discover combat alliance deck hand draft auction bid track "
+    "upgrade unlock bonus objective scenario campaign story hero monster "
+    "ship train farm temple river mountain forest island castle guild "
+    "clever tense elegant quick deep cooperative asymmetric modular variable "
+    "each every their final game end most best new strong limited shared "
+).split()
+# Made-up words extending DESCRIPTION_WORDS into a long tail. Words are
+# drawn with Zipf weights over the whole list, so term frequencies
+# spread as in real descriptions: a few words in nearly every
+# description, most in only a handful.
+SYLLABLES = [c + v for c in "bdfgklmnprstvz" for v in "aeiou"]
+DESCRIPTION_VOCABULARY = DESCRIPTION_WORDS + [
+    a + b for a in SYLLABLES for b in SYLLABLES][:3000]
+DESCRIPTION_CUM_WEIGHTS = list(itertools.accumulate(
+    1.0 / (i + 1) for i in range(len(DESCRIPTION_VOCABULARY))))
+
+
+def slugify(name):
+    s = name.lower()
+    s = re.sub(r"[^a-z0-9]+", "-", s)
+    return s.strip("-")
+
+
+def load_vocabularies():
+    """Return the category, evoke and player-count vocabularies from schema.yaml."""
+    with open(SCHEMA_FILE) as f:
+        schema = yaml.safe_load(f)
+    groups = {group: [str(v) for v in values]
+              for group, values in schema["categories"].items()}
+    evokes = [str(v) for v in schema["evokes"]["values"]]
+    counts = schema["player_counts"]["possible_values"]
+    return groups, evokes, counts
+
+
+def real_sizes():
+    """Return (yaml file count, master list row count) of the real catalog."""
+    n_games = len(glob.glob(os.path.join(GAMES_DIR, "*.yaml"))) or 4000
+    n_rows = 0
+    if os.path.isfile(MASTER_CSV):
+        with open(MASTER_CSV) as f:
+            n_rows = sum(1 for _ in csv.DictReader(f))
+    return n_games, n_rows or int(n_games * 1.05)
+
+
+def zipf_pool(rng, pool, size):
+    """Sample size items from pool with a long-tailed distribution."""
+    weights = [1.0 / (i + 1) for i in range(len(pool))]
+    return rng.choices(pool, weights=weights, k=size)
+
+
+class CatalogGenerator:
+    """Produce synthetic game dicts and master list rows."""
+
+    def __init__(self, seed):
+        self.rng = random.Random(seed)
+        self.groups, self.evokes, self.counts = load_vocabularies()
+        self.names = set()
+        self.next_suffix = {}
+        self.designers = [f"{f} {l}" for f in FIRST_NAMES for l in LAST_NAMES]
+        self.rng.shuffle(self.designers)
+        self.publishers = [f"{a} {w}" for a in ADJECTIVES + NOUNS for w in PUBLISHER_WORDS]
+        self.rng.shuffle(self.publishers)
+
+    def unique_name(self):
+        rng = self.rng
+        name = f"{rng.choice(ADJECTIVES)} {rng.choice(NOUNS)}"
+        if rng.random() < 0.3:
+            name = f"{name}: {rng.choice(SUBTITLES)}"
+        if rng.random() < 0.05:
+            name = f"{name} ({rng.randint(2, 9)})"
+        # Resume numbering where this base name left off, so large
+        # catalogs don't re-probe every earlier suffix
+        suffix = self.next_suffix.get(name, 2)
+        candidate = name
+        while slugify(candidate) in self.names:
+            candidate = f"{name} {suffix}"
+            suffix += 1
+        self.next_suffix[name] = suffix
+        self.names.add(slugify(candidate))
+        return candidate
+
+    def description(self):
+        rng = self.rng
+        sentences = []
+        for _ in range(rng.randint(4, 8)):
+            words = rng.choices(DESCRIPTION_VOCABULARY, cum_weights=DESCRIPTION_CUM_WEIGHTS,
+                                k=rng.randint(12, 24))
+            sentences.append(" ".join(words).capitalize() + ".")
+        return " ".join(sentences) + "\n"
+
+    def game(self, existing_ids):
+        rng = self.rng
+        name = self.unique_name()
+        length = rng.choices(range(5), weights=[10, 30, 35, 20, 5])[0]
+        playtime = max(5, int(LENGTH_MINUTES[length] * rng.uniform(0.7, 1.3)))
+        lo = rng.choices([1, 2, 3], weights=[25, 55, 20])[0]
+        hi = min(lo + rng.randint(0, 5), 12)
+        possible = [c for c in self.counts if isinstance(c, int) and lo <= c <= hi]
+        if hi == 12 and rng.random() < 0.3:
+            possible.append("12+")
+        true = sorted(rng.sample(possible, k=min(len(possible), rng.randint(1, 2))),
+                      key=lambda c: (isinstance(c, str), c))
+
+        categories = (rng.sample(self.groups["mechanics"], rng.randint(2, 5))
+                      + rng.sample(self.groups["styles"], rng.randint(1, 2))
+                      + rng.sample(self.groups["themes"], rng.randint(0, 2)))
+        designers = zipf_pool(rng, self.designers, rng.choices([1, 2, 3], weights=[70, 25, 5])[0])
+        designers = list(dict.fromkeys(designers))
+        publishers = list(dict.fromkeys(zipf_pool(rng, self.publishers, rng.randint(1, 3))))
+
+        game_id = slugify(name)
+        base_game = None
+        if existing_ids and rng.random() < 0.08:
+            base_game = rng.choice(existing_ids)
+
+        return {
+            "id": game_id,
+            "name": name,
+            "alternate_names": [f"{name} (Alt)"] if rng.random() < 0.1 else [],
+            "year": rng.randint(1950, 2026),
+            "game_family": None,
+            "edition": None,
+            "base_game": base_game,
+            "expansions": [],
+            "compatible_with": rng.sample(existing_ids, 1) if existing_ids and rng.random() < 0.03 else [],
+            "length": length,
+            "rules_complexity": rng.randint(0, 4),
+            "strategic_depth": rng.randint(0, 4),
+            "feel": rng.randint(0, 4),
+            "value": rng.randint(0, 4),
+            "affinity": None,
+            "hotness": None,
+            "categories": categories,
+            "evokes": rng.sample(self.evokes, 5),
+            "possible_counts": possible,
+            "true_counts": true,
+            "designer": designers,
+            "publisher": publishers,
+            "artist": list(dict.fromkeys(zipf_pool(rng, self.designers[::-1], rng.randint(0, 2)))),
+            "playtime_minutes": playtime,
+            "min_playtime": max(5, playtime - rng.randint(0, 15)),
+            "max_playtime": playtime + rng.randint(0, 30),
+            "min_age": rng.choice([6, 8, 10, 12, 14]),
+            "description": self.description(),
+            "upgrades": [],
+            "plays_tracked": {"total_plays": 0, "configs": []},
+        }
+
+    def master_rows(self, games, n_rows):
+        """Master list rows: one per game plus unresearched/excluded extras."""
+        rng = self.rng
+        rows = []
+        for game in games:
+            name = game["name"]
+            # Some rows use the short title and rely on subtitle matching
+            if ":" in name and rng.random() < 0.2:
+                name = name.split(":")[0]
+            rows.append({
+                "bgg_id": str(rng.randint(1000, 400000)),
+                "name": name,
+                "year": str(game["year"]),
+                "type": "boardgame",
+                "status": "",
+                "notes": "",
+                "yaml_id": game["id"] if rng.random() < 0.1 else "",
+            })
+        while len(rows) < n_rows:
+            status = rng.choices(["", "failed", "skip", "ambiguous", "duplicate"],
+                                 weights=[40, 30, 10, 10, 10])[0]
+            rows.append({
+                "bgg_id": str(rng.randint(1000, 400000)),
+                "name": self.unique_name(),
+                "year": str(rng.randint(1950, 2026)),
+                "type": "boardgame",
+                "status": status,
+                "notes": "Synthetic" if status else "",
+                "yaml_id": "",
+            })
+        rng.shuffle(rows)
+        return rows
+
+
+def generate(out_dir, n_games, n_rows, seed=1):
+    """Write a synthetic project root with n_games YAML files."""
+    games_dir = os.path.join(out_dir, "games")
+    if os.path.isdir(games_dir):
+        shutil.rmtree(games_dir)
+    os.makedirs(games_dir)
+    for sub in ("images", os.path.join("sources", "lists")):
+        os.makedirs(os.path.join(out_dir, sub), exist_ok=True)
+
+    gen = CatalogGenerator(seed)
+    games = []
+    ids = []
+    for _ in range(n_games):
+        game = gen.game(ids)
+        games.append(game)
+        ids.append(game["id"])
+        with open(os.path.join(games_dir, f"{game['id']}.yaml"), "w") as f:
+            yaml.safe_dump(game, f, sort_keys=False, allow_unicode=True)
+
+    with open(os.path.join(out_dir, "master_list.csv"), "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=FIELDNAMES)
+        writer.writeheader()
+        writer.writerows(gen.master_rows(games, n_rows))
+
+    shutil.copy(SCHEMA_FILE, out_dir)
+    if os.path.exists(PUBLISHERS_FILE):
+        shutil.copy(PUBLISHERS_FILE, out_dir)
+
+    copy_scripts(out_dir)
+
+
+def copy_scripts(out_dir):
+    """Copy scripts/*.py into out_dir/scripts.
+
+    Scripts locate the catalog relative to themselves, so the synthetic
+    root runs copies; refresh them whenever the scripts change.
+    """
+    scripts_out = os.path.join(out_dir, "scripts")
+    os.makedirs(scripts_out, exist_ok=True)
+    for path in glob.glob(os.path.join(SCRIPTS_DIR, "*.py")):
+        shutil.copy(path, scripts_out)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a synthetic game catalog")
+    parser.add_argument("out_dir", help="Directory to write the synthetic project root to")
+    parser.add_argument("--scale", type=float, default=1.0,
+                        help="Multiple of the real catalog size (default: 1)")
+    parser.add_argument("--games", type=int, help="Exact number of games (overrides --scale)")
+    parser.add_argument("--seed", type=int, default=1, help="Random seed (default: 1)")
+    args = parser.parse_args()
+
+    real_games, real_rows = real_sizes()
+    n_games = args.games if args.games is not None else int(real_games * args.scale)
+    n_rows = int(n_games * real_rows / real_games)
+    generate(args.out_dir, n_games, n_rows, args.seed)
+    print(f"Wrote {n_games} games and {n_rows} master list rows to {args.out_dir}")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,8 +2,16 @@
 
 Uses Trafilatura (main-content extraction) with BeautifulSoup fallback.
 Strips boilerplate, nav, ads, and other noise before passing to LLMs.
+
+EXTRACTOR_FINGERPRINT identifies the extraction settings and the
+backend in use; game_pipeline.py keys its cached text on it, so
+changing TRAFILATURA_OPTIONS or BOILERPLATE_TAGS, bumping
+EXTRACTOR_VERSION or installing/upgrading Trafilatura re-extracts.
 """
 
+import hashlib
+import json
+
 try:
     import trafilatura
     _TRAFILATURA_AVAILABLE = True
@@ -18,6 +26,29 @@ except ImportError:
 
 MAX_CHARS = 3000
 
+# Bump when html_to_main_text changes in a way the settings below don't show
+EXTRACTOR_VERSION = 1
+
+TRAFILATURA_OPTIONS = {
+    "include_comments": False,
+    "include_tables": False,
+    "favor_recall": False,
+}
+BOILERPLATE_TAGS = ["script", "style", "noscript", "nav", "footer", "header", "aside"]
+
+
+def _backend() -> str:
+    if _TRAFILATURA_AVAILABLE:
+        return f"trafilatura-{getattr(trafilatura, '__version__', '?')}"
+    if _BS4_AVAILABLE:
+        return "bs4"
+    return "regex"
+
+
+EXTRACTOR_FINGERPRINT = hashlib.sha256(json.dumps(
+    [EXTRACTOR_VERSION, _backend(), TRAFILATURA_OPTIONS, BOILERPLATE_TAGS],
+    sort_keys=True).encode()).hexdigest()[:16]
+
 
 def html_to_main_text(html: str, url: str | None = None) -> str:
     """Extract main content from HTML.
@@ -27,19 +58,13 @@ def html_to_main_text(html: str, url: str | None = None) -> str:
     Returns plain text suitable for passing to an LLM.
     """
     if _TRAFILATURA_AVAILABLE:
-        main = trafilatura.extract(
-            html,
-            url=url,
-            include_comments=False,
-            include_tables=False,
-            favor_recall=False,
-        )
+        main = trafilatura.extract(html, url=url, **TRAFILATURA_OPTIONS)
         if main and main.strip():
             return main.strip()
 
     if _BS4_AVAILABLE:
         soup = BeautifulSoup(html, "lxml")
-        for tag in soup(["script", "style", "noscript", "nav", "footer", "header", "aside"]):
+        for tag in soup(BOILERPLATE_TAGS):
             tag.decompose()
         text = soup.get_text(separator="\n")
         lines = [l.strip() for l in text.splitlines() if l.strip()]
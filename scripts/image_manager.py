@@ -20,18 +20,16 @@ IMAGES_DIR = os.path.join(ROOT, "images")
 PUBLISHERS_FILE = os.path.join(ROOT, "publishers.yaml")
 SOURCES_FILE = os.path.join(IMAGES_DIR, "sources.yaml")
 
+# Allow running as a script: ensure project root is on sys.path
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from scripts.game_data import all_games, games_by_publisher
+
 
 def load_games():
-    """Load all game YAML files."""
-    games = []
-    for fname in sorted(os.listdir(GAMES_DIR)):
-        if not fname.endswith(".yaml"):
-            continue
-        with open(os.path.join(GAMES_DIR, fname)) as f:
-            game = yaml.safe_load(f)
-        if game:
-            games.append(game)
-    return games
+    """Load all games (from games.db when it is up to date)."""
+    return all_games()
 
 
 def load_publishers():
@@ -54,7 +52,7 @@ def get_existing_images():
 def expected_filename(game):
     """Generate expected image filename for a game."""
     name = game.get("name", "")
-    year = game.get("year", "")
+    year = game.get("year") or ""
     return f"{name} ({year})"
 
 
@@ -85,14 +83,9 @@ def cmd_progress(games, existing_images):
 
     # Publisher coverage summary
     pub_stats = {}
-    for g in games:
-        for pub in g.get("publisher", []):
-            if pub not in pub_stats:
-                pub_stats[pub] = {"have": 0, "missing": 0}
-            if find_image(g, existing_images):
-                pub_stats[pub]["have"] += 1
-            else:
-                pub_stats[pub]["missing"] += 1
+    for pub, pub_games in games_by_publisher(games).items():
+        have = sum(1 for g in pub_games if find_image(g, existing_images))
+        pub_stats[pub] = {"have": have, "missing": len(pub_games) - have}
 
     # Sort by most missing images
     ranked = sorted(pub_stats.items(), key=lambda x: x[1]["missing"], reverse=True)
@@ -107,11 +100,7 @@ def cmd_progress(games, existing_images):
 
 def cmd_publishers(games, existing_images, publishers):
     """Show games grouped by publisher with image status."""
-    # Group games by publisher
-    by_pub = {}
-    for g in games:
-        for pub in g.get("publisher", []):
-            by_pub.setdefault(pub, []).append(g)
+    by_pub = games_by_publisher(games)
 
     # Sort publishers by game count (descending)
     for pub, pub_games in sorted(by_pub.items(), key=lambda x: len(x[1]), reverse=True):
@@ -142,22 +131,19 @@ def cmd_publishers(games, existing_images, publishers):
         for g in sorted(pub_games, key=lambda x: x.get("name", "")):
             img = find_image(g, existing_images)
             icon = "x" if img else " "
-            print(f"    [{icon}] {g['name']} ({g.get('year', '?')})")
+            print(f"    [{icon}] {g['name']} ({g.get('year') or '?'})")
 
 
 def cmd_publisher(games, existing_images, publishers, name):
     """Show details for a single publisher."""
     pub_info = publishers.get(name, {})
-    pub_games = [g for g in games if name in g.get("publisher", [])]
+    by_pub = games_by_publisher(games)
+    pub_games = by_pub.get(name, [])
 
     if not pub_games:
         print(f"No games found for publisher: {name}")
         # Suggest close matches
-        all_pubs = set()
-        for g in games:
-            for p in g.get("publisher", []):
-                all_pubs.add(p)
-        matches = [p for p in all_pubs if name.lower() in p.lower()]
+        matches = [p for p in by_pub if name.lower() in p.lower()]
         if matches:
             print(f"Did you mean: {', '.join(matches)}")
         return
@@ -195,8 +181,8 @@ def cmd_missing(games, existing_images):
 
     print(f"Games missing images: {len(missing)}\n")
     for g in sorted(missing, key=lambda x: x.get("name", "")):
-        pubs = ", ".join(g.get("publisher", ["unknown"]))
-        print(f"  {g['name']} ({g.get('year', '?')}) — {pubs}")
+        pubs = ", ".join(g.get("publisher") or ["unknown"])
+        print(f"  {g['name']} ({g.get('year') or '?'}) — {pubs}")
 
 
 def cmd_check(games, existing_images):
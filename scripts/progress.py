@@ -26,6 +26,13 @@ MASTER_CSV = os.path.join(ROOT, "master_list.csv")
 LISTS_DIR = os.path.join(ROOT, "sources", "lists")
 GAMES_DIR = os.path.join(ROOT, "games")
 
+# Allow running as a script: ensure project root is on sys.path
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from scripts.game_cache import YAML_LOADER
+from scripts.game_data import game_files, name_to_slug_map
+
 
 def slugify(name):
     """Convert a game name to a slug for fuzzy matching.
@@ -75,7 +82,7 @@ def load_source_enrichment():
     list_files = sorted(glob.glob(os.path.join(LISTS_DIR, "*.yaml")))
     for path in list_files:
         with open(path) as f:
-            data = yaml.safe_load(f)
+            data = yaml.load(f, Loader=YAML_LOADER)
         if not data or "games" not in data:
             continue
         source_name = data.get("source", os.path.basename(path))
@@ -93,31 +100,11 @@ def load_existing():
 
     Returns: (set of lowercase names, set of file slugs, number of game files)
     """
-    names = set()
-    slugs = set()
-    file_count = 0
     if not os.path.isdir(GAMES_DIR):
-        return names, slugs, file_count
+        return set(), set(), 0
 
-    for fname in os.listdir(GAMES_DIR):
-        if not fname.endswith(".yaml"):
-            continue
-        file_count += 1
-        slugs.add(fname[:-5])
-        game_path = os.path.join(GAMES_DIR, fname)
-        try:
-            with open(game_path) as f:
-                game_data = yaml.safe_load(f)
-            if game_data and "name" in game_data:
-                names.add(game_data["name"].lower())
-            if game_data and "alternate_names" in game_data:
-                for alt in game_data.get("alternate_names", []):
-                    if alt:
-                        names.add(alt.lower())
-        except Exception:
-            pass
-
-    return names, slugs, file_count
+    files = game_files()
+    return set(name_to_slug_map()), set(files), len(files)
 
 
 def main():
@@ -0,0 +1,292 @@
+#!/usr/bin/env python3
+"""Filtered, sorted, paginated game queries over games.db.
+
+The Python counterpart of getFilteredGames() in web/lib/db.js, with the
+same filters and sort options, for tooling that shouldn't need the
+Node server. It differs in three ways:
+
+  - Pages are fetched by keyset (seek) pagination: each page returns a
+    cursor holding the last row's (sort value, sort_name, id), and the
+    next page starts with a WHERE that seeks past it instead of OFFSET.
+    With the (column, sort_name, id) indexes build_db.py creates, a page
+    is an index range walk in either direction, so page 500 costs the
+    same as page 1.
+  - The total is only counted on request. It is exact up to
+    COUNT_EXACT_LIMIT and estimated above that from random rowid
+    windows, each an index range read of a few rows.
+  - Text search (q) uses the games_fts index, as search_games.py does,
+    rather than LIKE.
+
+One read-only connection is reused across calls and reopened when a
+full build swaps in a new games.db. SQL text depends only on the shape
+of the filters, never on their values, so sqlite3's statement cache
+(sized by STATEMENT_CACHE_SIZE) reuses prepared statements.
+
+Usage:
+    python3 scripts/query_games.py --category Cooperative --sort year --desc
+    python3 scripts/query_games.py --best 2 --length-max 1 --count
+    python3 scripts/query_games.py --sort year --after '[0, 2019, "wingspan", "wingspan"]'
+
+Can also be imported as a module:
+    from scripts.query_games import query_games
+    page = query_games({'categories': ['Cooperative'], 'players': 4}, sort='year')
+    more = query_games({'categories': ['Cooperative'], 'players': 4}, sort='year',
+                       after=page['next'])
+"""
+
+import argparse
+import functools
+import json
+import os
+import random
+import sqlite3
+import sys
+from pathlib import Path
+
+# Allow running as a script: ensure project root is on sys.path
+_root = str(Path(__file__).resolve().parent.parent)
+if _root not in sys.path:
+    sys.path.insert(0, _root)
+
+from scripts.db_schema import DB_PATH
+from scripts.search_games import build_match_query
+
+SORT_COLUMNS = ['name', 'year', 'length', 'rules_complexity', 'strategic_depth',
+                'feel', 'value', 'playtime_minutes']
+RATING_FIELDS = ['length', 'rules_complexity', 'strategic_depth', 'feel', 'value']
+
+# Range filters: filter key -> (column, operator)
+RANGE_FILTERS = {
+    'year_min': ('year', '>='), 'year_max': ('year', '<='),
+    'playtime_min': ('playtime_minutes', '>='), 'playtime_max': ('playtime_minutes', '<='),
+    **{f'{f}_min': (f, '>=') for f in RATING_FIELDS},
+    **{f'{f}_max': (f, '<=') for f in RATING_FIELDS},
+}
+
+STATEMENT_CACHE_SIZE = 256
+
+# Results beyond this many are counted approximately
+COUNT_EXACT_LIMIT = 10000
+# Rowids sampled for an approximate count, in this many windows: one
+# at a random offset within each equal slice of the rowid range
+COUNT_SAMPLE_ROWS = 2000
+COUNT_SAMPLE_WINDOWS = 20
+
+_conn = None
+_conn_key = None
+
+
+def connect():
+    """Return the shared read-only connection, reopening it after a swap."""
+    global _conn, _conn_key
+    st = os.stat(DB_PATH)
+    key = (st.st_dev, st.st_ino)
+    if _conn is None or key != _conn_key:
+        if _conn is not None:
+            _conn.close()
+        _conn = sqlite3.connect(f"file:{DB_PATH}?mode=ro", uri=True,
+                                cached_statements=STATEMENT_CACHE_SIZE)
+        _conn.row_factory = sqlite3.Row
+        _conn_key = key
+    return _conn
+
+
+def build_where(filters):
+    """Return (SQL conditions, params) for a filters dict.
+
+    Keys match the web API: q, categories (all of), evokes (all of),
+    true_counts (best at any of), players (supports exactly N),
+    year/playtime/rating _min and _max, designer, publisher.
+    """
+    where, params = [], []
+    if filters.get('q'):
+        match = build_match_query(filters['q'])
+        if match:
+            where.append("g.id IN (SELECT game_id FROM games_fts WHERE games_fts MATCH ?)")
+            params.append(match)
+    for category in filters.get('categories') or []:
+        where.append("g.id IN (SELECT game_id FROM game_categories WHERE category = ?)")
+        params.append(category)
+    for evoke in filters.get('evokes') or []:
+        where.append("g.id IN (SELECT game_id FROM game_evokes WHERE evoke = ?)")
+        params.append(evoke)
+    best_at = [int(str(c).rstrip('+')) for c in filters.get('true_counts') or []
+               if str(c).rstrip('+').isdigit()]
+    if best_at:
+        where.append("g.id IN (SELECT game_id FROM game_true_counts WHERE players IN "
+                     f"({', '.join('?' for _ in best_at)}) OR (open_ended AND players <= ?))")
+        params += best_at + [max(best_at)]
+    if filters.get('players') is not None:
+        where.append("g.id IN (SELECT game_id FROM game_possible_counts "
+                     "WHERE players = ? OR (open_ended AND players <= ?))")
+        params += [filters['players']] * 2
+    for key, (col, op) in RANGE_FILTERS.items():
+        if filters.get(key) is not None:
+            where.append(f"g.{col} {op} ?")
+            params.append(filters[key])
+    if filters.get('designer'):
+        where.append("g.id IN (SELECT game_id FROM game_designers WHERE name = ?)")
+        params.append(filters['designer'])
+    if filters.get('publisher'):
+        where.append("g.id IN (SELECT game_id FROM game_publishers WHERE name = ?)")
+        params.append(filters['publisher'])
+    return where, params
+
+
+def _seek(keys):
+    """SQL for "sorts after the cursor" over keys [(expr, descending)].
+
+    Expands to (k1 > ?) OR (k1 = ? AND k2 > ?) OR ..., which works for
+    mixed directions where a row-value comparison would not, behind a
+    plain k1 >= ? bound the planner can start an index range from.
+    Params are the cursor values repeated per the expansion (see
+    _seek_params).
+    """
+    terms = []
+    for i, (expr, desc) in enumerate(keys):
+        parts = [f"{e} = ?" for e, _ in keys[:i]] + [f"{expr} {'<' if desc else '>'} ?"]
+        terms.append(f"({' AND '.join(parts)})")
+    first, desc = keys[0]
+    return f"({first} {'<=' if desc else '>='} ? AND ({' OR '.join(terms)}))"
+
+
+def _seek_params(values):
+    params = [values[0]]
+    for i in range(len(values)):
+        params += values[:i + 1]
+    return params
+
+
+@functools.lru_cache(maxsize=STATEMENT_CACHE_SIZE)
+def page_sql(where, sort, desc, cursor_phase):
+    """Build the page query for a filter shape.
+
+    cursor_phase is None for the first page; 'value' seeks past a
+    cursor on a non-NULL sort value (matching only non-NULL values);
+    'nulls' starts the trailing NULL sort values (they always come
+    last, as on the web) and 'null' seeks past a cursor within them.
+    The sort_name and id tiebreakers follow the sort direction, so with
+    the (column, sort_name, id) indexes each phase is a single index
+    range, walked backwards for a descending sort.
+    """
+    where = list(where)
+    direction = 'DESC' if desc else 'ASC'
+    name_key = ("g.sort_name", desc)
+    id_key = ("g.id", desc)
+    if sort == 'name':
+        keys = [name_key, id_key]
+        order = f"g.sort_name {direction}, g.id {direction}"
+        if cursor_phase:
+            where.append(_seek(keys))
+    else:
+        col = f"g.{sort}"
+        order = f"{col} {direction} NULLS LAST, g.sort_name {direction}, g.id {direction}"
+        if cursor_phase == 'value':
+            where.append(_seek([(col, desc), name_key, id_key]))
+        elif cursor_phase == 'nulls':
+            where.append(f"{col} IS NULL")
+        elif cursor_phase == 'null':
+            where.append(f"({col} IS NULL AND {_seek([name_key, id_key])})")
+    clause = f"WHERE {' AND '.join(where)}" if where else ""
+    return f"SELECT g.* FROM games g {clause} ORDER BY {order} LIMIT ?"
+
+
+def count_games(conn, where, params):
+    """Return (count, estimated) for a filter."""
+    clause = f"WHERE {' AND '.join(where)}" if where else ""
+    n = conn.execute(f"SELECT COUNT(*) FROM (SELECT 1 FROM games g {clause} LIMIT ?)",
+                     params + [COUNT_EXACT_LIMIT + 1]).fetchone()[0]
+    if n <= COUNT_EXACT_LIMIT:
+        return n, False
+    # Count matches in random rowid windows and scale up by the share
+    # of the rowid range they cover
+    lo, hi = conn.execute("SELECT MIN(rowid), MAX(rowid) FROM games").fetchone()
+    span = hi - lo + 1
+    slice_width = span / COUNT_SAMPLE_WINDOWS
+    width = max(1, min(COUNT_SAMPLE_ROWS // COUNT_SAMPLE_WINDOWS, int(slice_width)))
+    sql = f"SELECT COUNT(*) FROM games g WHERE {' AND '.join(['g.rowid BETWEEN ? AND ?'] + where)}"
+    hits = sampled = 0
+    for i in range(COUNT_SAMPLE_WINDOWS):
+        start = lo + int(i * slice_width) + random.randrange(max(1, int(slice_width) - width + 1))
+        hits += conn.execute(sql, [start, start + width - 1] + params).fetchone()[0]
+        sampled += width
+    return max(round(hits * span / sampled), COUNT_EXACT_LIMIT + 1), True
+
+
+def query_games(filters=None, sort='name', direction='asc', limit=50, after=None, count=False):
+    """Return one page of games matching filters.
+
+    Returns: {'games': [row dicts], 'next': cursor for the following
+    page or None, 'total': count or None, 'total_estimated': bool}.
+    Pass the previous page's 'next' as after to continue.
+    """
+    conn = connect()
+    sort = sort if sort in SORT_COLUMNS else 'name'
+    desc = direction == 'desc'
+    where, params = build_where(filters or {})
+
+    if after is None:
+        phase, seek = None, []
+    elif sort == 'name':
+        phase, seek = 'value', _seek_params(list(after))
+    else:
+        is_null, value, sort_name, game_id = after
+        if is_null:
+            phase, seek = 'null', _seek_params([sort_name, game_id])
+        else:
+            phase, seek = 'value', _seek_params([value, sort_name, game_id])
+
+    sql = page_sql(tuple(where), sort, desc, phase)
+    rows = conn.execute(sql, params + seek + [limit + 1]).fetchall()
+    if phase == 'value' and sort != 'name' and len(rows) <= limit:
+        # Ran out of non-NULL values; continue into the NULLs
+        rows += conn.execute(page_sql(tuple(where), sort, desc, 'nulls'),
+                             params + [limit + 1 - len(rows)]).fetchall()
+    games = [dict(row) for row in rows[:limit]]
+
+    next_cursor = None
+    if len(rows) > limit and games:
+        last = games[-1]
+        if sort == 'name':
+            next_cursor = [last['sort_name'], last['id']]
+        else:
+            next_cursor = [int(last[sort] is None), last[sort], last['sort_name'], last['id']]
+
+    total, estimated = count_games(conn, where, params) if count else (None, False)
+    return {'games': games, 'next': next_cursor, 'total': total, 'total_estimated': estimated}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Query games.db with filters and sorting")
+    parser.add_argument("--q", help="Text search")
+    parser.add_argument("--category", action="append", dest="categories", help="Category (repeat to AND)")
+    parser.add_argument("--evoke", action="append", dest="evokes", help="Evoke (repeat to AND)")
+    parser.add_argument("--best", action="append", dest="true_counts", help="Best at N players (repeat to OR)")
+    parser.add_argument("--players", type=int, help="Supports exactly N players")
+    for key in RANGE_FILTERS:
+        parser.add_argument(f"--{key.replace('_', '-')}", dest=key, type=int)
+    parser.add_argument("--designer")
+    parser.add_argument("--publisher")
+    parser.add_argument("--sort", default="name", choices=SORT_COLUMNS)
+    parser.add_argument("--desc", action="store_true", help="Sort descending")
+    parser.add_argument("--limit", type=int, default=20, help="Page size (default: 20)")
+    parser.add_argument("--after", help="Cursor (JSON) printed by the previous page")
+    parser.add_argument("--count", action="store_true", help="Also count all matches")
+    args = parser.parse_args()
+
+    filters = {key: value for key, value in vars(args).items()
+               if key not in ('sort', 'desc', 'limit', 'after', 'count') and value is not None}
+    page = query_games(filters, args.sort, 'desc' if args.desc else 'asc', args.limit,
+                       json.loads(args.after) if args.after else None, args.count)
+
+    if page['total'] is not None:
+        print(f"{'~' if page['total_estimated'] else ''}{page['total']} games")
+    for game in page['games']:
+        extra = f"  {args.sort}={game[args.sort]}" if args.sort != 'name' else ""
+        print(f"  {game['name']}  [{game['id']}]{extra}")
+    if page['next']:
+        print(f"\nNext page: --after '{json.dumps(page['next'], ensure_ascii=False)}'")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+"""Run a manifest of games through the research pipeline in one process tree.
+
+Each game goes through game_pipeline.process_game (fetch, cache, clean
+text) on a pool of worker processes, so interpreter start-up and the
+requests/Trafilatura imports are paid once per worker rather than once
+per game. One JSON result per game is written to stdout (or --output)
+as soon as it completes, in completion order:
+
+    {"game_name": ..., "slug": ..., "sources": [...], "elapsed": 1.234}
+
+or, when the pipeline raised, {"game_name", "slug", "error"}.
+
+The manifest is JSONL, one {"name", "slug", "urls"} object per line, or
+CSV with name, slug and urls columns (URLs separated by spaces or |).
+slug is optional; games without one are not written to the research
+log. A game with no urls is answered from the cache alone.
+
+Completed games are recorded in a checkpoint file every LOG_EVERY games
+(and on Ctrl-C), right after their research-log.yaml entries are
+appended in one write. Re-running the same manifest skips them and
+resumes with the rest; games that errored are retried. A game finished
+after the last checkpoint is simply researched again, which the page
+and text caches make cheap, and its log entries are not repeated (the
+append skips sources already logged that day for the game).
+
+Usage:
+    python3 scripts/research_batch.py queue.jsonl > results.jsonl
+    python3 scripts/research_batch.py queue.csv --jobs 8 --output results.jsonl
+    python3 scripts/research_batch.py queue.jsonl --restart   # ignore the checkpoint
+
+Can also be imported as a module:
+    from scripts.research_batch import read_manifest, run_batch
+    for result in run_batch(read_manifest("queue.jsonl")):
+        ...
+"""
+
+import argparse
+import csv
+import json
+import re
+import sys
+import time
+from multiprocessing import Pool
+from pathlib import Path
+from typing import Iterator
+
+# Allow running as a script: ensure project root is on sys.path
+_root = str(Path(__file__).resolve().parent.parent)
+if _root not in sys.path:
+    sys.path.insert(0, _root)
+
+from scripts.game_pipeline import append_research_log_bulk, extract_clean_text, process_game
+
+CHECKPOINT_DIR = Path(_root) / ".cache"
+
+# Games in flight at once; they mostly wait on the network (and the
+# per-host delays in game_pipeline), so this can exceed the CPU count
+BATCH_JOBS = 4
+
+# Completed games per research-log append and checkpoint write
+LOG_EVERY = 25
+
+
+def _entry(data: dict, where: str) -> dict:
+    name = str(data.get("name") or "").strip()
+    if not name:
+        raise ValueError(f"{where}: missing game name")
+    urls = data.get("urls") or []
+    if isinstance(urls, str):
+        urls = re.split(r"[\s|]+", urls)
+    return {
+        "name": name,
+        "slug": str(data.get("slug") or "").strip() or None,
+        "urls": [url for url in urls if url],
+    }
+
+
+def read_manifest(path: str | Path) -> list[dict]:
+    """Return [{'name', 'slug', 'urls'}, ...] from a .csv or JSONL manifest.
+
+    Raises ValueError naming the line of a malformed entry.
+    """
+    path = Path(path)
+    entries = []
+    with open(path, newline="") as f:
+        if path.suffix.lower() == ".csv":
+            for line_no, row in enumerate(csv.DictReader(f), 2):
+                entries.append(_entry(row, f"{path}:{line_no}"))
+        else:
+            for line_no, line in enumerate(f, 1):
+                line = line.strip()
+                if not line or line.startswith("#"):
+                    continue
+                try:
+                    data = json.loads(line)
+                except ValueError as e:
+                    raise ValueError(f"{path}:{line_no}: {e}") from None
+                if not isinstance(data, dict):
+                    raise ValueError(f"{path}:{line_no}: expected a JSON object")
+                entries.append(_entry(data, f"{path}:{line_no}"))
+    return entries
+
+
+def entry_key(entry: dict) -> str:
+    """Checkpoint key for a manifest entry: its slug, else its name."""
+    return entry["slug"] or entry["name"]
+
+
+def default_checkpoint(manifest: str | Path) -> Path:
+    return CHECKPOINT_DIR / f"research-batch-{Path(manifest).stem}.jsonl"
+
+
+def load_checkpoint(path: Path) -> set[str]:
+    """Return the keys of games a previous run completed."""
+    done = set()
+    try:
+        with open(path) as f:
+            for line in f:
+                try:
+                    done.add(json.loads(line)["key"])
+                except (ValueError, KeyError, TypeError):
+                    pass  # torn last line from an interrupted write
+    except FileNotFoundError:
+        pass
+    return done
+
+
+def _research_task(task: tuple[dict, bool]) -> tuple[str, dict]:
+    entry, refresh = task
+    return entry_key(entry), research_one(entry, refresh)
+
+
+def research_one(entry: dict, refresh: bool = False) -> dict:
+    """Worker: research one manifest entry and return its result dict."""
+    start = time.perf_counter()
+    try:
+        if entry["urls"]:
+            output = process_game(entry["name"], entry["urls"], refresh=refresh)
+        else:
+            output = extract_clean_text(entry["name"])
+    except Exception as e:
+        return {"game_name": entry["name"], "slug": entry["slug"],
+                "error": f"{type(e).__name__}: {e}"}
+    return {"game_name": entry["name"], "slug": entry["slug"], "sources": output["sources"],
+            "elapsed": round(time.perf_counter() - start, 3)}
+
+
+def run_batch(entries: list[dict], jobs: int = BATCH_JOBS, refresh: bool = False,
+              checkpoint: Path | None = None, log: bool = True,
+              log_every: int = LOG_EVERY) -> Iterator[dict]:
+    """Research entries on a worker pool, yielding each result as it completes.
+
+    Entries whose key is in checkpoint are skipped. Finished games are
+    written to the research log (if log) and then to checkpoint in
+    batches of log_every, and once more when the run ends or is
+    interrupted.
+    """
+    done = load_checkpoint(checkpoint) if checkpoint else set()
+    pending, seen = [], set(done)
+    for entry in entries:
+        if entry_key(entry) not in seen:
+            seen.add(entry_key(entry))
+            pending.append(entry)
+    skipped = len(entries) - len(pending)
+    if skipped:
+        print(f"[batch] Skipping {skipped} games already done or listed twice", file=sys.stderr)
+
+    finished = []
+
+    def flush():
+        if log:
+            append_research_log_bulk([(r["slug"], r["sources"]) for _, r in finished
+                                      if r["slug"] and r["sources"]])
+        if checkpoint:
+            checkpoint.parent.mkdir(parents=True, exist_ok=True)
+            with open(checkpoint, "a") as f:
+                f.write("".join(json.dumps({"key": key}) + "\n" for key, _ in finished))
+        finished.clear()
+
+    # Leaving the with block terminates the workers, so Ctrl-C (or the
+    # caller abandoning the generator) doesn't wait on in-flight fetches
+    try:
+        with Pool(max(1, jobs)) as pool:
+            tasks = [(entry, refresh) for entry in pending]
+            for key, result in pool.imap_unordered(_research_task, tasks):
+                if "error" not in result:
+                    finished.append((key, result))
+                    if len(finished) >= log_every:
+                        flush()
+                yield result
+    finally:
+        flush()
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Research a manifest of games through the pipeline, streaming JSONL results"
+    )
+    parser.add_argument("manifest", help="JSONL or .csv file of name, slug, urls")
+    parser.add_argument("--jobs", type=int, default=BATCH_JOBS,
+                        help=f"Worker processes (default: {BATCH_JOBS})")
+    parser.add_argument("--output", metavar="FILE", help="Append results here instead of stdout")
+    parser.add_argument("--refresh", action="store_true",
+                        help="Revalidate cached pages even if they are within SOURCE_MAX_AGE")
+    parser.add_argument("--checkpoint", metavar="FILE",
+                        help="Checkpoint file (default: .cache/research-batch-<manifest>.jsonl)")
+    parser.add_argument("--restart", action="store_true",
+                        help="Discard the checkpoint and research every game")
+    parser.add_argument("--no-log", action="store_true",
+                        help="Don't append to sources/research-log.yaml")
+    args = parser.parse_args()
+
+    try:
+        entries = read_manifest(args.manifest)
+    except (OSError, ValueError) as e:
+        parser.error(str(e))
+    checkpoint = Path(args.checkpoint) if args.checkpoint else default_checkpoint(args.manifest)
+    if args.restart and checkpoint.exists():
+        checkpoint.unlink()
+
+    out = open(args.output, "a") if args.output else sys.stdout
+    start = time.perf_counter()
+    ok = failed = 0
+    try:
+        for result in run_batch(entries, args.jobs, args.refresh, checkpoint, not args.no_log):
+            out.write(json.dumps(result, ensure_ascii=False) + "\n")
+            out.flush()
+            if "error" in result:
+                failed += 1
+                print(f"[batch] {result['game_name']}: {result['error']}", file=sys.stderr)
+            else:
+                ok += 1
+    except KeyboardInterrupt:
+        print(f"\n[batch] Interrupted after {ok} games; re-run to resume", file=sys.stderr)
+        sys.exit(130)
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    print(f"[batch] {ok} games done, {failed} failed in {time.perf_counter() - start:.1f}s",
+          file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
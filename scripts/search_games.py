@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""Full-text search over games.db.
+
+Queries the games_fts index built by build_db.py: names, alternate
+names, designers and descriptions, with diacritics folded ("baren"
+finds "Bärenpark") and every word treated as a prefix. Results are
+ranked by BM25 with name matches weighted above description matches.
+
+Usage:
+    python3 scripts/search_games.py "azul"
+    python3 scripts/search_games.py "coatl" --limit 5
+
+Can also be imported as a module:
+    from scripts.search_games import search
+    ids = search("knizia auction")
+"""
+
+import argparse
+import re
+import sqlite3
+import sys
+from pathlib import Path
+
+# Allow running as a script: ensure project root is on sys.path
+_root = str(Path(__file__).resolve().parent.parent)
+if _root not in sys.path:
+    sys.path.insert(0, _root)
+
+from scripts.db_schema import DB_PATH
+
+# bm25() weights per games_fts column: game_id, name, alternate_names,
+# designers, description
+COLUMN_WEIGHTS = (0.0, 10.0, 5.0, 3.0, 1.0)
+
+SEARCH_SQL = f"""
+    SELECT game_id FROM games_fts
+    WHERE games_fts MATCH ?
+    ORDER BY bm25(games_fts, {', '.join(str(w) for w in COLUMN_WEIGHTS)})
+    LIMIT ?
+"""
+
+
+def build_match_query(text):
+    """Turn free text into an FTS5 query: every word, as a prefix, ANDed.
+
+    Words are quoted so punctuation in user input ("7 Wonders: Duel")
+    can never be read as FTS5 syntax.
+    """
+    words = re.findall(r"\w+", text)
+    return " ".join(f'"{word}"*' for word in words)
+
+
+def search(text, limit=50, conn=None):
+    """Return game ids matching text, best match first."""
+    match = build_match_query(text)
+    if not match:
+        return []
+    own_conn = conn is None
+    if own_conn:
+        conn = sqlite3.connect(f"file:{DB_PATH}?mode=ro", uri=True)
+    try:
+        return [row[0] for row in conn.execute(SEARCH_SQL, (match, limit))]
+    finally:
+        if own_conn:
+            conn.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Full-text search over games.db")
+    parser.add_argument("query", help="Words to search for (prefix-matched)")
+    parser.add_argument("--limit", type=int, default=20, help="Max results (default: 20)")
+    args = parser.parse_args()
+
+    conn = sqlite3.connect(f"file:{DB_PATH}?mode=ro", uri=True)
+    ids = search(args.query, args.limit, conn)
+    if not ids:
+        print(f"No games match '{args.query}'")
+        return
+    names = dict(conn.execute(
+        f"SELECT id, name FROM games WHERE id IN ({','.join('?' for _ in ids)})", ids))
+    conn.close()
+    for game_id in ids:
+        print(f"  {names.get(game_id, '?')}  [{game_id}]")
+
+
+if __name__ == "__main__":
+    main()
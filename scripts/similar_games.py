@@ -0,0 +1,295 @@
+#!/usr/bin/env python3
+"""Similar games ("games like this") from structured data, precomputed into games.db.
+
+Each game becomes a feature vector made of four blocks: its 0-4
+ratings (centred so "average" is neutral), one-hot categories, one-hot
+evokes, and the range of player counts it supports. Each block is
+normalized on its own and scaled by FEATURE_WEIGHTS, so the cosine
+similarity of two games is a weighted blend of the per-block cosines.
+build_db.py calls rebuild_neighbors() to store the top NEIGHBORS_K
+for every game in game_neighbors. A full build screens the whole
+catalog in blocks of rows with one float32 matrix multiply each and
+rescores only the few candidates per game that can make its top k; an
+incremental update rescores only the changed games and the games
+whose lists they enter or leave. A lookup is a single primary-key read.
+
+Requires numpy; without it the build leaves game_neighbors empty.
+
+Usage:
+    python3 scripts/similar_games.py azul
+    python3 scripts/similar_games.py azul --limit 5
+
+Can also be imported as a module:
+    from scripts.similar_games import neighbors
+    for game_id, score in neighbors("azul"):
+        ...
+"""
+
+import argparse
+import json
+import sqlite3
+import sys
+from pathlib import Path
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+# Allow running as a script: ensure project root is on sys.path
+_root = str(Path(__file__).resolve().parent.parent)
+if _root not in sys.path:
+    sys.path.insert(0, _root)
+
+from scripts.db_schema import DB_PATH
+
+RATING_COLUMNS = ['length', 'rules_complexity', 'strategic_depth', 'feel', 'value']
+
+# Relative weight of each feature block in the blended cosine
+FEATURE_WEIGHTS = {
+    'ratings': 1.0,
+    'categories': 1.5,
+    'evokes': 1.0,
+    'players': 0.5,
+}
+
+# Player counts above this are folded into the last column
+MAX_PLAYERS = 12
+
+# Neighbors stored per game
+NEIGHBORS_K = 20
+
+# Decimal places kept in stored scores
+SCORE_DIGITS = 4
+
+# Upper bound on the similarity block held in memory at once (bytes)
+BLOCK_BYTES = 64 * 1024 * 1024
+
+# Columns whose k-th best score bounds a row's k-th neighbor before screening
+SCREEN_SAMPLE = 4096
+
+# Slack on float32 screening scores: covers their rounding error and a
+# tie in the last stored digit, so no game that could make the top k
+# is dropped before rescoring
+SCREEN_MARGIN = 2 * 10.0 ** -SCORE_DIGITS
+
+
+def _normalize_rows(block):
+    norms = np.linalg.norm(block, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return block / norms
+
+
+def _float_matrix(rows, width):
+    """Rows of numbers as a float32 matrix, with None as NaN."""
+    return np.array([[np.nan if v is None else v for v in row] for row in rows],
+                    dtype=np.float32).reshape(len(rows), width)
+
+
+def _one_hot(cursor, sql, index, n_games):
+    """One-hot matrix of (game_id, term_id) rows from sql."""
+    rows = cursor.execute(sql).fetchall()
+    if not rows:
+        return np.zeros((n_games, 0), dtype=np.float32)
+    game_idx = np.fromiter((index[game_id] for game_id, _ in rows), dtype=np.int64, count=len(rows))
+    terms, term_idx = np.unique(np.fromiter((t for _, t in rows), dtype=np.int64, count=len(rows)),
+                                return_inverse=True)
+    block = np.zeros((n_games, len(terms)), dtype=np.float32)
+    block[game_idx, term_idx] = 1.0
+    return block
+
+
+def build_features(cursor):
+    """Return (game ids, row-normalized float64 feature matrix)."""
+    ids = [game_id for (game_id,) in cursor.execute("SELECT id FROM games ORDER BY id")]
+    index = {game_id: i for i, game_id in enumerate(ids)}
+    n = len(ids)
+
+    ratings = _float_matrix(cursor.execute(
+        f"SELECT {', '.join(RATING_COLUMNS)} FROM games ORDER BY id").fetchall(),
+        len(RATING_COLUMNS))
+    # 0-4 scale centred on 2; a missing rating (NaN) counts as neutral
+    ratings = np.nan_to_num((ratings - 2.0) / 2.0)
+
+    categories = _one_hot(cursor, "SELECT game_id, term_id FROM game_category_ids", index, n)
+    evokes = _one_hot(cursor, "SELECT game_id, term_id FROM game_evoke_ids", index, n)
+
+    bounds = _float_matrix(cursor.execute(
+        "SELECT min_players, max_players FROM games ORDER BY id").fetchall(), 2)
+    low = np.minimum(np.nan_to_num(bounds[:, 0], nan=0.0), MAX_PLAYERS)
+    high = np.nan_to_num(bounds[:, 1], nan=MAX_PLAYERS)  # NULL max: open-ended
+    columns = np.arange(1, MAX_PLAYERS + 1, dtype=np.float32)
+    players = ((columns >= low[:, None]) & (columns <= np.maximum(high, low)[:, None])
+               & (low[:, None] > 0)).astype(np.float32)
+
+    blocks = [ratings, categories, evokes, players]
+    weights = [FEATURE_WEIGHTS[name] for name in ('ratings', 'categories', 'evokes', 'players')]
+    features = np.hstack([_normalize_rows(b) * np.float32(np.sqrt(w))
+                          for b, w in zip(blocks, weights)])
+    return ids, _normalize_rows(features.astype(np.float64))
+
+
+def pair_scores(features, left, right):
+    """Cosine similarities of the games in left with those in right, pair by
+    pair, rounded to SCORE_DIGITS.
+
+    Each score is a dot product of just the two rows in float64, so it
+    doesn't depend on which other games were scored with it (incremental
+    and full builds agree).
+    """
+    return np.round(np.einsum('ij,ij->i', features[left], features[right]), SCORE_DIGITS)
+
+
+def top_k_neighbors(features, k=NEIGHBORS_K, rows=None):
+    """Return (indices, scores), each (len(rows), k), best first, excluding self.
+
+    rows selects the games to score (row indices into features); None
+    scores every game. Equal scores rank the lower index first.
+
+    Blocks of rows are screened against the whole catalog with one
+    float32 matrix multiply each. The k-th best score among the first
+    SCREEN_SAMPLE columns bounds a row's k-th neighbor from below, so one
+    comparison leaves a few hundred candidates per row; only those within
+    SCREEN_MARGIN of the row's k-th best are rescored with pair_scores().
+    """
+    n = features.shape[0]
+    rows = np.arange(n) if rows is None else np.asarray(rows, dtype=np.int64)
+    k = min(k, n - 1)
+    if k <= 0:
+        return (np.zeros((len(rows), 0), dtype=np.int64),
+                np.zeros((len(rows), 0), dtype=np.float64))
+    # Less than half a unit of the last score digit, growing with the
+    # index: breaks ties without reordering distinct rounded scores
+    tiebreak = np.arange(n) * (0.4 * 10.0 ** -SCORE_DIGITS / n)
+    screen = features.astype(np.float32)
+    step = max(1, BLOCK_BYTES // (4 * n))
+    indices = np.empty((len(rows), k), dtype=np.int64)
+    scores = np.empty((len(rows), k), dtype=np.float64)
+    for start in range(0, len(rows), step):
+        block = rows[start:start + step]
+        sims = screen[block] @ screen.T
+        sims[np.arange(len(block)), block] = -np.inf
+        floor = np.partition(sims[:, :max(SCREEN_SAMPLE, k + 1)], -k, axis=1)[:, -k]
+        hits = np.flatnonzero(sims >= (floor - SCREEN_MARGIN)[:, None])
+        r, c = np.divmod(hits, n)
+        found = sims.ravel()[hits]
+        # Candidates come out grouped by row; pad them into a matrix to
+        # find each row's k-th best screened score
+        counts = np.bincount(r, minlength=len(block))
+        padded = np.full((len(block), counts.max()), -np.inf, dtype=np.float32)
+        padded[r, np.arange(len(r)) - (np.cumsum(counts) - counts)[r]] = found
+        kth = np.partition(padded, -k, axis=1)[:, -k]
+        keep = found >= kth[r] - SCREEN_MARGIN
+        r, c = r[keep], c[keep]
+        keys = pair_scores(features, block[r], c) - tiebreak[c]
+        order = np.lexsort((-keys, r))
+        take = np.searchsorted(r[order], np.arange(len(block)))[:, None] + np.arange(k)
+        indices[start:start + len(block)] = c[order][take]
+        scores[start:start + len(block)] = np.round(keys[order][take], SCORE_DIGITS)
+    return indices, scores
+
+
+def _affected_rows(cursor, ids, features, changed, game_ids, k):
+    """Row indices of unchanged games whose top k may differ after game_ids changed.
+
+    A game is affected if its stored list names a changed or removed
+    game, or if a changed game now scores above its k-th neighbor.
+    Every other game's list still holds: a game's vector depends only
+    on its own row, so scores between unchanged games are unchanged.
+    """
+    index = {game_id: i for i, game_id in enumerate(ids)}
+    kth = np.full(len(ids), -np.inf)
+    affected = set()
+    for game_id, rank, neighbor_id, score in cursor.execute(
+            "SELECT game_id, rank, neighbor_id, score FROM game_neighbors "
+            "WHERE rank = ? OR neighbor_id IN (SELECT value FROM json_each(?))",
+            (k - 1, json.dumps(sorted(game_ids)))):
+        i = index.get(game_id)
+        if i is None:
+            continue
+        if neighbor_id in game_ids:
+            affected.add(i)
+        if rank == k - 1:
+            kth[i] = score
+    if changed:
+        # Screened in float32 with the same slack as top_k_neighbors(),
+        # so a tie with the k-th neighbor (which can still win on index)
+        # is never missed; a false positive is just rescored
+        screen = features.astype(np.float32)
+        sims = screen[changed] @ screen.T
+        affected.update(np.nonzero((sims >= kth - SCREEN_MARGIN).any(axis=0))[0].tolist())
+    return sorted(affected - set(changed))
+
+
+def rebuild_neighbors(cursor, k=NEIGHBORS_K, game_ids=None):
+    """Recompute game_neighbors, for the whole catalog or after game_ids changed.
+
+    With game_ids (inserted, changed or removed games) only those games
+    and the games whose lists they enter or leave are rescored, so the
+    cost grows with the size of the change rather than the square of
+    the catalog. Returns False (leaving the table empty) when numpy is
+    missing.
+    """
+    if not NUMPY_AVAILABLE:
+        cursor.execute("DELETE FROM game_neighbors")
+        return False
+    ids, features = build_features(cursor)
+    k = min(k, len(ids) - 1)
+    if game_ids is None or k < 1:
+        rows = np.arange(len(ids))
+        cursor.execute("DELETE FROM game_neighbors")
+    else:
+        game_ids = set(game_ids)
+        changed = [i for i, game_id in enumerate(ids) if game_id in game_ids]
+        rows = np.array(sorted(changed + _affected_rows(cursor, ids, features, changed,
+                                                        game_ids, k)), dtype=np.int64)
+        cursor.executemany("DELETE FROM game_neighbors WHERE game_id = ?",
+                           [(game_id,) for game_id in game_ids | {ids[i] for i in rows}])
+    if not len(rows) or k < 1:
+        return True
+    indices, scores = top_k_neighbors(features, k, rows)
+    cursor.executemany(
+        "INSERT INTO game_neighbors (game_id, rank, neighbor_id, score) VALUES (?, ?, ?, ?)",
+        ((ids[i], rank, ids[j], score)
+         for r, i in enumerate(rows.tolist())
+         for rank, (j, score) in enumerate(zip(indices[r].tolist(), scores[r].tolist()))),
+    )
+    return True
+
+
+def neighbors(game_id, limit=10, conn=None):
+    """Return [(neighbor id, score), ...] for a game, most similar first."""
+    own_conn = conn is None
+    if own_conn:
+        conn = sqlite3.connect(f"file:{DB_PATH}?mode=ro", uri=True)
+    try:
+        return conn.execute(
+            "SELECT neighbor_id, score FROM game_neighbors WHERE game_id = ? "
+            "ORDER BY rank LIMIT ?", (game_id, limit)).fetchall()
+    finally:
+        if own_conn:
+            conn.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Show games similar to a game")
+    parser.add_argument("game_id", help="Game id (YAML slug)")
+    parser.add_argument("--limit", type=int, default=10, help="Max results (default: 10)")
+    args = parser.parse_args()
+
+    conn = sqlite3.connect(f"file:{DB_PATH}?mode=ro", uri=True)
+    found = neighbors(args.game_id, args.limit, conn)
+    if not found:
+        print(f"No neighbors for '{args.game_id}' (unknown id, or games.db built without numpy)")
+        return
+    names = dict(conn.execute(
+        f"SELECT id, name FROM games WHERE id IN ({','.join('?' for _ in found)})",
+        [game_id for game_id, _ in found]))
+    conn.close()
+    for game_id, score in found:
+        print(f"  {score:.3f}  {names.get(game_id, '?')}  [{game_id}]")
+
+
+if __name__ == "__main__":
+    main()
@@ -20,13 +20,17 @@ import os
 import re
 import sys
 
-import yaml
-
 ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 MASTER_CSV = os.path.join(ROOT, "master_list.csv")
 GAMES_DIR = os.path.join(ROOT, "games")
 FIELDNAMES = ["bgg_id", "name", "year", "type", "status", "notes", "yaml_id"]
 
+# Allow running as a script: ensure project root is on sys.path
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from scripts.game_data import name_to_slug_map
+
 
 def slugify(name):
     s = name.lower()
@@ -72,27 +76,10 @@ def update_row(rows, name, status=None, notes=None, yaml_id=None):
 
 
 def build_yaml_name_map():
-    """Build {lowercase_name: slug, alt_name: slug} from all YAML files."""
-    name_to_slug = {}
+    """Build {lowercase_name: slug, alt_name: slug} for all games."""
     if not os.path.isdir(GAMES_DIR):
-        return name_to_slug
-    for fname in os.listdir(GAMES_DIR):
-        if not fname.endswith(".yaml"):
-            continue
-        slug = fname[:-5]
-        try:
-            with open(os.path.join(GAMES_DIR, fname)) as f:
-                data = yaml.safe_load(f)
-            if not data:
-                continue
-            if "name" in data:
-                name_to_slug[data["name"].lower()] = slug
-            for alt in data.get("alternate_names") or []:
-                if alt:
-                    name_to_slug[alt.lower()] = slug
-        except Exception:
-            pass
-    return name_to_slug
+        return {}
+    return name_to_slug_map()
 
 
 def _is_subtitle_match(short, long):
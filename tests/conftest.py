@@ -0,0 +1,26 @@
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+# Let tests import scripts.* however pytest is launched
+_root = str(Path(__file__).resolve().parent.parent)
+if _root not in sys.path:
+    sys.path.insert(0, _root)
+
+from scripts import gen_synthetic
+
+
+def build(root, *args):
+    """Run the synthetic root's copy of build_db.py."""
+    subprocess.run([sys.executable, str(root / "scripts" / "build_db.py"), *args],
+                   check=True, capture_output=True)
+
+
+@pytest.fixture
+def catalog(tmp_path):
+    """A synthetic project root with games.db built (see gen_synthetic.py)."""
+    gen_synthetic.generate(str(tmp_path), 150, 150, seed=5)
+    build(tmp_path)
+    return tmp_path
@@ -0,0 +1,88 @@
+import json
+import subprocess
+import sys
+
+import pytest
+import yaml
+from conftest import build
+
+from scripts.audit_games import check_game, compile_rules
+
+SCHEMA = {
+    'length': {'values': {0: 'Snack', 1: 'Short', 2: 'Medium', 3: 'Long', 4: 'Marathon'}},
+    'categories': {'mechanics': ['Dice', 'Drafting'], 'themes': ['Space']},
+    'evokes': {'values': ['Calm', 'Tense', 'Clever', 'Lucky', 'Social', 'Sleepy']},
+    'player_counts': {'possible_values': [1, 2, 3, 4, '5+']},
+}
+
+GOOD = {
+    'id': 'good', 'description': 'A game.', 'categories': ['Dice', 'Space'],
+    'evokes': ['Calm', 'Tense', 'Clever', 'Lucky', 'Social'], 'length': 1,
+    'playtime_minutes': 30, 'possible_counts': [2, 3, '5+'], 'true_counts': [2],
+}
+
+
+@pytest.mark.parametrize("change, rule", [
+    ({'description': '  '}, 'missing_description'),
+    ({'evokes': ['Calm', 'Calm', 'Tense', 'Clever', 'Lucky']}, 'few_evokes'),
+    ({'categories': ['Dice', 'Cooking']}, 'unknown_category'),
+    ({'evokes': ['Calm', 'Tense', 'Clever', 'Lucky', 'Grumpy']}, 'unknown_evoke'),
+    ({'length': 7}, 'rating_scale'),
+    ({'true_counts': ['6+']}, 'player_count'),
+    ({'playtime_minutes': 240}, 'length_playtime'),
+])
+def test_rule(change, rule):
+    rules = compile_rules(SCHEMA)
+    assert check_game(rules, GOOD) == []
+    assert [name for name, _ in check_game(rules, {**GOOD, **change})] == [rule]
+
+
+def audit(root, *args):
+    """The report of the synthetic root's copy of audit_games.py."""
+    result = subprocess.run([sys.executable, str(root / "scripts" / "audit_games.py"),
+                             "--json", *args], check=True, capture_output=True, text=True)
+    return json.loads(result.stdout)
+
+
+def found(report, *rules):
+    return sorted((issue['path'], issue['rule']) for issue in report['issues']
+                  if not rules or issue['rule'] in rules)
+
+
+def test_audit_from_db_and_yaml_agree(catalog):
+    games = catalog / "games"
+    paths = sorted(games.glob("*.yaml"))
+    game = yaml.safe_load(paths[0].read_text())
+    (games / "zz-copy.yaml").write_text(yaml.safe_dump({**game, 'name': 'Copy'}))
+    (games / "zz-broken.yaml").write_text("id: [unclosed\n")
+    game = yaml.safe_load(paths[1].read_text())
+    paths[1].write_text(yaml.safe_dump({**game, 'expansions': ['no-such-game']}))
+    build(catalog)
+
+    from_db = audit(catalog, "--source", "db", "--full")
+    from_yaml = audit(catalog, "--source", "yaml", "--full")
+    assert from_db['source'] == 'db' and from_yaml['source'] == 'yaml'
+    assert found(from_db) == found(from_yaml)
+    assert found(from_db, 'duplicate_id', 'dangling_reference', 'parse_error') == [
+        (paths[0].name, 'duplicate_id'), (paths[1].name, 'dangling_reference'),
+        ('zz-broken.yaml', 'parse_error'), ('zz-copy.yaml', 'duplicate_id')]
+
+
+def test_audit_cache_rechecks_only_changed_files(catalog):
+    first = audit(catalog)
+    assert first['rechecked'] == first['games'] > 0
+    assert audit(catalog)['rechecked'] == 0
+
+    path = sorted((catalog / "games").glob("*.yaml"))[0]
+    game = yaml.safe_load(path.read_text())
+    path.write_text(yaml.safe_dump({**game, 'description': ''}))
+    build(catalog, "--incremental")
+    report = audit(catalog)
+    assert report['rechecked'] == 1
+    assert found(report, 'missing_description') == [(path.name, 'missing_description')]
+    assert found(report) == found(audit(catalog, "--full"))
+
+    # A schema edit discards every cached result
+    with open(catalog / "schema.yaml", "a") as f:
+        f.write("\n# edited\n")
+    assert audit(catalog)['rechecked'] == report['games']
@@ -0,0 +1,239 @@
+import os
+import sqlite3
+
+import pytest
+import yaml
+from conftest import build
+
+from scripts.build_db import parse_player_count, player_count_rows, sort_key
+
+# Bookkeeping that legitimately differs between an updated and a
+# rebuilt database
+SKIP_TABLES = {'build_generation', 'build_manifest', 'sqlite_stat1', 'sqlite_sequence'}
+
+
+def dump(root):
+    """Every table and view as a sorted list of rows, minus surrogate ids.
+
+    Vocabulary term ids and component numbers depend on insertion
+    order; the game_* views still compare the terms they stand for.
+    """
+    conn = sqlite3.connect(root / "games.db")
+    tables = {}
+    for name, kind in conn.execute("SELECT name, type FROM sqlite_master "
+                                   "WHERE type IN ('table', 'view') ORDER BY name"):
+        if name in SKIP_TABLES or name.startswith('games_fts'):
+            continue
+        columns = [row[1] for row in conn.execute(f"PRAGMA table_info({name})")]
+        keep = [col for col in columns
+                if not col.endswith('term_id') and col != 'component'
+                and not (col == 'id' and name != 'games')]
+        rows = conn.execute(f"SELECT {', '.join(keep)} FROM {name}").fetchall()
+        tables[name] = sorted(rows, key=repr)
+    conn.close()
+    return tables
+
+
+def load(path):
+    with open(path) as f:
+        return yaml.safe_load(f)
+
+
+def save(path, game):
+    with open(path, "w") as f:
+        yaml.safe_dump(game, f, sort_keys=False, allow_unicode=True)
+
+
+def test_incremental_update_matches_full_build(catalog):
+    games_dir = catalog / "games"
+    paths = sorted(games_dir.glob("*.yaml"))
+    games = {path: load(path) for path in paths}
+
+    # Re-rate and re-categorize a few games
+    for path in paths[:5]:
+        game = games[path]
+        game['strategic_depth'] = (game.get('strategic_depth') or 0) % 4 + 1
+        game['categories'] = list(reversed(game.get('categories') or []))[:1] or ['Cooperative']
+        save(path, game)
+    # Rewrite a description with a word new to the catalog
+    games[paths[4]]['description'] = "Aardvarks " + games[paths[9]]['description']
+    save(paths[4], games[paths[4]])
+    # Turn one game into an expansion of another
+    games[paths[5]]['base_game'] = games[paths[6]]['id']
+    save(paths[5], games[paths[5]])
+    # Remove a base game, leaving its expansions dangling if it has any
+    bases = {game.get('base_game') for game in games.values()}
+    removed = next((p for p in paths[7:] if games[p]['id'] in bases), paths[-1])
+    os.remove(removed)
+    # Add a copy of a game under a new id
+    game = dict(games[paths[0]], id=games[paths[0]]['id'] + '-copy',
+                name=games[paths[0]]['name'] + ' Copy')
+    save(games_dir / f"{game['id']}.yaml", game)
+    # Touch a file without changing it
+    os.utime(paths[8])
+
+    build(catalog, "--incremental")
+    updated = dump(catalog)
+    build(catalog)
+    rebuilt = dump(catalog)
+
+    # Derived tables must have content for the comparison to mean anything
+    for table in ('game_neighbors', 'game_closure', 'description_terms',
+                  'description_vectors', 'facet_values'):
+        assert rebuilt[table], table
+    assert updated.keys() == rebuilt.keys()
+    for table in rebuilt:
+        assert updated[table] == rebuilt[table], table
+
+
+def test_incremental_without_changes_is_a_no_op(catalog):
+    before = dump(catalog)
+    build(catalog, "--incremental")
+    assert dump(catalog) == before
+
+
+def manifest_ids(root):
+    conn = sqlite3.connect(root / "games.db")
+    ids = dict(conn.execute("SELECT path, game_id FROM build_manifest"))
+    conn.close()
+    return ids
+
+
+def test_duplicate_id_file_takes_over_when_the_original_goes(catalog):
+    games_dir = catalog / "games"
+    original = sorted(games_dir.glob("*.yaml"))[0]
+    game = load(original)
+    game['name'] += ' Duplicate'
+    save(games_dir / "zz-duplicate.yaml", game)
+
+    build(catalog, "--incremental")
+    assert manifest_ids(catalog)["zz-duplicate.yaml"] is None
+    assert manifest_ids(catalog)[original.name] == game['id']
+    os.utime(games_dir / "zz-duplicate.yaml", (0, 0))
+    build(catalog, "--incremental")
+    assert manifest_ids(catalog)["zz-duplicate.yaml"] is None
+
+    # Removing the original must not delete the game the duplicate defines
+    os.remove(original)
+    build(catalog, "--incremental")
+    assert manifest_ids(catalog)["zz-duplicate.yaml"] == game['id']
+    updated = dump(catalog)
+    conn = sqlite3.connect(catalog / "games.db")
+    name = conn.execute("SELECT name FROM games WHERE id = ?", (game['id'],)).fetchone()
+    conn.close()
+    assert name == (game['name'],)
+    build(catalog)
+    assert dump(catalog) == updated
+
+
+def test_failed_update_rolls_back(catalog, monkeypatch):
+    from scripts import build_db, columnar
+
+    monkeypatch.setattr(build_db, "DB_PATH", str(catalog / "games.db"))
+    monkeypatch.setattr(build_db, "GAMES_DIR", str(catalog / "games"))
+    monkeypatch.setattr(columnar, "SNAPSHOT_PATH", str(catalog / "games.columns"))
+    before = dump(catalog)
+    path = sorted((catalog / "games").glob("*.yaml"))[0]
+    game = load(path)
+    game['name'] += ' Renamed'
+    save(path, game)
+
+    def fail(cursor, game_ids=None):
+        raise RuntimeError("derive failed")
+
+    monkeypatch.setattr(build_db, "refresh_derived", fail)
+    with pytest.raises(RuntimeError) as excinfo:
+        build_db.update_database(jobs=1, verbose=False)
+    assert dump(catalog) == before
+    # No transaction is left holding the write lock, even while the
+    # traceback still references the failed update's frame
+    conn = sqlite3.connect(catalog / "games.db", timeout=0)
+    conn.execute("BEGIN IMMEDIATE")
+    conn.rollback()
+    conn.close()
+    del excinfo
+
+    # The database is left unlocked and the edit is applied next time
+    monkeypatch.undo()
+    build(catalog, "--incremental")
+    conn = sqlite3.connect(catalog / "games.db")
+    assert conn.execute("SELECT name FROM games WHERE id = ?",
+                        (game['id'],)).fetchone() == (game['name'],)
+    conn.close()
+
+
+@pytest.mark.parametrize("value, expected", [
+    (4, (4, False)),
+    ("4", (4, False)),
+    (" 6+ ", (6, True)),
+    ("6 +", (6, True)),
+    ("10+", (10, True)),
+    ("2-4", (None, False)),
+    ("+", (None, False)),
+    (None, (None, False)),
+])
+def test_parse_player_count(value, expected):
+    assert parse_player_count(value) == expected
+
+
+def test_player_count_rows():
+    rows, low, high = player_count_rows('g', [3, "2", "5+", "many"])
+    assert rows == [('g', '3', 3, 0), ('g', '2', 2, 0), ('g', '5+', 5, 1), ('g', 'many', None, 0)]
+    assert (low, high) == (2, None)  # open-ended: no maximum
+    assert player_count_rows('g', [4, "2"])[1:] == (2, 4)
+    assert player_count_rows('g', ["many"])[1:] == (None, None)
+
+
+def test_player_count_columns(catalog):
+    save(catalog / "games" / "party.yaml",
+         {'id': 'party', 'name': 'Party', 'possible_counts': [3, 4, "8+"], 'true_counts': ["6+"]})
+    build(catalog)
+    conn = sqlite3.connect(catalog / "games.db")
+    assert conn.execute("SELECT min_players, max_players, best_min_players, best_max_players "
+                        "FROM games WHERE id = 'party'").fetchone() == (3, None, 6, None)
+    assert conn.execute("SELECT count, players, open_ended FROM game_possible_counts "
+                        "WHERE game_id = 'party' ORDER BY rowid").fetchall() == [
+        ('3', 3, 0), ('4', 4, 0), ('8+', 8, 1)]
+    conn.close()
+
+
+def test_sort_key_orders_names_naturally():
+    names = ["12 Realms", "The Crew", "Éclipse", "7 Wonders", "Catan 10", "An Infamous Traffic",
+             "Catan 2", "Crew: Mission Deep Sea", "eclipse", "A"]
+    assert sorted(names, key=sort_key) == [
+        "7 Wonders", "12 Realms", "A", "Catan 2", "Catan 10", "Crew: Mission Deep Sea",
+        "The Crew", "Éclipse", "eclipse", "An Infamous Traffic"]
+    assert sort_key("The Crew") == sort_key("Crew, The") == "crew the"
+    assert sort_key("Éclipse") == sort_key("ECLIPSE")
+
+
+def game_ids(conn, sql, params=()):
+    return {game_id for (game_id,) in conn.execute(sql, params)}
+
+
+def test_materialized_facet_values_match_sql(catalog):
+    db = sqlite3.connect(catalog / "games.db")
+    rows = db.execute("SELECT facet, value, game_count FROM facet_values").fetchall()
+    assert rows
+    for facet, value, game_count in rows:
+        if facet == 'true_count':
+            ids = game_ids(db, "SELECT game_id FROM game_true_counts WHERE count = ?", (value,))
+        else:
+            view = {'category': ('game_categories', 'category'),
+                    'evoke': ('game_evokes', 'evoke'),
+                    'designer': ('game_designers', 'name'),
+                    'publisher': ('game_publishers', 'name')}[facet]
+            ids = game_ids(db, f"SELECT game_id FROM {view[0]} WHERE {view[1]} = ?",
+                           (value,))
+        assert len(ids) == game_count, (facet, value)
+    db.close()
+
+
+def test_materialized_facet_ranges_match_sql(catalog):
+    db = sqlite3.connect(catalog / "games.db")
+    ranges = {facet: (low, high) for facet, low, high in db.execute(
+        "SELECT facet, min, max FROM facet_ranges")}
+    assert ranges
+    for facet, bounds in ranges.items():
+        assert bounds == db.execute(f"SELECT MIN({facet}), MAX({facet}) FROM games").fetchone()
+    db.close()
@@ -0,0 +1,82 @@
+import sqlite3
+
+import pytest
+
+from scripts import columnar
+from scripts.columnar import NULL_INT, Snapshot, write_snapshot
+
+
+def expected_columns(db_path):
+    """Every snapshot column straight from games.db, in snapshot form."""
+    conn = sqlite3.connect(db_path)
+    columns = columnar.NUMERIC_COLUMNS + columnar.STRING_COLUMNS
+    rows = conn.execute(f"SELECT {', '.join(columns)} FROM games ORDER BY id").fetchall()
+    ids = [row[len(columnar.NUMERIC_COLUMNS)] for row in rows]
+    expected = {}
+    for i, col in enumerate(columns):
+        values = [row[i] for row in rows]
+        if col in columnar.NUMERIC_COLUMNS:
+            values = [NULL_INT if v is None else v for v in values]
+        expected[col] = values
+    for name, sql, _ in columnar.MULTI_COLUMNS:
+        lists = {game_id: [] for game_id in ids}
+        for game_id, value in conn.execute(sql):
+            lists[game_id].append(value)
+        expected[name] = [lists[game_id] for game_id in ids]
+    generation = conn.execute("SELECT generation FROM build_generation").fetchone()[0]
+    conn.close()
+    return expected, generation
+
+
+def read_columns(snap):
+    found = {}
+    for col in columnar.NUMERIC_COLUMNS:
+        found[col] = list(snap.column(col))
+    for col in columnar.STRING_COLUMNS:
+        found[col] = snap.strings(col)
+    for name, _, _ in columnar.MULTI_COLUMNS:
+        offsets, values, dictionary = snap.multi(name)
+        found[name] = [[dictionary[v] if dictionary is not None else v
+                        for v in values[offsets[i]:offsets[i + 1]]]
+                       for i in range(snap.rows)]
+    return found
+
+
+@pytest.mark.parametrize("numpy", [True, False])
+def test_snapshot_round_trip(catalog, monkeypatch, numpy):
+    if numpy and not columnar.NUMPY_AVAILABLE:
+        pytest.skip("numpy not installed")
+    monkeypatch.setattr(columnar, "NUMPY_AVAILABLE", numpy)
+    expected, generation = expected_columns(catalog / "games.db")
+
+    snap = Snapshot(str(catalog / "games.columns"))  # written by the build
+    assert snap.rows == len(expected['id']) > 0
+    assert snap.generation == generation
+    found = read_columns(snap)
+    snap.close()
+    assert found == expected
+    assert any(found['categories']) and any(found['possible_counts'])
+
+
+def test_non_integer_values_are_stored_as_null(catalog, capsys):
+    db_path = catalog / "games.db"
+    conn = sqlite3.connect(db_path)
+    ids = [game_id for (game_id,) in conn.execute("SELECT id FROM games ORDER BY id LIMIT 4")]
+    for game_id, year in zip(ids, ["soon", 1999.5, "2001", 2.0 ** 40]):
+        conn.execute("UPDATE games SET year = ? WHERE id = ?", (year, game_id))
+    conn.commit()
+    conn.close()
+
+    path = catalog / "bad.columns"
+    write_snapshot(str(db_path), str(path))
+    assert "year: 3 non-integer values stored as NULL" in capsys.readouterr().err
+    snap = Snapshot(str(path))
+    assert list(snap.column('year')[:4]) == [NULL_INT, NULL_INT, 2001, NULL_INT]
+    snap.close()
+
+
+def test_rejects_other_files(tmp_path):
+    path = tmp_path / "games.columns"
+    path.write_bytes(b"not a snapshot" * 4)
+    with pytest.raises(ValueError, match="not a games.columns snapshot"):
+        Snapshot(str(path))
@@ -0,0 +1,107 @@
+import math
+import random
+import sqlite3
+
+import pytest
+
+from scripts import description_index
+from scripts.description_index import near_duplicates, similar_to_text
+
+
+def random_vectors(seed, n_games=300, n_terms=60):
+    """Unit vectors with clusters of perturbed copies, as TF-IDF rows are."""
+    rng = random.Random(seed)
+    vectors = {}
+    while len(vectors) < n_games:
+        terms = rng.sample(range(n_terms), rng.randint(3, 12))
+        base = {t: rng.random() + 0.05 for t in terms}
+        for _ in range(rng.randint(1, 4)):
+            vector = {t: w * rng.uniform(0.7, 1.3) for t, w in base.items()}
+            if rng.random() < 0.5:
+                vector[rng.randrange(n_terms)] = rng.random()
+            norm = math.sqrt(sum(w * w for w in vector.values()))
+            vectors[f"game-{len(vectors):03}"] = {t: w / norm for t, w in vector.items()}
+    return vectors
+
+
+def vector_db(vectors):
+    conn = sqlite3.connect(":memory:")
+    conn.execute("CREATE TABLE description_vectors (term_id INTEGER, game_id TEXT, weight REAL)")
+    conn.executemany("INSERT INTO description_vectors VALUES (?, ?, ?)",
+                     [(t, game_id, w) for game_id, vector in vectors.items()
+                      for t, w in vector.items()])
+    return conn
+
+
+def brute_force(vectors, threshold):
+    ids = sorted(vectors)
+    pairs = {}
+    for i, a in enumerate(ids):
+        for b in ids[i + 1:]:
+            score = sum(w * vectors[b].get(t, 0.0) for t, w in vectors[a].items())
+            if score >= threshold:
+                pairs[(a, b)] = score
+    return pairs
+
+
+@pytest.mark.parametrize("seed", [1, 2, 3])
+@pytest.mark.parametrize("threshold", [0.5, 0.8, 0.95])
+def test_near_duplicates_matches_brute_force(seed, threshold):
+    vectors = random_vectors(seed)
+    expected = brute_force(vectors, threshold)
+    assert expected  # the clusters guarantee some qualifying pairs
+
+    found = near_duplicates(threshold, conn=vector_db(vectors))
+    assert {(a, b): score for a, b, score in found} == pytest.approx(expected)
+    scores = [score for _, _, score in found]
+    assert scores == sorted(scores, reverse=True)
+
+
+def index_tables(conn):
+    """The description index with term ids replaced by terms."""
+    return {
+        'terms': sorted(conn.execute("SELECT term, df, idf FROM description_terms")),
+        'docs': sorted(conn.execute("SELECT game_id, terms FROM description_docs")),
+        'vectors': sorted(conn.execute(
+            "SELECT t.term, v.game_id, v.weight FROM description_vectors v "
+            "JOIN description_terms t ON t.id = v.term_id")),
+    }
+
+
+def test_incremental_refresh_matches_full_rebuild(catalog):
+    conn = sqlite3.connect(catalog / "games.db")
+    ids = [game_id for (game_id,) in conn.execute("SELECT id FROM games ORDER BY id LIMIT 6")]
+    texts = dict(conn.execute("SELECT id, description FROM games"))
+    # A brand-new word, words moving between descriptions (df changes
+    # both ways) and a tf-only change
+    conn.execute("UPDATE games SET description = ? WHERE id = ?",
+                 ("Aardvarks burrow. " + texts[ids[1]], ids[0]))
+    conn.execute("UPDATE games SET description = ? WHERE id = ?", (texts[ids[3]], ids[2]))
+    conn.execute("UPDATE games SET description = ? WHERE id = ?",
+                 (texts[ids[4]] + " " + texts[ids[4]], ids[4]))
+    cursor = conn.cursor()
+    assert description_index._refresh_incremental(cursor, sorted(ids))
+    updated = index_tables(conn)
+    assert any(term == 'aardvarks' for term, _, _ in updated['terms'])
+    assert similar_to_text("aardvarks", conn=conn)[0][0] == ids[0]
+
+    description_index.refresh_description_index(cursor)
+    rebuilt = index_tables(conn)
+    assert rebuilt['terms'] and rebuilt['vectors']
+    assert updated['terms'] == rebuilt['terms']
+    assert updated['docs'] == rebuilt['docs']
+    assert updated['vectors'] == rebuilt['vectors']
+    conn.close()
+
+
+def test_added_description_falls_back_to_a_full_rebuild(catalog):
+    conn = sqlite3.connect(catalog / "games.db")
+    game_id = conn.execute("SELECT id FROM games WHERE description IS NOT NULL").fetchone()[0]
+    conn.execute("UPDATE games SET description = NULL WHERE id = ?", (game_id,))
+    cursor = conn.cursor()
+    assert not description_index._refresh_incremental(cursor, [game_id])
+    description_index.refresh_description_index(cursor, [game_id])
+    n_docs = conn.execute("SELECT COUNT(*) FROM description_docs").fetchone()[0]
+    assert n_docs == conn.execute(
+        "SELECT COUNT(*) FROM games WHERE description IS NOT NULL").fetchone()[0]
+    conn.close()
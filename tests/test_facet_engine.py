@@ -0,0 +1,96 @@
+import sqlite3
+
+import pytest
+
+from scripts.facet_engine import AllOf, AnyOf, FacetEngine, NoneOf, Range, parse_filter_arg
+
+COUNT_SQL = {
+    'possible_count': "SELECT game_id FROM game_possible_counts "
+                      "WHERE players = ? OR (open_ended AND players <= ?)",
+    'true_count': "SELECT game_id FROM game_true_counts "
+                  "WHERE players = ? OR (open_ended AND players <= ?)",
+}
+
+
+@pytest.fixture
+def db(catalog):
+    """The catalog's games.db with some open-ended counts below the maximum."""
+    path = catalog / "games.db"
+    conn = sqlite3.connect(path)
+    for table in ('game_possible_counts', 'game_true_counts'):
+        conn.execute(f"UPDATE {table} SET open_ended = 1, count = players || '+' "
+                     f"WHERE players = 3 AND game_id IN "
+                     f"(SELECT game_id FROM {table} ORDER BY game_id LIMIT 10)")
+    conn.commit()
+    yield conn
+    conn.close()
+
+
+def sql_ids(conn, sql, params=()):
+    return {game_id for (game_id,) in conn.execute(sql, params)}
+
+
+def category_ids(conn, category):
+    return sql_ids(conn, "SELECT game_id FROM game_categories WHERE category = ?", (category,))
+
+
+def test_open_ended_counts_match_sql_for_any_n(db, catalog):
+    engine = FacetEngine(str(catalog / "games.db"))
+    top = db.execute("SELECT MAX(players) FROM game_possible_counts").fetchone()[0]
+    for facet, sql in COUNT_SQL.items():
+        for n in range(1, top + 5):
+            assert set(engine.ids(engine.match({facet: n}))) == sql_ids(db, sql, (n, n)), (facet, n)
+
+
+def test_match_combines_facets_like_sql(db, catalog):
+    engine = FacetEngine(str(catalog / "games.db"))
+    categories = [c for (c,) in db.execute(
+        "SELECT category FROM game_categories GROUP BY category ORDER BY COUNT(*) DESC LIMIT 3")]
+    a, b, c = (category_ids(db, name) for name in categories)
+    short = sql_ids(db, "SELECT id FROM games WHERE length BETWEEN 1 AND 2")
+
+    def match(filters):
+        return set(engine.ids(engine.match(filters)))
+
+    assert match({'category': AllOf(categories[0], categories[1])}) == a & b
+    assert match({'category': AnyOf(categories[0], categories[1])}) == a | b
+    assert match({'category': NoneOf(categories[2])}) == sql_ids(db, "SELECT id FROM games") - c
+    assert match({'category': [categories[0]], 'length': Range(1, 2)}) == a & short
+
+
+def test_facet_counts_match_sql(db, catalog):
+    engine = FacetEngine(str(catalog / "games.db"))
+    categories = [c for (c,) in db.execute(
+        "SELECT category FROM game_categories GROUP BY category ORDER BY COUNT(*) DESC LIMIT 2")]
+    evokes = {e: sql_ids(db, "SELECT game_id FROM game_evokes WHERE evoke = ?", (e,))
+              for (e,) in db.execute("SELECT DISTINCT evoke FROM game_evokes")}
+    a, b = (category_ids(db, name) for name in categories)
+
+    # A narrowing facet counts against the whole selection
+    counts = engine.facet_counts({'category': [categories[0]]}, ['evoke'])['evoke']
+    assert counts == {e: len(ids & a) for e, ids in evokes.items()}
+
+    # An AnyOf facet counts against the other filters, widened by the
+    # values already ticked
+    evoke = max(evokes, key=lambda e: len(evokes[e]))
+    filters = {'category': AnyOf(categories[0]), 'evoke': [evoke]}
+    counts = engine.facet_counts(filters, ['category'])['category']
+    assert counts[categories[1]] == len(evokes[evoke] & (a | b))
+
+    # Player counts include open-ended games
+    counts = engine.facet_counts({}, ['true_count'])['true_count']
+    for n, count in counts.items():
+        assert count == len(sql_ids(db, COUNT_SQL['true_count'], (n, n)))
+
+
+@pytest.mark.parametrize("arg", ["bogus=1", "category", "possible_count=x", "year=a..b"])
+def test_parse_filter_arg_rejects_bad_filters(db, catalog, arg):
+    engine = FacetEngine(str(catalog / "games.db"))
+    with pytest.raises(ValueError):
+        parse_filter_arg(engine, arg)
+
+
+def test_parse_filter_arg(db, catalog):
+    engine = FacetEngine(str(catalog / "games.db"))
+    assert parse_filter_arg(engine, "true_count=2|3") == ('true_count', AnyOf(2, 3))
+    assert parse_filter_arg(engine, "year=2000..") == ('year', Range(2000.0, None))
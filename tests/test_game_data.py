@@ -0,0 +1,38 @@
+import json
+import subprocess
+import sys
+
+from conftest import build
+
+LIST_FIELDS = ('alternate_names', 'publisher', 'categories', 'expansions', 'possible_counts')
+
+
+def all_games(root):
+    """all_games() from the synthetic root's copy of game_data.py."""
+    code = (f"import json, sys; sys.path.insert(0, {str(root)!r}); "
+            f"from scripts import game_data; "
+            f"print(json.dumps(game_data.all_games({LIST_FIELDS!r})))")
+    result = subprocess.run([sys.executable, "-c", code],
+                            check=True, capture_output=True, text=True)
+    return json.loads(result.stdout)
+
+
+def test_yaml_fallback_matches_database(catalog):
+    games = catalog / "games"
+    # YAML reads this id as a number; the duplicate and the nameless
+    # file are rejected by the build
+    (games / "007.yaml").write_text("id: 7\nname: Seven\ncategories: [Dice, Dice]\n")
+    (games / "zz-duplicate.yaml").write_text("id: 7\nname: Seven Again\n")
+    (games / "zz-nameless.yaml").write_text("id: nameless\n")
+    (catalog / "games.db").unlink()
+    build(catalog)
+
+    from_db = all_games(catalog)
+    (catalog / "games.db").unlink()
+    from_yaml = all_games(catalog)
+
+    assert from_yaml == from_db
+    seven = next(game for game in from_yaml if game['id'] == '7')
+    assert seven['name'] == 'Seven' and seven['categories'] == ['Dice']
+    assert all(isinstance(game['id'], str) for game in from_yaml)
+    assert 'nameless' not in {game['id'] for game in from_yaml}
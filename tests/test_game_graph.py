@@ -0,0 +1,65 @@
+import random
+
+from scripts.game_graph import expansion_cycles
+
+
+def reachable(expands, start):
+    seen, todo = set(), [start]
+    while todo:
+        for child in expands.get(todo.pop(), ()):
+            if child not in seen:
+                seen.add(child)
+                todo.append(child)
+    return seen
+
+
+def brute_force_cycles(expands):
+    nodes = set(expands) | {c for children in expands.values() for c in children}
+    reach = {node: reachable(expands, node) for node in nodes}
+    cycles = set()
+    for node in nodes:
+        members = sorted(other for other in nodes
+                         if other == node or (other in reach[node] and node in reach[other]))
+        if len(members) > 1:
+            cycles.add(tuple(members))
+    return sorted(list(c) for c in cycles)
+
+
+def test_no_cycles_in_a_forest():
+    expands = {'base': {'exp-1', 'exp-2'}, 'exp-1': {'mini'}, 'other': {'exp-2'}}
+    assert expansion_cycles(expands) == []
+
+
+def test_two_game_cycle():
+    assert expansion_cycles({'a': {'b'}, 'b': {'a'}}) == [['a', 'b']]
+
+
+def test_cycle_with_tails_and_separate_cycles():
+    expands = {
+        'root': {'a'},
+        'a': {'b'},
+        'b': {'c', 'leaf'},
+        'c': {'a'},
+        'x': {'y'},
+        'y': {'x', 'a'},
+    }
+    assert expansion_cycles(expands) == [['a', 'b', 'c'], ['x', 'y']]
+
+
+def test_long_cycle_does_not_recurse():
+    n = 5000
+    expands = {f"g{i:05}": {f"g{(i + 1) % n:05}"} for i in range(n)}
+    cycles = expansion_cycles(expands)
+    assert len(cycles) == 1
+    assert len(cycles[0]) == n
+
+
+def test_matches_brute_force_on_random_graphs():
+    rng = random.Random(7)
+    for _ in range(200):
+        nodes = [f"g{i}" for i in range(rng.randint(2, 12))]
+        expands = {}
+        for _ in range(rng.randint(0, 20)):
+            base, expansion = rng.sample(nodes, 2)
+            expands.setdefault(base, set()).add(expansion)
+        assert expansion_cycles(expands) == brute_force_cycles(expands)
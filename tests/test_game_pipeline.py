@@ -0,0 +1,414 @@
+import threading
+import time
+
+import pytest
+import requests
+
+from scripts import game_pipeline
+
+
+class FakeResponse:
+    def __init__(self, status_code=200, text="", headers=None):
+        self.status_code = status_code
+        self.text = text
+        self.headers = headers or {}
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.HTTPError(f"{self.status_code} error")
+
+
+class FakeSession:
+    """Stands in for requests.Session: answers from pages, records each call.
+
+    pages maps a URL to a FakeResponse or a callable(headers) returning
+    one (or raising). delay keeps each request in flight that long.
+    """
+
+    def __init__(self, pages, delay=0.0):
+        self.pages = pages
+        self.delay = delay
+        self.calls = []
+        self.in_flight = {}
+        self.max_in_flight = {}
+        self._lock = threading.Lock()
+
+    def get(self, url, timeout, headers, allow_redirects):
+        host = url.split("/")[2]
+        with self._lock:
+            self.calls.append({"url": url, "timeout": timeout, "headers": dict(headers)})
+            self.in_flight[host] = self.in_flight.get(host, 0) + 1
+            self.max_in_flight[host] = max(self.max_in_flight.get(host, 0),
+                                           self.in_flight[host])
+        try:
+            time.sleep(self.delay)
+            page = self.pages[url]
+            return page(headers) if callable(page) else page
+        finally:
+            with self._lock:
+                self.in_flight[host] -= 1
+
+
+@pytest.fixture
+def cache(monkeypatch, tmp_path):
+    """Point the pipeline at an empty cache in tmp_path."""
+    monkeypatch.setattr(game_pipeline, "DB_PATH", tmp_path / "pipeline_cache.db")
+    game_pipeline.get_db().close()
+    return game_pipeline.DB_PATH
+
+
+@pytest.fixture
+def session(monkeypatch):
+    """Route the pipeline's requests through a FakeSession with no pages yet."""
+    fake = FakeSession({})
+    monkeypatch.setattr(game_pipeline, "get_session", lambda: fake)
+    monkeypatch.setattr(game_pipeline, "PER_HOST_MIN_DELAY", 0.0)
+    return fake
+
+
+# ── Per-host limits ───────────────────────────────────────────────────────────
+
+def test_host_leases_cap_requests_per_host(cache):
+    soon = time.monotonic() + 0.3
+    leases = [game_pipeline.acquire_host_lease("a.example", soon)
+              for _ in range(game_pipeline.PER_HOST_CONCURRENCY)]
+    assert None not in leases
+    assert game_pipeline.acquire_host_lease("a.example", time.monotonic() + 0.3) is None
+    assert game_pipeline.acquire_host_lease("b.example", time.monotonic() + 0.3) is not None
+
+    game_pipeline.release_host_lease(leases[0])
+    assert game_pipeline.acquire_host_lease("a.example", time.monotonic() + 0.3) is not None
+
+
+def test_lease_left_by_a_crashed_process_lapses(cache):
+    for _ in range(game_pipeline.PER_HOST_CONCURRENCY):
+        game_pipeline.acquire_host_lease("a.example", time.monotonic() + 0.3)
+    conn = game_pipeline.get_db()
+    conn.execute("UPDATE fetch_leases SET expires_at = ?", (time.time() - 1,))
+    conn.commit()
+    conn.close()
+    assert game_pipeline.acquire_host_lease("a.example", time.monotonic() + 0.3) is not None
+
+
+def test_reserve_host_start_spaces_request_starts(cache):
+    assert game_pipeline.reserve_host_start("a.example", 5.0) == pytest.approx(0, abs=0.1)
+    assert game_pipeline.reserve_host_start("a.example", 5.0) == pytest.approx(5, abs=0.1)
+    assert game_pipeline.reserve_host_start("a.example", 5.0) == pytest.approx(10, abs=0.1)
+    assert game_pipeline.reserve_host_start("b.example", 5.0) == pytest.approx(0, abs=0.1)
+
+
+def test_fetch_concurrently_caps_each_host(cache, session):
+    urls = ([f"https://a.example/{i}" for i in range(6)]
+            + [f"https://b.example/{i}" for i in range(6)])
+    session.pages = {url: FakeResponse(text=url) for url in urls}
+    session.delay = 0.1
+
+    results = dict(game_pipeline.fetch_concurrently(urls, deadline=10))
+
+    assert {url: result.html for url, result in results.items()} == {url: url for url in urls}
+    assert session.max_in_flight == {"a.example": game_pipeline.PER_HOST_CONCURRENCY,
+                                     "b.example": game_pipeline.PER_HOST_CONCURRENCY}
+    conn = game_pipeline.get_db()
+    assert conn.execute("SELECT COUNT(*) FROM fetch_leases").fetchone()[0] == 0
+    conn.close()
+
+
+def test_fetch_timeout_is_clamped_to_the_deadline(cache, session):
+    session.pages = {"https://a.example/": FakeResponse(text="page")}
+    list(game_pipeline.fetch_concurrently(["https://a.example/"], deadline=2))
+    timeout = session.calls[0]["timeout"]
+    assert game_pipeline.MIN_FETCH_TIMEOUT <= timeout <= 2
+
+
+def test_fetch_skipped_when_the_host_slot_comes_after_the_deadline(cache, session):
+    session.pages = {"https://a.example/": FakeResponse(text="page")}
+    game_pipeline.reserve_host_start("a.example", 60.0)
+
+    assert list(game_pipeline.fetch_concurrently(["https://a.example/"], deadline=1)) == [
+        ("https://a.example/", None)]
+    assert session.calls == []
+
+
+# ── Revalidation ──────────────────────────────────────────────────────────────
+
+URL = "https://www.dicetower.com/game/azul"
+VALIDATORS = {"ETag": '"v1"', "Last-Modified": "Mon, 01 Jan 2024 00:00:00 GMT"}
+
+
+def cached_source(game_id):
+    conn = game_pipeline.get_db()
+    row = conn.execute("SELECT * FROM game_sources WHERE game_id = ?", (game_id,)).fetchone()
+    html = game_pipeline.get_html(conn, row["html_hash"])
+    conn.close()
+    return row, html
+
+
+def age_sources(seconds):
+    conn = game_pipeline.get_db()
+    conn.execute("UPDATE game_sources SET fetched_at = fetched_at - ?", (seconds,))
+    conn.commit()
+    conn.close()
+
+
+def stats():
+    conn = game_pipeline.get_db()
+    result = game_pipeline.cache_stats(conn)
+    conn.close()
+    return result
+
+
+def test_fresh_page_is_not_fetched_again(cache, session):
+    session.pages = {URL: FakeResponse(text="<p>Azul</p>", headers=VALIDATORS)}
+    game_id = game_pipeline.phase1_fetch("Azul", [URL])
+    row, html = cached_source(game_id)
+    assert html == "<p>Azul</p>"
+    assert (row["etag"], row["last_modified"]) == (VALIDATORS["ETag"], VALIDATORS["Last-Modified"])
+    assert session.calls[0]["headers"] == {}
+
+    game_pipeline.phase1_fetch("Azul", [URL])
+    assert len(session.calls) == 1
+    assert (stats()["hits"], stats()["misses"]) == (1, 1)
+
+
+def test_stale_page_is_revalidated_and_304_counts_as_a_hit(cache, session):
+    session.pages = {URL: FakeResponse(text="<p>Azul</p>", headers=VALIDATORS)}
+    game_id = game_pipeline.phase1_fetch("Azul", [URL])
+    age_sources(game_pipeline.SOURCE_MAX_AGE["review"] + 1)
+    stale_at = cached_source(game_id)[0]["fetched_at"]
+
+    session.pages = {URL: FakeResponse(status_code=304)}
+    game_pipeline.phase1_fetch("Azul", [URL])
+
+    assert session.calls[1]["headers"] == {"If-None-Match": VALIDATORS["ETag"],
+                                           "If-Modified-Since": VALIDATORS["Last-Modified"]}
+    row, html = cached_source(game_id)
+    assert html == "<p>Azul</p>"
+    assert row["fetched_at"] > stale_at
+    assert game_pipeline.is_fresh(row)
+    assert (stats()["hits"], stats()["misses"]) == (1, 1)
+
+
+def test_max_age_depends_on_the_source_type(cache, session):
+    store = "https://www.amazon.com/azul"
+    session.pages = {URL: FakeResponse(text="review", headers=VALIDATORS),
+                     store: FakeResponse(text="listing", headers=VALIDATORS)}
+    game_pipeline.phase1_fetch("Azul", [URL, store])
+    age_sources(game_pipeline.SOURCE_MAX_AGE["store"] + 1)
+
+    session.calls.clear()
+    game_pipeline.phase1_fetch("Azul", [URL, store])
+    assert [call["url"] for call in session.calls] == [store]
+
+
+def test_changed_page_replaces_the_cached_copy(cache, session):
+    session.pages = {URL: FakeResponse(text="old", headers=VALIDATORS)}
+    game_id = game_pipeline.phase1_fetch("Azul", [URL])
+
+    session.pages = {URL: FakeResponse(text="new", headers={"ETag": '"v2"'})}
+    game_pipeline.phase1_fetch("Azul", [URL], refresh=True)
+
+    assert session.calls[1]["headers"]["If-None-Match"] == VALIDATORS["ETag"]
+    row, html = cached_source(game_id)
+    assert (html, row["etag"], row["last_modified"]) == ("new", '"v2"', None)
+    assert stats()["misses"] == 2
+
+
+def test_failed_revalidation_keeps_the_cached_copy(cache, session):
+    session.pages = {URL: FakeResponse(text="<p>Azul</p>", headers=VALIDATORS)}
+    game_id = game_pipeline.phase1_fetch("Azul", [URL])
+
+    def unreachable(headers):
+        raise requests.ConnectionError("connection refused")
+
+    session.pages = {URL: unreachable}
+    game_pipeline.phase1_fetch("Azul", [URL], refresh=True)
+    assert cached_source(game_id)[1] == "<p>Azul</p>"
+    assert stats()["failures"] == 1
+
+    session.pages = {URL: FakeResponse(status_code=503)}
+    game_pipeline.phase1_fetch("Azul", [URL], refresh=True)
+    assert cached_source(game_id)[1] == "<p>Azul</p>"
+    assert stats()["failures"] == 2
+
+
+def test_unconditional_304_is_not_treated_as_unchanged(session):
+    session.pages = {URL: FakeResponse(status_code=304)}
+    result = game_pipeline.fetch_conditional(URL)
+    assert result is not None and not result.not_modified
+
+
+def test_session_is_reused_within_a_thread():
+    first = game_pipeline.get_session()
+    assert game_pipeline.get_session() is first
+    assert first.headers["User-Agent"] == game_pipeline.USER_AGENT
+    adapter = first.get_adapter("https://example.com/")
+    assert adapter is first.get_adapter("http://example.org/")
+    assert adapter._pool_maxsize == game_pipeline.PER_HOST_CONCURRENCY
+
+    other = []
+    thread = threading.Thread(target=lambda: other.append(game_pipeline.get_session()))
+    thread.start()
+    thread.join()
+    assert other[0] is not first
+
+
+# ── Blob store ────────────────────────────────────────────────────────────────
+
+def add_page(conn, game, url, html, last_access):
+    game_id = game_pipeline.get_or_create_game(conn, game)
+    game_pipeline.store_source(conn, game_id, url, "review", html)
+    conn.execute("UPDATE html_blobs SET last_access = ? WHERE hash = "
+                 "(SELECT html_hash FROM game_sources WHERE url = ?)", (last_access, url))
+    conn.commit()
+
+
+def test_shared_page_is_stored_once(cache):
+    conn = game_pipeline.get_db()
+    html = "<p>Ein Spiel für zwei – Azul</p>" * 50
+    add_page(conn, "Azul", "https://a.example/1", html, 1)
+    add_page(conn, "Azul Duel", "https://a.example/1", html, 1)
+
+    digest = game_pipeline.put_blob(conn, html)
+    assert game_pipeline.get_html(conn, digest) == html
+    assert game_pipeline.get_html(conn, "0" * 64) is None
+    result = game_pipeline.cache_stats(conn)
+    assert (result["sources"], result["blobs"]) == (2, 1)
+    assert result["raw_bytes"] == 2 * len(html.encode())
+    assert result["bytes_saved"] > len(html.encode())
+    conn.close()
+
+
+def test_evict_blobs_drops_least_recently_used_pages(cache):
+    conn = game_pipeline.get_db()
+    for i, game in enumerate(["Azul", "Hive", "Patchwork"]):
+        add_page(conn, game, f"https://a.example/{game}", f"<p>{game}</p>" * (i + 1), i)
+    game_pipeline.put_blob(conn, "<p>orphan</p>")
+    conn.execute("INSERT INTO clean_texts VALUES "
+                 "((SELECT html_hash FROM game_sources WHERE url LIKE '%Azul'), ?, 100, 'Azul')",
+                 (game_pipeline.EXTRACTOR_FINGERPRINT,))
+    conn.commit()
+    sizes = [row[0] for row in conn.execute(
+        "SELECT b.stored_size FROM game_sources s JOIN html_blobs b ON b.hash = s.html_hash "
+        "ORDER BY b.last_access")]
+
+    assert game_pipeline.evict_blobs(conn, max_bytes=sum(sizes)) == 0
+    assert conn.execute("SELECT COUNT(*) FROM html_blobs").fetchone()[0] == 3
+
+    assert game_pipeline.evict_blobs(conn, max_bytes=sizes[2]) == 2
+    assert [row[0] for row in conn.execute("SELECT url FROM game_sources")] == [
+        "https://a.example/Patchwork"]
+    assert conn.execute("SELECT COUNT(*) FROM html_blobs").fetchone()[0] == 1
+    assert conn.execute("SELECT COUNT(*) FROM clean_texts").fetchone()[0] == 0
+    result = game_pipeline.cache_stats(conn)
+    assert (result["evictions"], result["evicted_bytes"]) == (2, sizes[0] + sizes[1])
+    conn.close()
+
+
+def test_fresh_hit_keeps_the_page_from_eviction(cache, session):
+    session.pages = {"https://a.example/old": FakeResponse(text="<p>old</p>"),
+                     "https://a.example/new": FakeResponse(text="<p>new</p>")}
+    game_pipeline.phase1_fetch("Old", ["https://a.example/old"])
+    game_pipeline.phase1_fetch("New", ["https://a.example/new"])
+    conn = game_pipeline.get_db()
+    conn.execute("UPDATE html_blobs SET last_access = 0")
+    conn.commit()
+
+    game_pipeline.phase1_fetch("Old", ["https://a.example/old"])
+    game_pipeline.evict_blobs(conn, max_bytes=1 + conn.execute(
+        "SELECT MAX(stored_size) FROM html_blobs").fetchone()[0])
+    assert [row[0] for row in conn.execute("SELECT url FROM game_sources")] == [
+        "https://a.example/old"]
+    conn.close()
+
+
+def test_inline_html_is_moved_into_the_blob_store(monkeypatch, tmp_path):
+    monkeypatch.setattr(game_pipeline, "DB_PATH", tmp_path / "pipeline_cache.db")
+    conn = game_pipeline.sqlite3.connect(game_pipeline.DB_PATH)
+    conn.executescript("""
+        CREATE TABLE games (id INTEGER PRIMARY KEY, name TEXT UNIQUE NOT NULL);
+        CREATE TABLE game_sources (game_id INTEGER NOT NULL, url TEXT NOT NULL,
+                                   source_type TEXT NOT NULL, html TEXT,
+                                   PRIMARY KEY (game_id, url));
+        INSERT INTO games VALUES (1, 'Azul'), (2, 'Hive');
+        INSERT INTO game_sources VALUES (1, 'https://a.example/1', 'review', '<p>shared</p>'),
+                                        (2, 'https://a.example/1', 'review', '<p>shared</p>');
+    """)
+    conn.close()
+
+    conn = game_pipeline.get_db()
+    rows = conn.execute("SELECT html, html_hash FROM game_sources").fetchall()
+    assert [row["html"] for row in rows] == [None, None]
+    assert game_pipeline.get_html(conn, rows[0]["html_hash"]) == "<p>shared</p>"
+    assert conn.execute("SELECT COUNT(*) FROM html_blobs").fetchone()[0] == 1
+    assert len(game_pipeline.get_validators(conn, 1)) == 1
+    conn.close()
+
+
+# ── Clean-text cache ──────────────────────────────────────────────────────────
+
+@pytest.fixture
+def extractions(monkeypatch):
+    """Count html_to_main_text calls; it returns the HTML with tags stripped."""
+    calls = []
+
+    def html_to_main_text(html, url=None):
+        calls.append(url)
+        return html.replace("<p>", "").replace("</p>", "")
+
+    monkeypatch.setattr(game_pipeline, "html_to_main_text", html_to_main_text)
+    return calls
+
+
+def test_clean_text_is_extracted_once_per_page(cache, extractions):
+    conn = game_pipeline.get_db()
+    add_page(conn, "Azul", "https://a.example/1", "<p>Draft tiles.</p>", 0)
+    add_page(conn, "Azul", "https://a.example/2", "<p></p>", 0)
+    conn.close()
+
+    first = game_pipeline.extract_clean_text("Azul")
+    assert first["sources"] == [{"url": "https://a.example/1", "source_type": "review",
+                                 "text": "Draft tiles."}]
+    assert sorted(extractions) == ["https://a.example/1", "https://a.example/2"]
+
+    assert game_pipeline.extract_clean_text("Azul") == first
+    assert len(extractions) == 2
+
+    conn = game_pipeline.get_db()
+    assert conn.execute("SELECT MIN(last_access) FROM html_blobs").fetchone()[0] > 0
+    conn.close()
+
+
+def test_shared_page_is_extracted_once_for_all_games(cache, extractions):
+    conn = game_pipeline.get_db()
+    add_page(conn, "Azul", "https://a.example/1", "<p>Draft tiles.</p>", 0)
+    add_page(conn, "Azul Duel", "https://a.example/1", "<p>Draft tiles.</p>", 0)
+    conn.close()
+
+    game_pipeline.extract_clean_text("Azul")
+    assert game_pipeline.extract_clean_text("Azul Duel")["sources"][0]["text"] == "Draft tiles."
+    assert len(extractions) == 1
+
+
+def test_changed_settings_miss_the_clean_text_cache(cache, extractions, monkeypatch):
+    conn = game_pipeline.get_db()
+    add_page(conn, "Azul", "https://a.example/1", "<p>Draft tiles.</p>", 0)
+    conn.close()
+
+    game_pipeline.extract_clean_text("Azul")
+    short = game_pipeline.extract_clean_text("Azul", max_chars=5)
+    assert len(extractions) == 2
+    assert short["sources"][0]["text"] == game_pipeline.truncate_text("Draft tiles.", 5)
+
+    monkeypatch.setattr(game_pipeline, "EXTRACTOR_FINGERPRINT", "other-settings")
+    game_pipeline.extract_clean_text("Azul")
+    assert len(extractions) == 3
+
+    conn = game_pipeline.get_db()
+    game_pipeline.evict_blobs(conn)
+    assert {row[0] for row in conn.execute("SELECT extractor FROM clean_texts")} == {
+        "other-settings"}
+    conn.close()
+
+
+def test_unknown_game_has_no_sources(cache, extractions):
+    assert game_pipeline.extract_clean_text("Nope") == {"game_name": "Nope", "sources": []}
@@ -0,0 +1,69 @@
+import json
+import sqlite3
+import subprocess
+import sys
+
+import pytest
+
+from scripts import gen_synthetic, query_games
+
+
+@pytest.fixture(scope="module")
+def db_path(tmp_path_factory):
+    """A built synthetic catalog with NULLs in every sortable column."""
+    root = tmp_path_factory.mktemp("catalog")
+    gen_synthetic.generate(str(root), 120, 120, seed=3)
+    subprocess.run([sys.executable, str(root / "scripts" / "build_db.py")],
+                   check=True, capture_output=True)
+    path = root / "games.db"
+    conn = sqlite3.connect(path)
+    for i, col in enumerate(query_games.SORT_COLUMNS[1:]):
+        conn.execute(f"UPDATE games SET {col} = NULL WHERE rowid % 4 = ?", (i % 4,))
+    conn.commit()
+    conn.close()
+    return str(path)
+
+
+def reference_order(conn, sort, desc):
+    direction = 'DESC' if desc else 'ASC'
+    if sort == 'name':
+        order = f"sort_name {direction}, id {direction}"
+    else:
+        order = f"{sort} {direction} NULLS LAST, sort_name {direction}, id {direction}"
+    return [game_id for (game_id,) in conn.execute(f"SELECT id FROM games ORDER BY {order}")]
+
+
+def walk(sort, direction, limit):
+    ids, after = [], None
+    while True:
+        page = query_games.query_games({}, sort, direction, limit, after)
+        assert len(page['games']) <= limit
+        ids += [game['id'] for game in page['games']]
+        if page['next'] is None:
+            return ids
+        after = json.loads(json.dumps(page['next']))  # as the CLI's --after passes it
+
+
+@pytest.mark.parametrize("direction", ['asc', 'desc'])
+@pytest.mark.parametrize("sort", query_games.SORT_COLUMNS)
+def test_pages_cross_the_null_boundary(db_path, monkeypatch, sort, direction):
+    monkeypatch.setattr(query_games, "DB_PATH", db_path)
+    conn = sqlite3.connect(db_path)
+    expected = reference_order(conn, sort, direction == 'desc')
+    limits = [1, 7, 50]
+    if sort != 'name':
+        # A page ending exactly on the last non-NULL row
+        limits.append(conn.execute(
+            f"SELECT COUNT(*) FROM games WHERE {sort} IS NOT NULL").fetchone()[0])
+    conn.close()
+    for limit in limits:
+        assert walk(sort, direction, limit) == expected
+
+
+def test_count_is_exact_below_the_limit(db_path, monkeypatch):
+    monkeypatch.setattr(query_games, "DB_PATH", db_path)
+    page = query_games.query_games({'year_min': 2000}, count=True)
+    conn = sqlite3.connect(db_path)
+    exact = conn.execute("SELECT COUNT(*) FROM games WHERE year >= 2000").fetchone()[0]
+    conn.close()
+    assert (page['total'], page['total_estimated']) == (exact, False)
@@ -0,0 +1,94 @@
+import json
+
+import pytest
+
+from scripts import game_pipeline, research_batch
+from scripts.research_batch import load_checkpoint, read_manifest, run_batch
+
+
+@pytest.fixture
+def calls(monkeypatch, tmp_path):
+    """Fake the pipeline: one source per URL, "Broken" raises.
+
+    Workers are forked, so calls are recorded in a file; the research
+    log goes to tmp_path.
+    """
+    path = tmp_path / "calls"
+    path.touch()
+
+    def process_game(name, urls, refresh=False):
+        with open(path, "a") as f:
+            f.write(name + "\n")
+        if name == "Broken":
+            raise RuntimeError("no pages")
+        return {"game_name": name,
+                "sources": [{"url": url, "source_type": "review", "text": "..."} for url in urls]}
+
+    monkeypatch.setattr(research_batch, "process_game", process_game)
+    monkeypatch.setattr(game_pipeline, "LOG_PATH", tmp_path / "research-log.yaml")
+    return path
+
+
+def manifest(n_games):
+    return [{"name": f"Game {i}", "slug": f"game-{i}", "urls": [f"https://example.com/{i}"]}
+            for i in range(n_games)] + [{"name": "Broken", "slug": "broken", "urls": ["x"]}]
+
+
+def log_entries():
+    return game_pipeline.LOG_ENTRY_RE.findall(game_pipeline.LOG_PATH.read_text())
+
+
+def test_read_manifest(tmp_path):
+    jsonl = tmp_path / "queue.jsonl"
+    jsonl.write_text('# queue\n{"name": "Azul", "slug": "azul", "urls": ["https://a", "https://b"]}\n'
+                     '\n{"name": "Hive"}\n')
+    csv = tmp_path / "queue.csv"
+    csv.write_text("name,slug,urls\nAzul,azul,https://a | https://b\nHive,,\n")
+    expected = [{"name": "Azul", "slug": "azul", "urls": ["https://a", "https://b"]},
+                {"name": "Hive", "slug": None, "urls": []}]
+    assert read_manifest(jsonl) == expected
+    assert read_manifest(csv) == expected
+
+    jsonl.write_text('{"name": "Azul"}\n{"slug": "hive"}\n')
+    with pytest.raises(ValueError, match="queue.jsonl:2"):
+        read_manifest(jsonl)
+
+
+def test_interrupted_batch_resumes_from_checkpoint(calls, tmp_path):
+    checkpoint = tmp_path / "checkpoint.jsonl"
+    entries = manifest(6)
+    batch = run_batch(entries, jobs=1, checkpoint=checkpoint, log_every=2)
+    first = [next(batch) for _ in range(3)]
+    batch.close()  # as on Ctrl-C: finished games are still checkpointed
+    done = {result["slug"] for result in first}
+    assert load_checkpoint(checkpoint) == done
+
+    calls.write_text("")
+    results = list(run_batch(entries, jobs=1, checkpoint=checkpoint, log_every=2))
+    assert {result["slug"] for result in results} == {e["slug"] for e in entries} - done
+    assert not {result["game_name"] for result in first} & set(calls.read_text().splitlines())
+    assert [r for r in results if "error" in r] == [
+        {"game_name": "Broken", "slug": "broken", "error": "RuntimeError: no pages"}]
+
+    # The failure is retried; everything else is done
+    assert load_checkpoint(checkpoint) == {e["slug"] for e in entries} - {"broken"}
+    calls.write_text("")
+    assert [r["slug"] for r in run_batch(entries, jobs=1, checkpoint=checkpoint)] == ["broken"]
+    assert calls.read_text() == "Broken\n"
+
+    logged = [game_id for _, game_id, _ in log_entries()]
+    assert sorted(logged) == sorted(e["slug"] for e in entries[:-1])
+
+
+def test_log_is_not_repeated_without_a_checkpoint(calls, tmp_path):
+    checkpoint = tmp_path / "checkpoint.jsonl"
+    entries = manifest(4)
+    list(run_batch(entries, jobs=1, checkpoint=checkpoint, log_every=3))
+    logged = log_entries()
+    assert len(logged) == 4
+
+    # As if interrupted between the log append and the checkpoint write
+    checkpoint.unlink()
+    list(run_batch(entries, jobs=1, checkpoint=checkpoint, log_every=3))
+    assert log_entries() == logged
+    assert len(load_checkpoint(checkpoint)) == 4
@@ -0,0 +1,65 @@
+import sqlite3
+
+import pytest
+import yaml
+from conftest import build
+
+from scripts import gen_synthetic
+from scripts.search_games import build_match_query, search
+
+GAMES = [
+    {'id': 'barenpark', 'name': 'Bärenpark', 'designer': ['Phil Walker-Harding'],
+     'alternate_names': ['Bear Park']},
+    {'id': 'seven-wonders-duel', 'name': '7 Wonders: Duel', 'designer': ['Antoine Bauza']},
+    {'id': 'zythum', 'name': 'Zythum', 'designer': ['Reiner Knizia'],
+     'description': 'An auction game.'},
+    {'id': 'brewing', 'name': 'Brewing', 'description': 'Brew zythum for the abbey.'},
+]
+
+
+def add_games(root):
+    for game in GAMES:
+        with open(root / "games" / f"{game['id']}.yaml", "w") as f:
+            yaml.safe_dump(game, f, allow_unicode=True)
+    build(root)
+
+
+@pytest.fixture(scope="module")
+def db(tmp_path_factory):
+    """A built synthetic catalog plus GAMES."""
+    root = tmp_path_factory.mktemp("catalog")
+    gen_synthetic.generate(str(root), 150, 150, seed=5)
+    add_games(root)
+    return sqlite3.connect(root / "games.db")
+
+
+def test_build_match_query_quotes_every_word_as_a_prefix():
+    assert build_match_query("7 Wonders: Duel") == '"7"* "Wonders"* "Duel"*'
+    assert build_match_query('NEAR(a b) OR "x"') == '"NEAR"* "a"* "b"* "OR"* "x"*'
+    assert build_match_query(" -:* ") == ""
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("baren", ["barenpark"]),       # diacritics folded in the index...
+    ("BÄRENP", ["barenpark"]),      # ...and in the query, as a prefix
+    ("bear pa", ["barenpark"]),     # alternate names
+    ("7 wonders: duel", ["seven-wonders-duel"]),
+    ("knizia auct", ["zythum"]),    # designer and description, ANDed
+    ("zythum", ["zythum", "brewing"]),  # a name match outranks a description match
+    ("", []),
+])
+def test_search(db, text, expected):
+    assert search(text, conn=db) == expected
+
+
+def test_incremental_update_refreshes_the_index(catalog):
+    add_games(catalog)
+    path = catalog / "games" / "zythum.yaml"
+    game = yaml.safe_load(path.read_text())
+    game['name'] = 'Quaffle'
+    path.write_text(yaml.safe_dump(game))
+    build(catalog, "--incremental")
+
+    conn = sqlite3.connect(catalog / "games.db")
+    assert search("quaff", conn=conn) == ["zythum"]
+    assert search("zythum", conn=conn) == ["brewing"]
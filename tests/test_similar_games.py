@@ -0,0 +1,42 @@
+import numpy as np
+import pytest
+
+from scripts import similar_games
+from scripts.similar_games import top_k_neighbors
+
+
+def coarse_features(seed, n_games, width=8):
+    """Unit rows over a few small integers, so many scores tie."""
+    rng = np.random.default_rng(seed)
+    features = rng.integers(0, 3, (n_games, width)).astype(np.float64)
+    norms = np.linalg.norm(features, axis=1, keepdims=True)
+    return features / np.maximum(norms, 1.0)
+
+
+def brute_force(features, k):
+    n = len(features)
+    scores = np.round(np.einsum('ik,jk->ij', features, features), similar_games.SCORE_DIGITS)
+    ranked = [sorted((j for j in range(n) if j != i), key=lambda j: (-scores[i, j], j))[:k]
+              for i in range(n)]
+    indices = np.array(ranked, dtype=np.int64).reshape(n, min(k, n - 1))
+    return indices, np.take_along_axis(scores, indices, axis=1)
+
+
+@pytest.mark.parametrize("n_games", [2, 7, 400])
+@pytest.mark.parametrize("k", [1, 5, 20])
+def test_top_k_matches_brute_force(monkeypatch, n_games, k):
+    # Small blocks and sample: several blocks, and most candidates
+    # come from outside the sampled columns
+    monkeypatch.setattr(similar_games, "BLOCK_BYTES", 64 * n_games)
+    monkeypatch.setattr(similar_games, "SCREEN_SAMPLE", 30)
+    features = coarse_features(n_games, n_games)
+    expected_indices, expected_scores = brute_force(features, k)
+
+    indices, scores = top_k_neighbors(features, k)
+    assert indices.tolist() == expected_indices.tolist()
+    assert scores.tolist() == expected_scores.tolist()
+
+    rows = np.arange(n_games)[::3]
+    indices, scores = top_k_neighbors(features, k, rows)
+    assert indices.tolist() == expected_indices[rows].tolist()
+    assert scores.tolist() == expected_scores[rows].tolist()
@@ -35,41 +35,24 @@ function hasImage(name, year) {
   return getImageNames().has(key);
 }
 
-// Schema cross-reference for categorizing filter options
-const MECHANICS = new Set([
-  'Worker Placement', 'Deck Building', 'Engine Building', 'Area Control',
-  'Tile Placement', 'Dice Rolling', 'Set Collection', 'Trick-taking',
-  'Auctions/Bidding', 'Cooperative', '1 vs Many', 'Teams', 'Real-time',
-  'Traitor', 'Social Deduction', 'Drafting', 'Press Your Luck', 'Roll & Write',
-  'Hex Map', 'Campaign Mode', 'Legacy', 'Bag Building', 'Hand Management',
-  'Modular Board', 'Variable Setup', 'Take That', 'Narrative Heavy',
-  'Puzzle Solving', 'No Math', 'Word Play', 'Deduction', 'Racing',
-  'Economic', 'Action Points', 'Route Building', 'Network Building',
-  'Pattern Building', 'Resource Management', 'Trading', 'Negotiation',
-  'Bluffing', 'Hidden Movement', 'Programmed Movement', 'Simultaneous Action',
-  'Card Drafting', 'Tableau Building', 'Tech Tree', 'Rondel', 'Mancala',
-  'Dexterity', 'Asymmetric', 'Variable Player Powers', 'Events'
-]);
-
-const STYLES = new Set([
-  'Euro', 'Ameritrash', 'Abstract', 'Party', 'Family', 'Wargame',
-  'Filler', 'Gateway', 'Cult Classic', 'Dungeon Crawler', '4X',
-  'Dudes on a Map', 'Role Playing'
-]);
-
-const THEMES = new Set([
-  'Fantasy', 'Sci-Fi', 'Horror', 'Historical', 'Western', 'Pirates',
-  'Zombies', 'Vampires', 'Cthulhu', 'Aliens', 'Post-Apocalyptic',
-  'Superheroes', 'Marvel', 'Disney', 'Lord of the Rings', 'Animals',
-  'Food Theme', 'Time Travel', 'Space', 'Medieval', 'Ancient',
-  'Mythology', 'Nature', 'City Building', 'Civilization', 'War',
-  'Survival', 'Mystery', 'Espionage', 'Steampunk', 'Cyberpunk',
-  'Aviation', 'Maritime', 'Trains', 'Agriculture'
-]);
-
 let db = null;
 let SQL = null;
 
+// build_db.py swaps a new games.db in by rename (and updates it in
+// place with --incremental); stat it at most once a second and reload
+// when the file changes so the server never keeps serving a stale copy.
+let dbFileKey = null;
+let dbCheckTime = 0;
+
+function statKey() {
+  try {
+    const st = fs.statSync(DB_PATH);
+    return `${st.ino}:${st.mtimeMs}:${st.size}`;
+  } catch (_) {
+    return null;
+  }
+}
+
 /**
  * Initialize sql.js and load the database.
  */
@@ -81,8 +64,10 @@ async function init() {
       console.warn('games.db not found — run python3 scripts/build_db.py first');
       return null;
     }
+    dbFileKey = statKey();
     const buffer = fs.readFileSync(DB_PATH);
     db = new SQL.Database(buffer);
+    dbCheckTime = Date.now();
     return db;
   } catch (err) {
     console.error('Failed to open games.db:', err.message);
@@ -98,7 +83,24 @@ async function reopenDb() {
   return init();
 }
 
-function getDb() { return db; }
+function getDb() {
+  const now = Date.now();
+  if (SQL && now - dbCheckTime >= 1000) {
+    dbCheckTime = now;
+    const key = statKey();
+    if (key && key !== dbFileKey) {
+      if (db) { try { db.close(); } catch (_) {} }
+      try {
+        db = new SQL.Database(fs.readFileSync(DB_PATH));
+        dbFileKey = key;
+      } catch (err) {
+        console.error('Failed to reload games.db:', err.message);
+        db = null;
+      }
+    }
+  }
+  return db;
+}
 
 // ============ Query helpers ============
 
@@ -128,12 +130,13 @@ function queryOne(sql, params = []) {
 
 // ============ Array field helpers ============
 
+// Dictionary-encoded fields are views that carry the YAML list position
 const ARRAY_TABLES = {
-  categories:      { table: 'game_categories',     col: 'category' },
-  evokes:          { table: 'game_evokes',          col: 'evoke' },
-  designers:       { table: 'game_designers',       col: 'name' },
-  publishers:      { table: 'game_publishers',      col: 'name' },
-  artists:         { table: 'game_artists',         col: 'name' },
+  categories:      { table: 'game_categories',     col: 'category', ordered: true },
+  evokes:          { table: 'game_evokes',          col: 'evoke',    ordered: true },
+  designers:       { table: 'game_designers',       col: 'name',     ordered: true },
+  publishers:      { table: 'game_publishers',      col: 'name',     ordered: true },
+  artists:         { table: 'game_artists',         col: 'name',     ordered: true },
   alternate_names: { table: 'game_alternate_names', col: 'name' },
   possible_counts: { table: 'game_possible_counts', col: 'count' },
   true_counts:     { table: 'game_true_counts',     col: 'count' },
@@ -156,9 +159,10 @@ function batchFetchArrays(gameIds) {
     result.set(id, entry);
   }
 
-  for (const [key, { table, col }] of Object.entries(ARRAY_TABLES)) {
+  for (const [key, { table, col, ordered }] of Object.entries(ARRAY_TABLES)) {
+    const order = ordered ? ' ORDER BY game_id, position' : '';
     const rows = query(
-      `SELECT game_id, ${col} as val FROM ${table} WHERE game_id IN (${placeholders})`,
+      `SELECT game_id, ${col} as val FROM ${table} WHERE game_id IN (${placeholders})${order}`,
       gameIds
     );
     for (const row of rows) {
@@ -211,12 +215,20 @@ function getFilteredGames(filters = {}, sort = 'name', dir = 'asc', page = 1, pe
     }
   }
 
-  // True counts (OR within)
-  if (filters.true_counts && filters.true_counts.length > 0) {
+  // True counts (OR within): best at any of N, counting "6+" as best
+  // at 6 and above. Both halves are index lookups on the players column.
+  const bestAt = (filters.true_counts || []).map(c => parseInt(c, 10)).filter(n => !isNaN(n));
+  if (bestAt.length > 0) {
     const startIdx = params.length + 1;
-    const ph = filters.true_counts.map((_, i) => `?${startIdx + i}`).join(',');
-    where.push(`g.id IN (SELECT game_id FROM game_true_counts WHERE count IN (${ph}))`);
-    params.push(...filters.true_counts);
+    const ph = bestAt.map((_, i) => `?${startIdx + i}`).join(',');
+    params.push(...bestAt, Math.max(...bestAt));
+    where.push(`g.id IN (SELECT game_id FROM game_true_counts WHERE players IN (${ph}) OR (open_ended AND players <= ?${params.length}))`);
+  }
+
+  // Supports exactly N players (possible counts)
+  if (filters.players != null && !isNaN(filters.players)) {
+    params.push(filters.players);
+    where.push(`g.id IN (SELECT game_id FROM game_possible_counts WHERE players = ?${params.length} OR (open_ended AND players <= ?${params.length}))`);
   }
 
   // Year range
@@ -250,9 +262,13 @@ function getFilteredGames(filters = {}, sort = 'name', dir = 'asc', page = 1, pe
   const allowedSorts = ['name', 'year', 'length', 'rules_complexity', 'strategic_depth', 'feel', 'value', 'playtime_minutes'];
   const sortCol = allowedSorts.includes(sort) ? sort : 'name';
   const sortDir = dir === 'desc' ? 'DESC' : 'ASC';
+  // sort_name is the build's normalized name key; each sortable column
+  // has a (column, sort_name, id) index. The tiebreakers follow the sort
+  // direction so a descending sort walks the index backwards instead of
+  // sorting the ties in a temp b-tree
   const orderClause = sortCol === 'name'
-    ? `ORDER BY g.name COLLATE NOCASE ${sortDir}`
-    : `ORDER BY g.${sortCol} IS NULL, g.${sortCol} ${sortDir}, g.name COLLATE NOCASE ASC`;
+    ? `ORDER BY g.sort_name ${sortDir}, g.id ${sortDir}`
+    : `ORDER BY g.${sortCol} ${sortDir} NULLS LAST, g.sort_name ${sortDir}, g.id ${sortDir}`;
 
   // Count
   const countRow = queryOne(`SELECT COUNT(*) as total FROM games g ${whereClause}`, params);
@@ -282,42 +298,53 @@ function getGameById(id) {
   return { ...row, ...arrays.get(id), has_image: hasImage(row.name, row.year) };
 }
 
+/**
+ * Filter metadata comes from the facet_values / facet_ranges tables that
+ * build_db.py materializes, including the schema.yaml category grouping.
+ */
 function getFilterOptions() {
   if (!getDb()) return null;
 
-  const catRows = query('SELECT DISTINCT category as val FROM game_categories ORDER BY category');
-  const mechanics = [], styles = [], themes = [], otherCategories = [];
-  for (const { val } of catRows) {
-    if (MECHANICS.has(val)) mechanics.push(val);
-    else if (STYLES.has(val)) styles.push(val);
-    else if (THEMES.has(val)) themes.push(val);
-    else otherCategories.push(val);
+  const values = { category: [], evoke: [], designer: [], publisher: [], true_count: [] };
+  const groups = { mechanics: [], styles: [], themes: [] };
+  const otherCategories = [];
+  const rows = query('SELECT facet, value, category_group FROM facet_values ORDER BY facet, sort_order');
+  for (const { facet, value, category_group: group } of rows) {
+    if (facet === 'category') {
+      if (groups[group]) groups[group].push(value);
+      else otherCategories.push(value);
+    } else if (values[facet]) {
+      values[facet].push(value);
+    }
   }
 
+  const ranges = {};
+  for (const r of query('SELECT facet, min, max FROM facet_ranges')) ranges[r.facet] = { min: r.min, max: r.max };
+
   return {
-    mechanics,
-    styles,
-    themes,
+    mechanics: groups.mechanics,
+    styles: groups.styles,
+    themes: groups.themes,
     other_categories: otherCategories,
-    evokes: query('SELECT DISTINCT evoke as val FROM game_evokes ORDER BY evoke').map(r => r.val),
-    designers: query('SELECT DISTINCT name as val FROM game_designers ORDER BY name').map(r => r.val),
-    publishers: query('SELECT DISTINCT name as val FROM game_publishers ORDER BY name').map(r => r.val),
-    year_range: queryOne('SELECT MIN(year) as min, MAX(year) as max FROM games WHERE year IS NOT NULL') || { min: null, max: null },
-    playtime_range: queryOne('SELECT MIN(playtime_minutes) as min, MAX(playtime_minutes) as max FROM games WHERE playtime_minutes IS NOT NULL') || { min: null, max: null },
-    player_counts: query('SELECT DISTINCT count as val FROM game_true_counts ORDER BY CAST(count AS INTEGER)').map(r => r.val),
+    evokes: values.evoke,
+    designers: values.designer,
+    publishers: values.publisher,
+    year_range: ranges.year || { min: null, max: null },
+    playtime_range: ranges.playtime_minutes || { min: null, max: null },
+    player_counts: values.true_count,
   };
 }
 
 function getStats() {
   if (!getDb()) return null;
   const total = queryOne('SELECT COUNT(*) as n FROM games');
-  const topCategories = query('SELECT category, COUNT(*) as n FROM game_categories GROUP BY category ORDER BY n DESC LIMIT 10');
+  const topCategories = query("SELECT value as category, game_count as n FROM facet_values WHERE facet = 'category' ORDER BY game_count DESC LIMIT 10");
   return { total_games: total ? total.n : 0, top_categories: topCategories };
 }
 
 function getEvokeCounts() {
   if (!getDb()) return [];
-  return query('SELECT evoke, COUNT(*) as count FROM game_evokes GROUP BY evoke ORDER BY count DESC');
+  return query("SELECT value as evoke, game_count as count FROM facet_values WHERE facet = 'evoke' ORDER BY game_count DESC");
 }
 
 module.exports = { init, getFilteredGames, getGameById, getFilterOptions, getStats, getEvokeCounts, reopenDb };
@@ -57,6 +57,7 @@ app.get('/api/games/query', (req, res) => {
       return v != null && v !== '' ? parseInt(v, 10) : undefined;
     };
 
+    filters.players = intParam('players');
     filters.year_min = intParam('year_min');
     filters.year_max = intParam('year_max');
     filters.playtime_min = intParam('playtime_min');